@@ -0,0 +1,75 @@
+from AccentCore import AccentAnalyzer, load_audio
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from InferencePool import InferencePool
+from Uploads import SpooledUpload, spool_upload
+import os
+import threading
+
+# Service configuration: one analyzer, with its own Whisper model, per inference worker
+ACCENT_MODEL_SIZE = os.getenv("ACCENT_MODEL_SIZE", "base")
+ACCENT_INFERENCE_WORKERS = int(os.getenv("ACCENT_INFERENCE_WORKERS", "1"))
+ACCENT_MAX_PENDING = int(os.getenv("ACCENT_MAX_PENDING", "16"))
+# Split the cores between workers so concurrent transcriptions do not oversubscribe the CPU
+WHISPER_THREADS = int(os.getenv("WHISPER_THREADS", str(max(1, (os.cpu_count() or 1) // ACCENT_INFERENCE_WORKERS))))
+
+_thread_analyzers = threading.local()
+
+def get_thread_analyzer() -> AccentAnalyzer:
+    """Return the calling thread's analyzer, loading its Whisper model on first use."""
+    if not hasattr(_thread_analyzers, "analyzer"):
+        import torch
+        torch.set_num_threads(WHISPER_THREADS)
+        _thread_analyzers.analyzer = AccentAnalyzer(model_size=ACCENT_MODEL_SIZE)
+    return _thread_analyzers.analyzer
+
+# Whisper decoding installs hooks on its model, so each worker thread needs its own copy
+accent_inference_pool = InferencePool(
+    ACCENT_INFERENCE_WORKERS,
+    initializer=get_thread_analyzer,
+    name="accent-inference",
+    max_pending=ACCENT_MAX_PENDING
+)
+
+def analyze_accent_file(upload: SpooledUpload, include_segments: bool = False):
+    """Decode, transcribe and analyze one uploaded audio file with the calling worker's analyzer."""
+    analyzer = get_thread_analyzer()
+    try:
+        audio = load_audio(upload.open())
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode audio: {str(e)}")
+    if not len(audio):
+        raise HTTPException(status_code=400, detail="The audio file is empty")
+
+    analysis = analyzer.analyze_transcription(analyzer.model.transcribe(audio), audio)
+    if analysis is None:
+        raise HTTPException(status_code=500, detail="Accent analysis failed")
+    if not include_segments:
+        analysis.pop("segments")
+    return analysis
+
+# Loading Whisper takes seconds per worker, so it happens before the first request by default
+WARM_UP_BY_DEFAULT = True
+
+def warm_up():
+    """Load every worker's Whisper model before serving traffic."""
+    accent_inference_pool.warm_up()
+
+def shutdown():
+    accent_inference_pool.shutdown()
+
+router = APIRouter(tags=["accent"])
+
+@router.post("/analyze-accent/")
+async def analyze_accent_from_audio(file: UploadFile = File(...), include_segments: bool = False):
+    """
+    Transcribe an audio file and estimate the speaker's accent.
+
+    Parameters:
+    - include_segments: Also return Whisper's timestamped segments
+
+    Returns 429 with Retry-After when the accent workers' queue is full.
+    """
+    # Refuse before spooling the upload when already at capacity
+    accent_inference_pool.check_capacity()
+    with await spool_upload(file) as upload:
+        return await accent_inference_pool.run(analyze_accent_file, upload, include_segments)
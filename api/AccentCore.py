@@ -0,0 +1,2688 @@
+# Accent analysis shared by the accent API, accent_batch.py and the Streamlit page. It imports
+# nothing from the API, so the page can use it without FastAPI or the service's modules.
+from collections import Counter, OrderedDict
+from typing import BinaryIO, Dict, Iterable, Iterator, Tuple, Union
+import hashlib
+import numpy as np
+import re
+import subprocess
+import tempfile
+import threading
+
+WHISPER_MODEL_SIZES = ["tiny", "base", "small"]
+
+# Score weights applied to each kind of match
+VOCABULARY_WEIGHT = 2
+WORD_PATTERN_WEIGHT = 1.5
+
+# Score categories and their weights in the overall accent score
+SCORE_CATEGORIES = ("vocabulary", "phonetic", "grammatical")
+CATEGORY_WEIGHTS = np.array([0.4, 0.35, 0.25])
+
+# Streaming analysis: audio is cut at the quietest point between the minimum and maximum
+# window length, and windows with no frame above the silence level are not transcribed
+SAMPLE_RATE = 16000  # whisper.audio.SAMPLE_RATE; whisper pulls in torch, so it is imported on first use
+STREAM_WINDOW_SECONDS = 30
+STREAM_MIN_WINDOW_SECONDS = 10
+VAD_FRAME_SECONDS = 0.03
+VAD_SILENCE_DBFS = -45
+STREAM_PROMPT_CHARS = 200
+
+# Acoustic prosody: 40 ms frames every 10 ms, analysed in blocks of PROSODY_BLOCK_SECONDS. Frames
+# within SPEECH_RANGE_DB of the loud end of their block count as speech, silences of PAUSE_MIN_SECONDS or more are pauses, and peaks of
+# the 300-3000 Hz band energy approximate syllable nuclei.
+PROSODY_FRAME_SECONDS = 0.040
+PROSODY_HOP_SECONDS = 0.010
+PROSODY_BLOCK_SECONDS = STREAM_WINDOW_SECONDS
+SPEECH_RANGE_DB = 30
+PAUSE_MIN_SECONDS = 0.2
+PITCH_MIN_HZ = 75
+PITCH_MAX_HZ = 400
+VOICING_THRESHOLD = 0.45
+SYLLABLE_BAND_HZ = (300, 3000)
+SYLLABLE_PROMINENCE_DB = 3
+SYLLABLE_MIN_GAP_SECONDS = 0.1
+# nPVI of syllable intervals below/above these reads as syllable-/stress-timed; interval nPVI runs
+# lower than vocalic nPVI because neighbouring intervals share a syllable
+RHYTHM_NPVI_SYLLABLE_TIMED = 35
+RHYTHM_NPVI_STRESS_TIMED = 45
+PROSODY_CACHE_SIZE = 64
+
+# Pattern shapes that can be answered from one tokenization or character count of the
+# transcript instead of a regex scan per pattern
+_WORD = re.compile(r"\w+")
+_CHAR_CLASS_PATTERN = re.compile(r"\[([^\]\[\\^-]+)\]")
+_SUFFIX_PATTERN = re.compile(r"(\(\?i\))?(?:\\b)?\\w\+(\w+)\\b")
+_PREFIX_PATTERN = re.compile(r"(\(\?i\))?\\b(\w+)\\w\+(?:\\b)?")
+_WORDS_PATTERN = re.compile(r"(\(\?i\))?\\b(?:\((\w+(?:\|\w+)*)\)|(\w+))\\b")
+
+def _trie_regex(words):
+    """Build a regex matching any of the words, factored by common prefix and preferring the longest."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+class AccentPatternEngine:
+    """
+    Accent pattern matcher compiled once from the accent_patterns table.
+
+    Vocabulary is matched with a single prefix-trie regex: every position of the transcript is
+    tried once, and the longest vocabulary word found there also credits the vocabulary words that
+    are its prefixes, which keeps the "word occurs anywhere in the text" semantics. Each distinct
+    pattern is a rule credited to every accent and category that lists it. Character classes and
+    whole-word, prefix and suffix patterns are counted from one character count and one
+    tokenization of the transcript; the remaining patterns are precompiled regexes.
+
+    Scoring is linear algebra over a feature vector per transcript (vocabulary word presence
+    followed by pattern match counts): ``feature_weights`` maps features to raw per-accent scores
+    for each category, so a whole archive of feature counts can be re-scored with new weights
+    without matching the transcripts again.
+    """
+
+    def __init__(self, accent_patterns):
+        self.accents = list(accent_patterns.keys())
+
+        # vocabulary word -> [accent index, ...], one entry per listing
+        self._vocabulary = {}
+        for index, patterns in enumerate(accent_patterns.values()):
+            for word in patterns.get("vocabulary", []):
+                if word:
+                    self._vocabulary.setdefault(word.lower(), []).append(index)
+        words = sorted(self._vocabulary)
+        self._vocabulary_regex = re.compile("(?=(" + _trie_regex(words) + "))")
+        self._vocabulary_prefixes = {
+            word: [word[:i] for i in range(1, len(word) + 1) if word[:i] in self._vocabulary]
+            for word in words
+        }
+
+        # pattern string -> [(accent index, category, weight), ...]
+        credits = {}
+        for index, patterns in enumerate(accent_patterns.values()):
+            if "word_patterns" in patterns:
+                credits.setdefault(patterns["word_patterns"], []).append((index, "vocabulary", WORD_PATTERN_WEIGHT))
+            for pattern in patterns.get("phonetic_patterns", {}).values():
+                credits.setdefault(pattern, []).append((index, "phonetic", 1))
+            for pattern in patterns.get("grammatical_patterns", []):
+                credits.setdefault(pattern, []).append((index, "grammatical", 1))
+
+        self._vocabulary_features = {word: feature for feature, word in enumerate(words)}
+        self._rule_offset = len(words)
+        self.feature_count = self._rule_offset + len(credits)
+
+        # categories x accents x features
+        self.feature_weights = np.zeros((len(SCORE_CATEGORIES), len(self.accents), self.feature_count))
+        vocabulary = SCORE_CATEGORIES.index("vocabulary")
+        for word, feature in self._vocabulary_features.items():
+            np.add.at(self.feature_weights[vocabulary, :, feature], self._vocabulary[word], VOCABULARY_WEIGHT)
+        for rule, targets in enumerate(credits.values()):
+            for index, category, weight in targets:
+                self.feature_weights[SCORE_CATEGORIES.index(category), index, self._rule_offset + rule] += weight
+
+        self._regex_rules = []
+        self._char_rules = []
+        self._word_rules = {}
+        self._suffix_rules = {}
+        self._prefix_rules = {}
+        for rule, pattern in enumerate(credits):
+            self._add_rule(rule, pattern)
+
+    def _add_rule(self, rule, pattern):
+        # Transcripts are lowercased, so case-insensitive literals are compared in lowercase
+        if match := _CHAR_CLASS_PATTERN.fullmatch(pattern):
+            self._char_rules.append((frozenset(match.group(1)), rule))
+        elif match := _WORDS_PATTERN.fullmatch(pattern):
+            for word in set((match.group(2) or match.group(3)).split("|")):
+                self._word_rules.setdefault(word.lower() if match.group(1) else word, []).append(rule)
+        elif match := _SUFFIX_PATTERN.fullmatch(pattern):
+            suffix = match.group(2).lower() if match.group(1) else match.group(2)
+            self._suffix_rules.setdefault(len(suffix), {}).setdefault(suffix, []).append(rule)
+        elif match := _PREFIX_PATTERN.fullmatch(pattern):
+            prefix = match.group(2).lower() if match.group(1) else match.group(2)
+            self._prefix_rules.setdefault(len(prefix), {}).setdefault(prefix, []).append(rule)
+        else:
+            self._regex_rules.append((re.compile(pattern), rule))
+
+    def feature_counts(self, text):
+        """Return the feature vector of a transcript: vocabulary presence, then pattern match counts."""
+        text = text.lower()
+        features = np.zeros(self.feature_count)
+        counts = features[self._rule_offset:]
+
+        for match in self._vocabulary_regex.finditer(text):
+            for word in self._vocabulary_prefixes[match.group(1)]:
+                features[self._vocabulary_features[word]] = 1
+
+        chars = Counter(text)
+        for charset, rule in self._char_rules:
+            counts[rule] = sum(chars[char] for char in charset)
+
+        # "\w+ab\b" matches once per word longer than its suffix, "\bab\w+" likewise for prefixes
+        for token, occurrences in Counter(_WORD.findall(text)).items():
+            for rule in self._word_rules.get(token, ()):
+                counts[rule] += occurrences
+            for length, table in self._suffix_rules.items():
+                if len(token) > length:
+                    for rule in table.get(token[-length:], ()):
+                        counts[rule] += occurrences
+            for length, table in self._prefix_rules.items():
+                if len(token) > length:
+                    for rule in table.get(token[:length], ()):
+                        counts[rule] += occurrences
+
+        for pattern, rule in self._regex_rules:
+            counts[rule] = sum(1 for _ in pattern.finditer(text))
+
+        return features
+
+    def count_features(self, texts):
+        """Stack the feature vectors of several transcripts into a transcripts x features matrix."""
+        return np.vstack([self.feature_counts(text) for text in texts]) if texts else np.zeros((0, self.feature_count))
+
+    def category_scores(self, features):
+        """Map a transcripts x features matrix to categories x transcripts x accents, normalized per category."""
+        categories, accents, _ = self.feature_weights.shape
+        scores = features @ self.feature_weights.reshape(categories * accents, -1).T
+        scores = scores.reshape(len(features), categories, accents).transpose(1, 0, 2)
+        totals = scores.sum(axis=2, keepdims=True)
+        return np.divide(scores, totals, out=scores, where=totals > 0)
+
+    @staticmethod
+    def weighted_scores(scores, weights=CATEGORY_WEIGHTS):
+        """Combine category scores into transcripts x accents overall scores."""
+        return np.tensordot(weights, scores, axes=1)
+
+    def merge_features(self, total, features):
+        """Accumulate window features in place: vocabulary presence is or-ed, pattern counts are summed."""
+        vocabulary = slice(0, self._rule_offset)
+        np.maximum(total[vocabulary], features[vocabulary], out=total[vocabulary])
+        total[self._rule_offset:] += features[self._rule_offset:]
+        return total
+
+    def score_batch(self, texts, weights=CATEGORY_WEIGHTS):
+        """Score many transcripts at once, returning (category scores, weighted scores) arrays."""
+        scores = self.category_scores(self.count_features(texts))
+        return scores, self.weighted_scores(scores, weights)
+
+    def score(self, text):
+        """Return normalized (vocabulary, phonetic, grammatical) score dicts for a transcript."""
+        scores = self.category_scores(self.feature_counts(text)[np.newaxis])[:, 0]
+        return tuple(dict(zip(self.accents, category.tolist())) for category in scores)
+
+AudioInput = Union[str, bytes, BinaryIO, np.ndarray]
+
+def _ffmpeg_command(source: str):
+    return [
+        "ffmpeg", "-loglevel", "error", "-threads", "0", "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE), "-"
+    ]
+
+def _pcm_to_float(data: bytes) -> np.ndarray:
+    return np.frombuffer(data[:len(data) // 2 * 2], np.int16).astype(np.float32) / 32768.0
+
+def decode_audio_bytes(data: bytes) -> np.ndarray:
+    """Decode an encoded audio file held in memory to 16 kHz mono float32 through an ffmpeg pipe."""
+    result = subprocess.run(_ffmpeg_command("pipe:0"), input=data, capture_output=True)
+    if result.returncode == 0:
+        return _pcm_to_float(result.stdout)
+    # MP4/M4A files with the index at the end cannot be read from a pipe; ffmpeg needs to seek
+    with tempfile.NamedTemporaryFile() as tmp_file:
+        tmp_file.write(data)
+        tmp_file.flush()
+        result = subprocess.run(_ffmpeg_command(tmp_file.name), stdin=subprocess.DEVNULL, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {result.stderr.decode(errors='replace')}")
+    return _pcm_to_float(result.stdout)
+
+def decode_audio_file(file: BinaryIO) -> np.ndarray:
+    """Decode an open audio file on disk to 16 kHz mono float32, with ffmpeg reading it directly."""
+    file.seek(0)
+    # Opening /dev/stdin reopens the file itself rather than a pipe, so ffmpeg can still seek,
+    # e.g. to an MP4/M4A index at the end
+    result = subprocess.run(_ffmpeg_command("/dev/stdin"), stdin=file, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {result.stderr.decode(errors='replace')}")
+    return _pcm_to_float(result.stdout)
+
+def load_audio(audio: AudioInput) -> np.ndarray:
+    """
+    Return 16 kHz mono float32 samples for a file path, an open file, encoded bytes or a sample buffer.
+    Buffers must already be 16 kHz; int16 samples are rescaled and channels averaged.
+    """
+    if isinstance(audio, str):
+        import whisper
+        return whisper.load_audio(audio)
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return decode_audio_bytes(bytes(audio))
+    if hasattr(audio, "fileno"):
+        return decode_audio_file(audio)
+    audio = np.asarray(audio)
+    if audio.dtype == np.int16:
+        audio = audio.astype(np.float32) / 32768.0
+    if audio.ndim == 2:
+        audio = audio.mean(axis=1)
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+def stream_audio(path: str, chunk_seconds: float = STREAM_WINDOW_SECONDS) -> Iterator[np.ndarray]:
+    """Decode a file with ffmpeg to 16 kHz mono float32, yielding it in chunks instead of all at once."""
+    chunk_bytes = int(chunk_seconds * SAMPLE_RATE) * 2
+    process = subprocess.Popen(
+        _ffmpeg_command(path), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    try:
+        while data := process.stdout.read(chunk_bytes):
+            yield _pcm_to_float(data)
+        if process.wait() != 0:
+            raise RuntimeError(f"Failed to decode audio: {process.stderr.read().decode(errors='replace')}")
+    finally:
+        process.kill()
+        process.stdout.close()
+        process.stderr.close()
+
+def frame_energy(audio: np.ndarray, frame: int) -> np.ndarray:
+    """RMS energy of consecutive frames of `frame` samples."""
+    frames = audio[:len(audio) // frame * frame].reshape(-1, frame)
+    return np.sqrt(np.mean(np.square(frames), axis=1))
+
+def _quietest_cut(window: np.ndarray, min_samples: int, frame: int) -> int:
+    energy = frame_energy(window[min_samples:], frame)
+    if not len(energy):
+        return len(window)
+    return min_samples + int(np.argmin(energy)) * frame + frame // 2
+
+def split_on_silence(chunks: Iterable[np.ndarray], max_seconds: float = STREAM_WINDOW_SECONDS,
+                     min_seconds: float = STREAM_MIN_WINDOW_SECONDS) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Regroup a stream of audio chunks into (start sample, window) pairs of at most max_seconds,
+    cutting at the quietest frame after min_seconds and dropping windows that are all silence.
+    """
+    max_samples, min_samples = int(max_seconds * SAMPLE_RATE), int(min_seconds * SAMPLE_RATE)
+    frame = int(VAD_FRAME_SECONDS * SAMPLE_RATE)
+    silence = 10 ** (VAD_SILENCE_DBFS / 20)
+    buffer, offset = np.zeros(0, np.float32), 0
+
+    def voiced(window):
+        return len(window) >= frame and frame_energy(window, frame).max() > silence
+
+    for chunk in chunks:
+        buffer = np.concatenate([buffer, chunk])
+        while len(buffer) >= max_samples:
+            cut = _quietest_cut(buffer[:max_samples], min_samples, frame)
+            if voiced(buffer[:cut]):
+                yield offset, buffer[:cut]
+            buffer, offset = buffer[cut:], offset + cut
+    if voiced(buffer):
+        yield offset, buffer
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) indices of the runs of True in a boolean array."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+def prosody_measurements(audio: np.ndarray, offset: float = 0.0) -> Dict[str, np.ndarray]:
+    """
+    Frame-level acoustic measurements of 16 kHz audio: speech/pause runs, voiced pitch, speech
+    energy and syllable nucleus times (shifted by offset).
+
+    The audio is measured in blocks of PROSODY_BLOCK_SECONDS, like the windows of a stream, so
+    the frame and spectrum matrices stay the same size however long the recording is.
+    """
+    block = int(PROSODY_BLOCK_SECONDS * SAMPLE_RATE)
+    measurements = {}
+    for start in range(0, max(len(audio), 1), block):
+        measurements = merge_prosody_measurements(
+            measurements, _block_prosody_measurements(audio[start:start + block], offset + start / SAMPLE_RATE)
+        )
+    return measurements
+
+def _block_prosody_measurements(audio: np.ndarray, offset: float) -> Dict[str, np.ndarray]:
+    """Measurements of one block of audio from a single short-time Fourier transform."""
+    # scipy.signal alone takes about a second to import, so keep it off the startup path
+    from scipy import fft as sp_fft
+    from scipy.signal import find_peaks
+
+    frame = int(PROSODY_FRAME_SECONDS * SAMPLE_RATE)
+    hop = int(PROSODY_HOP_SECONDS * SAMPLE_RATE)
+    empty = np.zeros(0)
+    measurements = {"duration": np.array([len(audio) / SAMPLE_RATE]), "utterances": empty,
+                    "utterance_rates": empty, "pauses": empty, "pitch": empty, "energy": empty, "syllables": empty}
+    if len(audio) < frame:
+        return measurements
+
+    low_lag, high_lag = SAMPLE_RATE // PITCH_MAX_HZ, SAMPLE_RATE // PITCH_MIN_HZ
+    window = np.hanning(frame).astype(np.float32)
+    frames = np.lib.stride_tricks.sliding_window_view(np.asarray(audio, np.float32), frame)[::hop] * window
+    # Long enough that the autocorrelation does not wrap around up to the longest pitch period
+    n_fft = 1 << (frame + high_lag - 1).bit_length()
+    spectrum = sp_fft.rfft(frames, n_fft, workers=-1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+
+    # Speech activity from frame energy, relative to the loud end of this block
+    energy = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    speech = energy > max(VAD_SILENCE_DBFS, np.percentile(energy, 95) - SPEECH_RANGE_DB)
+    if not speech.any():
+        return measurements
+
+    # Pitch of speech frames from the autocorrelation (inverse FFT of the power spectrum),
+    # corrected for the autocorrelation of the analysis window
+    autocorrelation = sp_fft.irfft(power[speech], n_fft, workers=-1)[:, :high_lag + 1]
+    window_autocorrelation = sp_fft.irfft(np.abs(sp_fft.rfft(window, n_fft)) ** 2, n_fft)[:high_lag + 1]
+    normalized = (autocorrelation[:, low_lag:] / (autocorrelation[:, :1] + 1e-10)
+                  / (window_autocorrelation[low_lag:] / window_autocorrelation[0]))
+    best = np.argmax(normalized, axis=1)
+    voiced = normalized[np.arange(len(best)), best] > VOICING_THRESHOLD
+    pitch = SAMPLE_RATE / (low_lag + best[voiced])
+
+    # Utterances are speech runs joined across gaps shorter than a pause
+    starts, ends = _runs(speech)
+    gaps = starts[1:] - ends[:-1]
+    is_pause = gaps * PROSODY_HOP_SECONDS >= PAUSE_MIN_SECONDS
+    utterance_starts = starts[np.concatenate([[True], is_pause])]
+    utterance_ends = ends[np.concatenate([is_pause, [True]])]
+
+    # Syllable nuclei as prominent peaks of the smoothed speech-band energy inside utterances
+    freqs = np.fft.rfftfreq(n_fft, 1 / SAMPLE_RATE)
+    band = (freqs >= SYLLABLE_BAND_HZ[0]) & (freqs <= SYLLABLE_BAND_HZ[1])
+    band_energy = np.convolve(10 * np.log10(power[:, band].sum(axis=1) + 1e-10), np.ones(5) / 5, mode="same")
+    peaks, _ = find_peaks(
+        band_energy,
+        prominence=SYLLABLE_PROMINENCE_DB,
+        distance=max(1, int(SYLLABLE_MIN_GAP_SECONDS / PROSODY_HOP_SECONDS))
+    )
+    peaks = peaks[speech[peaks]]
+    utterance_durations = (utterance_ends - utterance_starts) * PROSODY_HOP_SECONDS
+    syllable_counts = (np.searchsorted(peaks, utterance_ends) - np.searchsorted(peaks, utterance_starts))
+
+    return {
+        "duration": np.array([len(audio) / SAMPLE_RATE]),
+        "utterances": utterance_durations,
+        "utterance_rates": syllable_counts / np.maximum(utterance_durations, PROSODY_HOP_SECONDS),
+        "pauses": gaps[is_pause] * PROSODY_HOP_SECONDS,
+        "pitch": pitch.astype(np.float64),
+        "energy": energy[speech].astype(np.float64),
+        "syllables": offset + peaks * PROSODY_HOP_SECONDS,
+    }
+
+def merge_prosody_measurements(total: Dict[str, np.ndarray], measurements: Dict[str, np.ndarray]):
+    """Concatenate the measurements of consecutive windows."""
+    if not total:
+        return dict(measurements)
+    return {key: np.concatenate([total[key], measurements[key]]) for key in total}
+
+def summarize_prosody(measurements: Dict[str, np.ndarray]) -> Dict[str, Union[float, str]]:
+    """Reduce acoustic measurements to the prosody features reported with an analysis."""
+    def mean(values):
+        return float(np.mean(values)) if len(values) else 0.0
+
+    def var(values):
+        return float(np.var(values)) if len(values) else 0.0
+
+    # Normalized pairwise variability of intervals between syllables of the same utterance
+    intervals = np.diff(measurements["syllables"])
+    intervals = intervals[(intervals > 0) & (intervals < PAUSE_MIN_SECONDS + SYLLABLE_MIN_GAP_SECONDS * 4)]
+    pairs = np.abs(np.diff(intervals)) / ((intervals[1:] + intervals[:-1]) / 2)
+    npvi = 100 * mean(pairs)
+    if len(pairs) and npvi < RHYTHM_NPVI_SYLLABLE_TIMED:
+        rhythm = "syllable-timed"
+    elif npvi > RHYTHM_NPVI_STRESS_TIMED:
+        rhythm = "stress-timed"
+    else:
+        rhythm = "mixed"
+
+    semitones = 12 * np.log2(measurements["pitch"] / 100.0) if len(measurements["pitch"]) else np.zeros(0)
+    speech_time = float(measurements["utterances"].sum())
+    return {
+        "average_segment_duration": mean(measurements["utterances"]),
+        "average_pause_duration": mean(measurements["pauses"]),
+        "average_speech_rate": len(measurements["syllables"]) / speech_time if speech_time else 0.0,
+        "speech_rate_variance": var(measurements["utterance_rates"]),
+        "rhythm_pattern": rhythm,
+        "rhythm_npvi": npvi,
+        "pause_ratio": 1 - speech_time / float(measurements["duration"].sum()) if speech_time else 1.0,
+        "mean_pitch_hz": float(np.median(measurements["pitch"])) if len(measurements["pitch"]) else 0.0,
+        "pitch_range_semitones": float(np.percentile(semitones, 90) - np.percentile(semitones, 10)) if len(semitones) else 0.0,
+        "pitch_variability_semitones": float(np.std(semitones)) if len(semitones) else 0.0,
+        "mean_energy_db": mean(measurements["energy"]),
+        "energy_variability_db": float(np.std(measurements["energy"])) if len(measurements["energy"]) else 0.0,
+    }
+
+_prosody_cache = OrderedDict()
+_prosody_cache_lock = threading.Lock()
+
+def acoustic_prosody(audio: np.ndarray) -> Dict[str, Union[float, str]]:
+    """Acoustic prosody features of 16 kHz audio, cached by a hash of the samples."""
+    key = hashlib.sha1(np.ascontiguousarray(audio, dtype=np.float32)).hexdigest()
+    with _prosody_cache_lock:
+        if key in _prosody_cache:
+            _prosody_cache.move_to_end(key)
+            return _prosody_cache[key]
+    features = summarize_prosody(prosody_measurements(audio))
+    with _prosody_cache_lock:
+        _prosody_cache[key] = features
+        if len(_prosody_cache) > PROSODY_CACHE_SIZE:
+            _prosody_cache.popitem(last=False)
+    return features
+
+class AccentAnalyzer:
+    def __init__(self, model=None, model_size="base"):
+        # Pass a preloaded model to share one set of weights between analyzers
+        if model is None:
+            import whisper
+            model = whisper.load_model(model_size)
+        self.model = model
+        
+        # Enhanced accent characteristics including African accents
+        self.accent_patterns = {
+            "Ghanaian": {
+                "word_patterns": r"\b(please|sorry|okay|aiih)\b",
+                "vocabulary": [
+                    "charlie", "chale", "ei", "herh", "ah", "ooo", "abi",
+                    "kafra", "medaase", "yoo", "massa", "aswear",
+                    "anyways", "whereby", "somehow"
+                ],
+                "phonetic_patterns": {
+                    "th_substitution": r"\b(th[aeiou])",  # 'th' sound often pronounced as 't'
+                    "final_stress": r"ing\b",  # distinctive stress on final syllables
+                    "vowel_patterns": r"(er|or)\b"  # distinctive vowel sounds
+                },
+                "grammatical_patterns": [
+                    r"(?i)\b(am|is|are)\s+having\b",  # stative verbs in continuous form
+                    r"(?i)\b(make|let)\s+I\b",        # distinctive verb usage
+                    r"(?i)\b(since|for)\s+long\b"     # time expressions
+                ]
+            },
+            "Nigerian": {
+                "word_patterns": r"\b(abi|sha|na|wahala|shebi)\b",
+                "vocabulary": [
+                    "bros", "oga", "wahala", "gist", "abeg", "wetin",
+                    "joor", "sha", "sef", "shey", "oyibo", "yeye",
+                    "pikin", "chop", "kpeke", "kele"
+                ],
+                "phonetic_patterns": {
+                    "th_substitution": r"\b(th[aeiou])",
+                    "vowel_lengthening": r"([aeiou])\1+",
+                    "syllable_timing": r"\b\w+ing\b"
+                },
+                "grammatical_patterns": [
+                    r"(?i)\b(no|not)\s+be\b",
+                    r"(?i)\bdey\b",
+                    r"(?i)\bna\b"
+                ]
+            },
+            "Kenyan": {
+                "word_patterns": r"\b(sijui|sawa|pole|jambo)\b",
+                "vocabulary": [
+                    "maze", "sawa", "kwani", "sijui", "pole", "tafadhali",
+                    "hapana", "mzee", "mambo", "poa", "asante", "karibu"
+                ],
+                "phonetic_patterns": {
+                    "consonant_clusters": r"(str|spr|scr)",
+                    "vowel_harmony": r"([aeiou])\1",
+                    "stress_pattern": r"\b\w+ly\b"
+                }
+            },
+            "South African": {
+                "word_patterns": r"\b(ja|né|shame|ag)\b",
+                "vocabulary": [
+                    "shame", "just now", "robot", "braai", "lekker",
+                    "howzit", "yebo", "eish", "bru", "aikona", "voetsek",
+                    "now now", "ja", "né"
+                ],
+                "phonetic_patterns": {
+                    "vowel_raising": r"(ee|oo)\b",
+                    "final_devoicing": r"[bdg]\b",
+                    "trilled_r": r"\br\w+"
+                }
+            },
+            "British": {
+                "word_patterns": r"\b(rather|quite|proper|bloody)\b",
+                "vocabulary": [
+                    "bloody", "mate", "brilliant", "cheers", "proper",
+                    "quid", "fiver", "tenner", "bloke", "knackered",
+                    "peckish", "gobsmacked", "chuffed"
+                ],
+                "phonetic_patterns": {
+                    "non_rhotic": r"[aeiou]r\b",
+                    "t_glottalization": r"\bt\w+",
+                    "ing_pronunciation": r"ing\b"
+                }
+            },
+            "American": {
+                "word_patterns": r"\b(like|awesome|totally|gonna|wanna)\b",
+                "vocabulary": [
+                    "guys", "awesome", "y'all", "gonna", "wanna",
+                    "trash", "elevator", "apartment", "candy", "soccer",
+                    "buck", "period", "high school"
+                ],
+                "phonetic_patterns": {
+                    "rhotic": r"er\b",
+                    "t_flapping": r"\b\w+ter\b",
+                    "dropped_g": r"in'\b"
+                }
+            },
+            "Inuktitut": {
+        "word_patterns": r"\b(amma|kisiani|uvvaluunniit|suli|taimaa)\b",
+        "vocabulary": [
+            "ainngai", "nakurmiik", "tunngatit", "tavvauvutit",
+            "ii", "aaka", "qujannamiik", "aksut", "ilaali"
+        ],
+        "phonetic_patterns": {
+            "double_consonants": r"([ptkg])\1",
+            "uvular_sounds": r"[qr]",
+            "vowel_length": r"[aiu]{2}"
+        },
+        "grammatical_patterns": [
+            r"\w+vuq\b",     # 3rd person singular
+            r"\w+juq\b",     # Participial
+            r"\w+mit\b"      # Ablative case
+        ]
+    },
+
+    # CAUCASIAN FAMILY
+    "Chechen": {
+        "word_patterns": r"\b(я|амма|йа|хlун|муха)\b",
+        "vocabulary": [
+            "баркалла", "дика ду", "къинтера", "маршалла",
+            "хlаъ", "хlан-хlа", "дика", "нийса", "чlогlа"
+        ],
+        "phonetic_patterns": {
+            "ejectives": r"[пткцчl]l",
+            "pharyngeals": r"хl",
+            "lateral_consonants": r"[лхl]"
+        },
+        "grammatical_patterns": [
+            r"\w+ш\b",       # Infinitive
+            r"\w+на\b",      # Past tense
+            r"\w+ш\b"        # Plural
+        ]
+    },
+
+    # AUSTRONESIAN FAMILY - POLYNESIAN BRANCH
+    "Māori": {
+        "word_patterns": r"\b(me|engari|rānei|pēhea|āhea)\b",
+        "vocabulary": [
+            "kia ora", "tēnā koe", "aroha", "ka pai",
+            "āe", "kāo", "tahi", "rua", "nō reira"
+        ],
+        "phonetic_patterns": {
+            "long_vowels": r"[āēīōū]",
+            "consonant_pairs": r"[tkpmnngrw][aeiou]",
+            "diphthongs": r"(ae|ai|ao|au|ei|oi|ou)"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bkua\s+\w+\b",    # Past tense
+            r"(?i)\bka\s+\w+\b",     # Future/present
+            r"(?i)\b(ngā|te)\s+\w+\b" # Articles
+        ]
+    },
+
+    # QUECHUAN FAMILY
+    "Quechua": {
+        "word_patterns": r"\b(hina|ichaqa|utaq|imayna|hayka)\b",
+        "vocabulary": [
+            "allillanchu", "sulpayki", "paqarin kama", "rimaykullayki",
+            "ari", "mana", "allin", "munay", "sumaq"
+        ],
+        "phonetic_patterns": {
+            "ejectives": r"[ptkqč]'",
+            "aspirates": r"[ptkqč]h",
+            "uvular_stops": r"q"
+        },
+        "grammatical_patterns": [
+            r"\w+chka\b",    # Progressive
+            r"\w+rqa\b",     # Past tense
+            r"\w+kuna\b"     # Plural
+        ]
+    },
+
+    # NIGER-CONGO - BANTU BRANCH
+    "Zulu": {
+        "word_patterns": r"\b(futhi|kodwa|noma|ngani|kanjani)\b",
+        "vocabulary": [
+            "sawubona", "ngiyabonga", "uxolo", "hamba kahle",
+            "yebo", "cha", "kahle", "ncono", "kakhulu"
+        ],
+        "phonetic_patterns": {
+            "clicks": r"[qxc]",
+            "aspirated_stops": r"[ptkq]h",
+            "nasalized_vowels": r"[aeiou]n"
+        },
+        "grammatical_patterns": [
+            r"(?i)\buku\w+\b",    # Infinitive
+            r"(?i)\bizi\w+\b",    # Plural class 8
+            r"(?i)\baba\w+\b"     # Class 2 prefix
+        ]
+    },
+
+    # TIBETO-BURMAN FAMILY
+    "Tibetan": {
+        "word_patterns": r"\b(དང་|ཡིན་|རེད་|འདུག་|སོང་)\b",
+        "vocabulary": [
+            "ཐུགས་རྗེ་ཆེ", "བཀྲ་ཤིས་བདེ་ལེགས", "དགོངས་དག",
+            "གཟིགས་གསོལ", "ལགས་རེད", "མ་རེད", "ཡག་པོ"
+        ],
+        "phonetic_patterns": {
+            "tones": r"[གདབ]$",
+            "aspirated": r"[ཁཆཐཕ]",
+            "nasals": r"[ངཉཎནམ]"
+        },
+        "grammatical_patterns": [
+            r"\w+པ་རེད\b",    # Past tense
+            r"\w+གི་འདུག\b",   # Present continuous
+            r"\w+བཞིན་ཡོད\b"    # Progressive
+        ]
+    },
+
+    # MON-KHMER FAMILY
+    "Khmer": {
+        "word_patterns": r"\b(និង|ប៉ុន្តែ|ឬ|ហេតុអ្វី|យ៉ាងម៉េច)\b",
+        "vocabulary": [
+            "សូមអរគុណ", "អត់អីទេ", "សូមទោស", "ជំរាបសួរ",
+            "បាទ/ចាស", "ទេ", "ល្អ", "យល់ព្រម", "ត្រូវហើយ"
+        ],
+        "phonetic_patterns": {
+            "aspirated": r"[ខឃថធផភ]",
+            "register": r"[់័ៈៗ]",
+            "clusters": r"[កខគឃងចឆជឈញ][្]"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bកំពុង\w+\b",     # Progressive
+            r"(?i)\bបាន\w+\b",      # Past tense
+            r"(?i)\bនឹង\w+\b"       # Future
+        ]
+    },
+
+    # DRAVIDIAN FAMILY
+    "Telugu": {
+        "word_patterns": r"\b(మరియు|కానీ|లేదా|ఎందుకు|ఎలా)\b",
+        "vocabulary": [
+            "నమస్కారం", "ధన్యవాదాలు", "క్షమించండి", "శుభోదయం",
+            "అవును", "కాదు", "మంచిది", "సరే", "బాగుంది"
+        ],
+        "phonetic_patterns": {
+            "aspirated": r"[ఖఘఛఝఠఢథధఫభ]",
+            "retroflex": r"[టఠడఢణ]",
+            "vowel_length": r"[ాీూెేైోౌం]"
+        },
+        "grammatical_patterns": [
+            r"\w+తున్నాను\b",    # Present continuous
+            r"\w+ను\b",         # Past tense
+            r"\w+తాను\b"        # Future
+        ]
+    },
+
+    # AINU FAMILY
+    "Ainu": {
+        "word_patterns": r"\b(kor|ne|wa|ta|un)\b",
+        "vocabulary": [
+            "irankarapte", "iyayraykere", "pirka", "hunna",
+            "ruwe", "somo", "hawe", "yakun", "nisa"
+        ],
+        "phonetic_patterns": {
+            "consonant_pairs": r"[ptcksmrw][aeiou]",
+            "final_vowels": r"[aeiou]$",
+            "pitch_accent": r"\w+ru\b"
+        },
+        "grammatical_patterns": [
+            r"\w+as\b",      # Plural
+            r"\w+an\b",      # Progressive
+            r"\w+pe\b"       # Nominalizer
+        ]
+    },
+
+    # TUPIAN FAMILY
+    "Guarani": {
+        "word_patterns": r"\b(ha|térã|ramo|mba'éichapa|moõpa)\b",
+        "vocabulary": [
+            "aguyje", "mba'éichapa", "jajotopá peve", "iporã",
+            "heẽ", "nahániri", "porã", "upéicha", "añete"
+        ],
+        "phonetic_patterns": {
+            "nasal_vowels": r"[ãẽĩõũ]",
+            "glottal_stop": r"'",
+            "stress_pattern": r"\w+́\b"
+        },
+        "grammatical_patterns": [
+            r"\w+ta\b",      # Future
+            r"\w+ma\b",      # Perfect
+            r"\w+kuéra\b"    # Plural
+        ]
+    },
+
+    "Finnish": {
+        "word_patterns": r"\b(no|joo|kyllä|siis|vaan)\b",
+        "vocabulary": [
+            "kiitos", "ole hyvä", "anteeksi", "terve", "näkemiin",
+            "hauska", "hyvä", "totta kai", "selvä", "mukava"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[äöy]+\w*[aou]|[aou]+\w*[äöy]",
+            "gemination": r"(\w)\1",
+            "diphthongs": r"(ai|ei|oi|ui|yi|äi|öi|au|eu|iu|ou|äy|öy)"
+        },
+        "grammatical_patterns": [
+            r"\w+ssa\b",  # Inessive case
+            r"\w+sta\b",  # Elative case
+            r"\w+ksi\b"   # Translative case
+        ]
+    },
+
+    "Hungarian": {
+        "word_patterns": r"\b(igen|nem|hát|szóval|akkor)\b",
+        "vocabulary": [
+            "köszönöm", "kérem", "bocsánat", "szia", "viszlát",
+            "persze", "rendben", "jó", "nagyon", "tessék"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[eéiíöőüű]+\w*[aáoóuú]|[aáoóuú]+\w*[eéiíöőüű]",
+            "long_vowels": r"[áéíóőúű]",
+            "digraphs": r"(sz|gy|ny|ty|zs)"
+        },
+        "grammatical_patterns": [
+            r"\w+ban\b",  # Inessive case
+            r"\w+ból\b",  # Elative case
+            r"\w+val\b"   # Instrumental case
+        ]
+    },
+
+    # CELTIC BRANCH
+    "Irish": {
+        "word_patterns": r"\b(tá|níl|bhí|agus|go)\b",
+        "vocabulary": [
+            "slán", "go raibh maith agat", "más é do thoil é", 
+            "dia duit", "conas atá tú", "maith", "ceart go leor"
+        ],
+        "phonetic_patterns": {
+            "broad_slender": r"[aouáóú][^aouáóú]+[aouáóú]|[eiéí][^aouáóú]+[eiéí]",
+            "lenition": r"[bcdfgmpt]h",
+            "eclipsis": r"(mb|gc|nd|bhf|ng|bp|dt)"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b(ag|ar|as|chuig|de|do|faoi|i|le|ó|roimh|thar|trí|um)\b",
+            r"\w+adh\b",  # Verbal noun
+            r"\w+igh\b"   # Genitive case
+        ]
+    },
+
+    # AUSTROASIATIC FAMILY
+    "Vietnamese": {
+        "word_patterns": r"\b(và|rồi|nhưng|vì|thì)\b",
+        "vocabulary": [
+            "cảm ơn", "không có chi", "xin lỗi", "tạm biệt",
+            "chào", "được", "vâng", "không", "đúng", "tốt"
+        ],
+        "phonetic_patterns": {
+            "tones": r"[áàảãạâấầẩẫậăắằẳẵặéèẻẽẹêếềểễệíìỉĩịóòỏõọôốồổỗộơớờởỡợúùủũụưứừửữự]",
+            "final_consonants": r"[ptcmnŋ]$",
+            "diphthongs": r"(ia|ưa|ua)"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b(đã|đang|sẽ)\b",  # Tense markers
+            r"(?i)\b(những|các)\b",    # Plural markers
+            r"(?i)\b(của|ở|trong)\b"   # Prepositions
+        ]
+    },
+
+    # NIGER-CONGO FAMILY
+    "Swahili": {
+        "word_patterns": r"\b(na|kwa|ya|wa|za)\b",
+        "vocabulary": [
+            "asante", "karibu", "pole", "jambo", "kwaheri",
+            "ndiyo", "hapana", "tafadhali", "sawa", "vizuri"
+        ],
+        "phonetic_patterns": {
+            "prenasalization": r"(mb|nd|ng|nj)",
+            "vowel_harmony": r"[aeiou]+",
+            "stress_pattern": r"\w+a\b"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bni\w+\b",     # Present tense
+            r"(?i)\bwa\w+\b",     # Possessive
+            r"(?i)\b[mk]\w+\b"    # Noun classes
+        ]
+    },
+
+    # AFROASIATIC FAMILY
+    "Hebrew": {
+        "word_patterns": r"\b(אז|רק|גם|אבל|או)\b",
+        "vocabulary": [
+            "שלום", "תודה", "בבקשה", "סליחה", "להתראות",
+            "כן", "לא", "בסדר", "מצוין", "טוב"
+        ],
+        "phonetic_patterns": {
+            "gutturals": r"[עחה]",
+            "dagesh": r"\w{2,}",
+            "schwa": r"ְ"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bה\w+\b",      # Definite article
+            r"(?i)\b\w+ים\b",     # Masculine plural
+            r"(?i)\b\w+ות\b"      # Feminine plural
+        ]
+    },
+
+    "Amharic": {
+        "word_patterns": r"\b(እና|ግን|ወይም|ስለ|እንደ)\b",
+        "vocabulary": [
+            "ሰላም", "አመሰግናለሁ", "እባክሽ/ህ", "ይቅርታ", "ደህና ሁን",
+            "አዎ", "አይ", "ጥሩ", "እሺ", "በጣም"
+        ],
+        "phonetic_patterns": {
+            "ejectives": r"[ጵጥጭጽፅ]",
+            "gemination": r"(\w)\1",
+            "labialization": r"[ሏቿኳጓ]"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b\w+አል\b",     # Negative
+            r"(?i)\b\w+ኛል\b",     # Present
+            r"(?i)\b\w+ዎች\b"      # Plural
+        ]
+    },
+
+    # KOREANIC FAMILY
+    "Korean": {
+        "word_patterns": r"\b(그리고|하지만|또는|왜|어떻게)\b",
+        "vocabulary": [
+            "감사합니다", "괜찮습니다", "미안합니다", "안녕하세요", 
+            "네", "아니요", "좋아요", "알겠습니다", "잘"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[아오우]|[어으이]",
+            "consonant_assimilation": r"ㄱㄴ|ㄱㅁ|ㄱㄹ",
+            "final_consonants": r"[ㄱㄴㄷㄹㅁㅂㅇ]$"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b\w+습니다\b",  # Formal polite
+            r"(?i)\b\w+요\b",      # Informal polite
+            r"(?i)\b\w+고\b"       # Conjunctive
+        ]
+    },
+
+    # MONGOLIC FAMILY
+    "Mongolian": {
+        "word_patterns": r"\b(бас|харин|эсвэл|яагаад|хэрхэн)\b",
+        "vocabulary": [
+            "баярлалаа", "зүгээр", "уучлаарай", "сайн байна уу",
+            "тийм", "үгүй", "сайн", "за", "болж байна"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[аоуы]|[эөүи]",
+            "long_vowels": r"[аэиоөуү]{2}",
+            "palatalization": r"[нлт]ь"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b\w+сан\b",     # Past tense
+            r"(?i)\b\w+даг\b",     # Habitual
+            r"(?i)\b\w+уд\b"       # Plural
+        ]
+    },
+
+    # TAI-KADAI FAMILY
+    "Thai": {
+        "word_patterns": r"\b(และ|แต่|หรือ|ทำไม|อย่างไร)\b",
+        "vocabulary": [
+            "ขอบคุณ", "ไม่เป็นไร", "ขอโทษ", "สวัสดี",
+            "ใช่", "ไม่", "ดี", "ตกลง", "เข้าใจ"
+        ],
+        "phonetic_patterns": {
+            "tones": r"[่้๊๋]",
+            "vowel_length": r"[าิีึืุู]",
+            "final_consonants": r"[งมนยวบด]$"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bจะ\w+\b",      # Future marker
+            r"(?i)\bกำลัง\w+\b",    # Progressive
+            r"(?i)\b\w+ๆ\b"        # Reduplication
+        ]
+    },
+
+    # KARTVELIAN FAMILY
+    "Georgian": {
+        "word_patterns": r"\b(და|მაგრამ|ან|რატომ|როგორ)\b",
+        "vocabulary": [
+            "გმადლობთ", "არაფრის", "ბოდიში", "გამარჯობა",
+            "კი", "არა", "კარგი", "გასაგებია", "რა თქმა უნდა"
+        ],
+        "phonetic_patterns": {
+            "ejectives": r"[პტკწც]'",
+            "consonant_clusters": r"[მნრლ]{2,}",
+            "stress_pattern": r"\w+ი\b"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b\w+ებ\b",      # Plural
+            r"(?i)\b\w+ის\b",      # Genitive
+            r"(?i)\b\w+ში\b"       # In/into
+        ]
+    },"German": {
+        "word_patterns": r"\b(also|ja|nein|doch|mal)\b",
+        "vocabulary": [
+            "genau", "sehr", "natürlich", "vielleicht", "schon",
+            "aber", "dann", "jetzt", "heute", "hier", "dort",
+            "bitte", "danke", "tschüss", "auf wiedersehen"
+        ],
+        "phonetic_patterns": {
+            "final_devoicing": r"[bdg]\b",
+            "ch_sound": r"ch\b",
+            "umlauts": r"[äöüß]"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b(haben|sein)\s+\w+en\b",  # Perfect tense structure
+            r"\b\w+en\b$",                     # Verb infinitives
+            r"(?i)\bzu\s+\w+en\b"             # zu + infinitive
+        ]
+    },
+    "Dutch": {
+        "word_patterns": r"\b(wel|even|toch|maar|nog)\b",
+        "vocabulary": [
+            "lekker", "gezellig", "hoor", "dus", "maar",
+            "even", "gewoon", "wel", "natuurlijk", "helemaal",
+            "eigenlijk", "best", "prima", "graag"
+        ],
+        "phonetic_patterns": {
+            "ui_sound": r"ui",
+            "ij_sound": r"ij",
+            "g_sound": r"\bg\w+"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b(hebben|zijn)\s+ge\w+\b",
+            r"\bge\w+t\b",
+            r"(?i)\bte\s+\w+en\b"
+        ]
+    },
+
+    # Romance Branch
+    "French": {
+        "word_patterns": r"\b(donc|alors|voilà|quoi|bien)\b",
+        "vocabulary": [
+            "bon", "alors", "voilà", "donc", "quoi",
+            "enfin", "bref", "ben", "euh", "quand même",
+            "plutôt", "franchement", "effectivement"
+        ],
+        "phonetic_patterns": {
+            "nasal_vowels": r"[aeiou]n\b",
+            "liaison": r"\b\w+s\s+[aeiou]",
+            "silent_letters": r"\w[tdsp]\b"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bne\s+\w+\s+pas\b",
+            r"(?i)\bil\s+y\s+a\b",
+            r"(?i)\bc'est\b"
+        ]
+    },
+    "Spanish": {
+        "word_patterns": r"\b(pues|entonces|bueno|vale|oye)\b",
+        "vocabulary": [
+            "vale", "bueno", "pues", "oye", "mira",
+            "claro", "venga", "hombre", "tío", "tía",
+            "guay", "genial", "vale", "hala"
+        ],
+        "phonetic_patterns": {
+            "ll_sound": r"ll",
+            "ñ_sound": r"ñ",
+            "silent_h": r"\bh\w+"
+        },
+        "grammatical_patterns": [
+            r"(?i)\besta(r|s|mos|n)\b",
+            r"(?i)\bhaber\s+\w+do\b",
+            r"(?i)\blo\s+que\b"
+        ]
+    },
+
+    # SINO-TIBETAN FAMILY
+    "Mandarin": {
+        "word_patterns": r"\b(的|了|吧|呢|啊)\b",
+        "vocabulary": [
+            "好的", "那个", "这个", "就是", "没有",
+            "可以", "不要", "真的", "什么", "怎么",
+            "为什么", "所以", "但是", "因为"
+        ],
+        "phonetic_patterns": {
+            "tones": r"[āáǎà]",
+            "final_particles": r"[吗呢啊吧]$",
+            "er_sound": r"儿$"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b[在正]\s*\w+",  # Progressive aspect
+            r"(?i)\b了\s*\w+了\b",   # Completed action
+            r"(?i)\b都\s*\w+\b"      # Universal quantifier
+        ]
+    },
+
+    # JAPONIC FAMILY
+    "Japanese": {
+        "word_patterns": r"\b(です|ます|けど|って|ね)\b",
+        "vocabulary": [
+            "はい", "いいえ", "すみません", "ありがとう", "お願いします",
+            "そうですか", "なるほど", "ごめんなさい", "大丈夫", "よろしく"
+        ],
+        "phonetic_patterns": {
+            "long_vowels": r"[あいうえお]ー",
+            "syllable_structure": r"[かきくけこ]",
+            "pitch_accent": r"\w+っ\w+"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b\w+ています\b",
+            r"(?i)\b\w+んです\b",
+            r"(?i)\b\w+ようです\b"
+        ]
+    },
+
+    # ARABIC FAMILY
+    "Modern Standard Arabic": {
+        "word_patterns": r"\b(يا|في|من|على|إلى)\b",
+        "vocabulary": [
+            "نعم", "لا", "شكراً", "من فضلك", "السلام عليكم",
+            "إن شاء الله", "الحمد لله", "مرحباً", "مع السلامة"
+        ],
+        "phonetic_patterns": {
+            "emphatic_consonants": r"[صضطظ]",
+            "pharyngeal_sounds": r"[حع]",
+            "long_vowels": r"[اوي]"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bال\w+\b",         # Definite article
+            r"(?i)\b\w+ون\b",         # Masculine plural
+            r"(?i)\b\w+ات\b"          # Feminine plural
+        ]
+    },
+
+    # DRAVIDIAN FAMILY
+    "Tamil": {
+        "word_patterns": r"\b(ஆமா|இல்லை|சரி|ஏன்|என்ன)\b",
+        "vocabulary": [
+            "வணக்கம்", "நன்றி", "மன்னிக்கவும்", "சரி",
+            "பரவாயில்லை", "புரிகிறது", "பாருங்கள்"
+        ],
+        "phonetic_patterns": {
+            "retroflex": r"[டணரல]",
+            "aspirated": r"க்ஹ",
+            "vowel_harmony": r"[அஆஇஈஉஊ]"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b\w+கிறேன்\b",    # Present tense
+            r"(?i)\b\w+வேன்\b",      # Future tense
+            r"(?i)\b\w+தான்\b"       # Emphasis marker
+        ]
+    },
+
+    # SLAVIC BRANCH
+    "Russian": {
+        "word_patterns": r"\b(ну|вот|же|да|нет)\b",
+        "vocabulary": [
+            "хорошо", "спасибо", "пожалуйста", "извините",
+            "конечно", "точно", "правда", "ладно", "давай"
+        ],
+        "phonetic_patterns": {
+            "palatalization": r"[бвгдзклмнпрстфх]ь",
+            "vowel_reduction": r"о|е",
+            "consonant_clusters": r"\w{3,}"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b\w+ть\b",         # Verb infinitive
+            r"(?i)\b\w+ся\b",         # Reflexive verbs
+            r"(?i)\b\w+[ыи]\b"        # Plural nouns
+        ]
+    },
+
+    # AUSTRONESIAN FAMILY
+    "Indonesian": {
+        "word_patterns": r"\b(sudah|belum|akan|sedang|lagi)\b",
+        "vocabulary": [
+            "iya", "tidak", "terima kasih", "sama-sama", "permisi",
+            "maaf", "silakan", "tolong", "selamat", "bagus"
+        ],
+        "phonetic_patterns": {
+            "ng_sound": r"ng",
+            "stress_pattern": r"\w+kan\b",
+            "diphthongs": r"[aeiou][aeiou]"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bme\w+kan\b",      # Transitive verbs
+            r"(?i)\bber\w+\b",        # Intransitive verbs
+            r"(?i)\b\w+-\w+\b"        # Reduplications
+        ]
+    },
+
+    # TURKIC FAMILY
+    "Turkish": {
+        "word_patterns": r"\b(evet|hayır|tamam|şey|yani)\b",
+        "vocabulary": [
+            "merhaba", "teşekkürler", "lütfen", "affedersiniz",
+            "tabii", "elbette", "peki", "pardon", "güzel"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[aeıioöuü]",
+            "consonant_harmony": r"[ptçkfsşh][bdgcv]",
+            "final_devoicing": r"[bdgcz]\b"
+        },
+        "grammatical_patterns": [
+            r"(?i)\b\w+yor\b",        # Present continuous
+            r"(?i)\b\w+mek\b",        # Infinitive
+            r"(?i)\b\w+lar\b"         # Plural
+        ]
+    },
+
+    # PERSIAN FAMILY
+    "Farsi": {
+        "word_patterns": r"\b(بله|خیر|باشه|چطور|خوب)\b",
+        "vocabulary": [
+            "سلام", "ممنون", "خواهش می‌کنم", "ببخشید",
+            "حتماً", "البته", "چشم", "قربان", "عالی"
+        ],
+        "phonetic_patterns": {
+            "ezafe": r"\s+[ِی]\s",
+            "stress_pattern": r"\w+ید\b",
+            "consonant_clusters": r"\w{2,}"
+        },
+        "grammatical_patterns": [
+            r"(?i)\bمی‌\w+\b",        # Present tense marker
+            r"(?i)\b\w+است\b",        # To be
+            r"(?i)\b\w+‌ها\b"         # Plural marker
+        ]
+    },"Luo": {
+        "word_patterns": r"\b(to|kata|kendo|nango|nade)\b",
+        "vocabulary": [
+            "oyawore", "erokamano", "akwaye", "ber nade",
+            "ee", "ooyo", "ber", "adhi", "oriti"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[aeiou]+",
+            "tone_patterns": r"[áàâ]",
+            "final_consonants": r"[mnŋ]$"
+        },
+        "grammatical_patterns": [
+            r"\w+o\b",       # Present tense
+            r"\w+e\b",       # Past tense
+            r"\w+ni\b"       # Future tense
+        ]
+    },
+
+    # SALISHAN FAMILY
+    "Halkomelem": {
+        "word_patterns": r"\b(ye|tl'|kw'|te|tset)\b",
+        "vocabulary": [
+            "háy̓ kw'a", "kw'ets'i", "í:mex", "éy",
+            "híth", "éwe", "kw'áy", "tl'ó", "stl'í"
+        ],
+        "phonetic_patterns": {
+            "glottalized": r"[ptkcqmwnlyw]'",
+            "lateral_affricates": r"tl'|ƛ",
+            "pharyngeals": r"ʕ|ħ"
+        },
+        "grammatical_patterns": [
+            r"\w+em\b",      # Intransitive
+            r"\w+et\b",      # Transitive
+            r"\w+elh\b"      # Past tense
+        ]
+    },
+
+    # HMONG-MIEN FAMILY
+    "Hmong": {
+        "word_patterns": r"\b(thiab|tab|sis|vim|li|cas)\b",
+        "vocabulary": [
+            "ua tsaug", "tsis ua li cas", "thov txim", "nyob zoo",
+            "yog", "tsis yog", "zoo", "mus", "los"
+        ],
+        "phonetic_patterns": {
+            "tones": r"[bdgjsvz]$",
+            "aspirated": r"th|kh|ph|qh",
+            "nasalized": r"n[aeiou]"
+        },
+        "grammatical_patterns": [
+            r"tau\s+\w+",    # Past tense
+            r"yuav\s+\w+",   # Future tense
+            r"tab\s+tom"     # Progressive
+        ]
+    },
+
+    # TUNGUSIC FAMILY
+    "Evenki": {
+        "word_patterns": r"\b(tada|ekun|onnako|aŋi|ele)\b",
+        "vocabulary": [
+            "eme", "biral", "aya", "sagdami", "mindu",
+            "eʤi", "beje", "oro", "uluki", "dagamar"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[аэиоөуү]+",
+            "consonant_clusters": r"[нңмлр][кптчс]",
+            "final_nasals": r"[нң]$"
+        },
+        "grammatical_patterns": [
+            r"\w+ран\b",     # Present tense
+            r"\w+чан\b",     # Past tense
+            r"\w+ʤaңан\b"    # Future tense
+        ]
+    },
+
+    # CHIBCHAN FAMILY
+    "Kuna": {
+        "word_patterns": r"\b(degi|igi|geb|bia|ibu)\b",
+        "vocabulary": [
+            "nuedi", "dog nuedi", "weligwa", "be nae",
+            "eye", "suli", "nued", "gole", "an be"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ãẽĩõũ]",
+            "stress_pattern": r"\w+́\b",
+            "glottalization": r"'"
+        },
+        "grammatical_patterns": [
+            r"\w+mali\b",    # Present
+            r"\w+sa\b",      # Past
+            r"\w+oe\b"       # Future
+        ]
+    },
+
+    # SIOUAN FAMILY
+    "Lakota": {
+        "word_patterns": r"\b(na|čha|yuŋkȟáŋ|tȟkȟá|héčha)\b",
+        "vocabulary": [
+            "pilamaya", "tokša ake", "čhaŋté wašté", "háu",
+            "hó", "hiyá", "wašté", "lila", "tȟáŋka"
+        ],
+        "phonetic_patterns": {
+            "ejectives": r"[ptkčs]'",
+            "aspirated": r"[ptkčs]h",
+            "nasal_vowels": r"[ąį̨ų]"
+        },
+        "grammatical_patterns": [
+            r"\w+pi\b",      # Plural
+            r"\w+ktA\b",     # Future
+            r"\w+šni\b"      # Negative
+        ]
+    },
+
+    # URALIC - SAMOYED BRANCH
+    "Nenets": {
+        "word_patterns": r"\b(тарем|ңамгэ|ханяна|хэбидя|тедахав)\b",
+        "vocabulary": [
+            "лакамбой", "ңарка вада", "хаерˮ", "сава",
+            "теда", "яңгу", "мерця", "яля", "пи"
+        ],
+        "phonetic_patterns": {
+            "glottal_stop": r"ˮ",
+            "nasals": r"[ңмн]",
+            "vowel_harmony": r"[аоуыэи]+"
+        },
+        "grammatical_patterns": [
+            r"\w+дм'\b",     # First person
+            r"\w+сь\b",      # Past tense
+            r"\w+ңэ\b"       # Dative
+        ]
+    },
+
+    # HOKAN FAMILY
+    "Washo": {
+        "word_patterns": r"\b(ga|di|mi|ʔum|hádi)\b",
+        "vocabulary": [
+            "míʔi", "dewp'áʔi", "dáʔaw", "ʔumʔáyʔi",
+            "háʔa", "géwe", "dímeʔ", "lémeʔ", "ʔímeʔ"
+        ],
+        "phonetic_patterns": {
+            "glottalized": r"[ptkcmnwy]'",
+            "stress": r"[áéíóú]",
+            "glottal_stop": r"ʔ"
+        },
+        "grammatical_patterns": [
+            r"\w+yi\b",      # Present
+            r"\w+aʔ\b",      # Past
+            r"\w+lu\b"       # Future
+        ]
+    },
+
+    # IROQUOIAN FAMILY
+    "Cherokee": {
+        "word_patterns": r"\b(ale|howa|nvdi|gado|igvyi)\b",
+        "vocabulary": [
+            "osiyo", "wado", "donadagohvi", "tohiju",
+            "nvwa", "tla", "osti", "usdi", "uwo"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ãẽĩõũ]",
+            "tone": r"[́̀̌̂]",
+            "aspiration": r"[tkg]h"
+        },
+        "grammatical_patterns": [
+            r"\w+ga\b",      # Present
+            r"\w+oi\b",      # Past
+            r"\w+di\b"       # Future
+        ]
+    },
+
+    # CHUKOTKO-KAMCHATKAN FAMILY
+    "Chukchi": {
+        "word_patterns": r"\b(ынкъам|ытри|миңкри|иңқун|рэқы)\b",
+        "vocabulary": [
+            "ытлён", "вальэ", "қэлғи", "мытык", "тэгэлғын",
+            "ии", "вэнқо", "нымэйыңқин", "гым", "мури"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[аоуэи]+",
+            "consonant_clusters": r"[йңқғвл][тпкмн]",
+            "final_consonants": r"[нңқт]$"
+        },
+        "grammatical_patterns": [
+            r"\w+ркын\b",    # Present
+            r"\w+гъэ\b",     # Past
+            r"\w+ңы\b"       # Future
+        ]
+    },"Cree": {
+        "word_patterns": r"\b(êkwa|mâka|ahpo|tânisi|tânêhki)\b",
+        "vocabulary": [
+            "tânisi", "ay-hay", "kinanâskomitin", "wâciyê",
+            "êha", "namôya", "miywâsin", "maskihkiy", "wâpan"
+        ],
+        "phonetic_patterns": {
+            "long_vowels": r"[âêîôû]",
+            "consonant_clusters": r"[hkmnst][kwty]",
+            "final_consonants": r"[kmnst]$"
+        },
+        "grammatical_patterns": [
+            r"\w+wak\b",     # Animate plural
+            r"\w+win\b",     # Nominalization
+            r"\w+pan\b"      # Past tense
+        ]
+    },
+
+    # ATHABASKAN FAMILY
+    "Navajo": {
+        "word_patterns": r"\b(dóó|ndi|éí|háálá|háago)\b",
+        "vocabulary": [
+            "yáʼátʼééh", "ahéheeʼ", "nizhóní", "hózǫ́",
+            "aoo'", "dooda", "ayóo", "nihaa", "yá"
+        ],
+        "phonetic_patterns": {
+            "tone": r"[́̀]",
+            "nasalization": r"[ą̨į̨ǫ̨ų̨]",
+            "glottalization": r"[dltszkgy]'"
+        },
+        "grammatical_patterns": [
+            r"\w+ígíí\b",    # Nominalization
+            r"\w+go\b",      # Subordinate
+            r"\w+į́į́\b"       # Past perfective
+        ]
+    },
+
+    # ARAWAKAN FAMILY
+    "Garifuna": {
+        "word_patterns": r"\b(luma|dan|lun|ida|ligiya)\b",
+        "vocabulary": [
+            "buiti", "seremein", "mabuiga", "uwagu",
+            "áu", "máma", "buidu", "fulasu", "haruga"
+        ],
+        "phonetic_patterns": {
+            "stress": r"[áéíóú]",
+            "nasalization": r"[ãẽĩõũ]",
+            "length": r"([aeiou])\1"
+        },
+        "grammatical_patterns": [
+            r"\w+tina\b",    # Future
+            r"\w+bai\b",     # Past
+            r"\w+tiña\b"     # Conditional
+        ]
+    },
+
+    # MAYAN FAMILY
+    "K'iche'": {
+        "word_patterns": r"\b(are|rech|chi|rumal|jasche)\b",
+        "vocabulary": [
+            "maltyox", "utz", "sachaj", "xaq", 
+            "je'", "man", "nim", "saq", "q'eq"
+        ],
+        "phonetic_patterns": {
+            "glottalized": r"[ptkcqb]'",
+            "ejectives": r"[PTKCQ]'",
+            "vowel_length": r"[aeiou]:"
+        },
+        "grammatical_patterns": [
+            r"\w+ik\b",      # Intransitive
+            r"\w+aj\b",      # Agent nouns
+            r"\w+em\b"       # Participle
+        ]
+    },
+
+    # NIGER-CONGO - KRU BRANCH
+    "Bété": {
+        "word_patterns": r"\b(ni|ka|le|ko|sa)\b",
+        "vocabulary": [
+            "kɔ́ɔ́", "gbɛ̀lɛ̀", "yálá", "zìzì",
+            "ɛ̀ɛ̀", "ɔ̀ɔ̀", "kpá", "gbɔ́", "yɔ́"
+        ],
+        "phonetic_patterns": {
+            "tones": r"[́̀]",
+            "labiovelars": r"[kg]b|[kg]p",
+            "vowel_harmony": r"[ɛɔ]|[ie]"
+        },
+        "grammatical_patterns": [
+            r"\w+lɛ\b",      # Perfect
+            r"\w+ka\b",      # Future
+            r"\w+ni\b"       # Progressive
+        ]
+    },
+
+    # URALIC - FINNIC BRANCH
+    "Veps": {
+        "word_patterns": r"\b(i|ka|vai|miše|kut)\b",
+        "vocabulary": [
+            "tervhen", "spasib", "prostkat", "hüvä",
+            "ka", "ei", "čoma", "laske", "püštta"
+        ],
+        "phonetic_patterns": {
+            "palatalization": r"[tdnl]'",
+            "vowel_harmony": r"[aou]|[äöy]",
+            "gemination": r"(\w)\1"
+        },
+        "grammatical_patterns": [
+            r"\w+b\b",       # Present
+            r"\w+i\b",       # Past
+            r"\w+škande\b"   # Conditional
+        ]
+    },
+
+    # AUSTRONESIAN - OCEANIC BRANCH
+    "Fijian": {
+        "word_patterns": r"\b(ka|se|ni|mai|kei)\b",
+        "vocabulary": [
+            "bula", "vinaka", "kerekere", "moce",
+            "io", "sega", "totoka", "levu", "lailai"
+        ],
+        "phonetic_patterns": {
+            "prenasalized": r"[mbndŋg]",
+            "vowel_length": r"[aeiou]{2}",
+            "stress": r"\w+a\b"
+        },
+        "grammatical_patterns": [
+            r"e\s+\w+",      # Present
+            r"sa\s+\w+",     # Past
+            r"na\s+\w+"      # Future
+        ]
+    },
+
+    # ISOLATE
+    "Burushaski": {
+        "word_patterns": r"\b(ke|ki|ko|ta|be)\b",
+        "vocabulary": [
+            "salaam", "bayé", "šukria", "halkiš",
+            "haa", "bésa", "mubaarak", "biṣár", "théego"
+        ],
+        "phonetic_patterns": {
+            "retroflex": r"[ṭḍṣ]",
+            "aspirated": r"[ptkc]h",
+            "vowel_length": r"[aeiou]:"
+        },
+        "grammatical_patterns": [
+            r"\w+um\b",      # Present
+            r"\w+an\b",      # Past
+            r"\w+imi\b"      # Future
+        ]
+    },
+
+    # SINO-TIBETAN - LOLO-BURMESE BRANCH
+    "Lahu": {
+        "word_patterns": r"\b(lâ|mà|qo|leh|ve)\b",
+        "vocabulary": [
+            "a-bô-ma", "ha-leh", "dà-là", "g'â",
+            "hî", "mâ", "yâ", "chɨ", "nɔ̂"
+        ],
+        "phonetic_patterns": {
+            "tones": r"[̂̀́̌]",
+            "aspirated": r"[ptk]h",
+            "nasalization": r"[ãẽĩõũ]"
+        },
+        "grammatical_patterns": [
+            r"\w+ve\b",      # Present
+            r"\w+tà\b",      # Past
+            r"\w+leh\b"      # Perfect
+        ]
+    },
+
+    # TRANS-NEW GUINEA FAMILY
+    "Enga": {
+        "word_patterns": r"\b(dee|doko|ongo|aipa|dupa)\b",
+        "vocabulary": [
+            "waa", "yaka", "emba", "andake",
+            "kini", "daa", "epe", "koo", "paka"
+        ],
+        "phonetic_patterns": {
+            "vowel_length": r"[aeiou]{2}",
+            "stress_pattern": r"\w+pe\b",
+            "tone": r"[́̀]"
+        },
+        "grammatical_patterns": [
+            r"\w+nge\b",     # Present
+            r"\w+pu\b",      # Past
+            r"\w+ta\b"       # Future
+        ]
+    },
+     "Yakut": {
+        "word_patterns": r"\b(уонна|эбэтэр|да|дуо|хайдах)\b",
+        "vocabulary": [
+            "үтүө күнүнэн", "баһыыба", "бырастыы", "көрсүөххэ",
+            "ээ", "суох", "үчүгэй", "сөп", "үөрүү"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[аоуыэөүи]+",
+            "long_vowels": r"[аааоооуууыыыэээөөөүүүиии]",
+            "diphthongs": r"(ыа|иэ|уо|үө)"
+        },
+        "grammatical_patterns": [
+            r"\w+ар\b",      # Present
+            r"\w+та\b",      # Past
+            r"\w+ыа\b"       # Future
+        ]
+    },
+
+    # AUSTRO-ASIATIC - MUNDA BRANCH
+    "Santali": {
+        "word_patterns": r"\b(ar|do|ente|cet|okare)\b",
+        "vocabulary": [
+            "johar", "marsal", "dạ", "hola",
+            "hẽ", "bã", "bese", "hijuḱ", "seteḱ"
+        ],
+        "phonetic_patterns": {
+            "glottalization": r"[ḱ]",
+            "checked_vowels": r"[ạẹịọụ]",
+            "nasalization": r"[ãẽĩõũ]"
+        },
+        "grammatical_patterns": [
+            r"\w+keya\b",    # Present
+            r"\w+lena\b",    # Past
+            r"\w+aka\b"      # Perfect
+        ]
+    },
+
+    # NIGER-CONGO - ADAMAWA BRANCH
+    "Mumuye": {
+        "word_patterns": r"\b(ne|ka|do|ba|mi)\b",
+        "vocabulary": [
+            "soso", "yaawe", "kpahi", "doro",
+            "ee", "ayi", "mai", "kpan", "ren"
+        ],
+        "phonetic_patterns": {
+            "tone_patterns": r"[́̀̂]",
+            "labial_velars": r"kp|gb",
+            "nasalization": r"[ãẽĩõũ]"
+        },
+        "grammatical_patterns": [
+            r"\w+wa\b",      # Present
+            r"\w+ye\b",      # Past
+            r"\w+ro\b"       # Future
+        ]
+    },
+
+    # AFROASIATIC - CUSHITIC BRANCH
+    "Somali": {
+        "word_patterns": r"\b(iyo|lakin|ama|maxaa|sidee)\b",
+        "vocabulary": [
+            "nabadgelyo", "mahadsanid", "cafis", "subax wanaagsan",
+            "haa", "maya", "wanaagsan", "hagaag", "aad"
+        ],
+        "phonetic_patterns": {
+            "pharyngeal": r"[ħʕ]",
+            "tone": r"[́̀]",
+            "gemination": r"(\w)\1"
+        },
+        "grammatical_patterns": [
+            r"\w+ayaa\b",    # Focus marker
+            r"\w+tay\b",     # Past feminine
+            r"\w+kay\b"      # Past masculine
+        ]
+    },
+
+    # JAPONIC - RYUKYUAN BRANCH
+    "Okinawan": {
+        "word_patterns": r"\b(yaa|shi|ya|ni|ga)\b",
+        "vocabulary": [
+            "haisai", "nifeedeebiru", "mensooree", "uugami",
+            "uu", "iinee", "churaasan", "yutasarun", "ganjuu"
+        ],
+        "phonetic_patterns": {
+            "glottalization": r"[ʔ]",
+            "long_vowels": r"[aeiou]{2}",
+            "pitch_accent": r"\w+n\b"
+        },
+        "grammatical_patterns": [
+            r"\w+un\b",      # Present
+            r"\w+tan\b",     # Past
+            r"\w+yun\b"      # Progressive
+        ]
+    },
+
+    # NIGER-CONGO - GUR BRANCH
+    "Dagbani": {
+        "word_patterns": r"\b(ni|ka|bee|din|wula)\b",
+        "vocabulary": [
+            "deseba", "mba", "naawuni", "antire",
+            "ee", "ayi", "viela", "kaman", "pahi"
+        ],
+        "phonetic_patterns": {
+            "tone": r"[́̀̂]",
+            "nasalization": r"[ãẽĩõũ]",
+            "vowel_harmony": r"[aeiou]+"
+        },
+        "grammatical_patterns": [
+            r"\w+ra\b",      # Past
+            r"\w+ya\b",      # Future
+            r"\w+mi\b"       # Habitual
+        ]
+    },
+
+    # AUSTRONESIAN - FORMOSAN BRANCH
+    "Amis": {
+        "word_patterns": r"\b(ato|ano|han|ko|to)\b",
+        "vocabulary": [
+            "nga'ay ho", "salamat", "pa'or", "kapah",
+            "hay", "caay", "malakaka", "henay", "mamang"
+        ],
+        "phonetic_patterns": {
+            "glottal_stop": r"'",
+            "stress_pattern": r"\w+ay\b",
+            "consonant_clusters": r"[mnŋ][ptk]"
+        },
+        "grammatical_patterns": [
+            r"\w+en\b",      # Focus object
+            r"\w+an\b",      # Focus location
+            r"\w+ay\b"       # Focus actor
+        ]
+    },
+
+    # SINO-TIBETAN - BODISH BRANCH
+    "Dzongkha": {
+        "word_patterns": r"\b(དང|ཡང|མས|འདི|ག)\b",
+        "vocabulary": [
+            "གཏང་རག་ཞུ", "བཀྲ་ཤིས་བདེ་ལེགས", "དགོངས་དག", "ག་དེ་སྨོ",
+            "ལགས", "མེན", "ལེགས་ཤོམ", "འོང", "བཀའ་དྲིན་ཆེ"
+        ],
+        "phonetic_patterns": {
+            "tone": r"[̄́̀]",
+            "aspirated": r"[པཕཁཆཐ]",
+            "nasalization": r"[ངཉཎནམ]"
+        },
+        "grammatical_patterns": [
+            r"\w+གི\b",      # Genitive
+            r"\w+པས\b",     # Past
+            r"\w+ནི\b"       # Future
+        ]
+    },
+
+    # NILO-SAHARAN - NILOTIC BRANCH
+    "Maasai": {
+        "word_patterns": r"\b(ore|naa|amu|kake|ajo)\b",
+        "vocabulary": [
+            "supa", "ashe", "kotok", "endaa",
+            "ee", "mme", "sidai", "keju", "tampa"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[aeiou]+",
+            "tone": r"[́̀]",
+            "consonant_clusters": r"[mnŋ][ptk]"
+        },
+        "grammatical_patterns": [
+            r"\w+ita\b",     # Present
+            r"\w+ta\b",      # Past
+            r"\w+aki\b"      # Future
+        ]
+    },
+
+    # TUPIAN - TUPI-GUARANI BRANCH
+    "Nheengatu": {
+        "word_patterns": r"\b(aé|yawé|mairamé|maã|awá)\b",
+        "vocabulary": [
+            "puranga", "marandua", "yané", "kuíri",
+            "eẽ", "umbaá", "katú", "suí", "irumu"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ãẽĩõũ]",
+            "stress": r"[áéíóú]",
+            "glottalization": r"'"
+        },
+        "grammatical_patterns": [
+            r"\w+ana\b",     # Perfect
+            r"\w+wara\b",    # Agent
+            r"\w+rama\b"     # Future
+        ]
+    },
+
+    "ǂHoan": {
+        "word_patterns": r"\b(kí|há|ǁa|ǂa|ǃa)\b",
+        "vocabulary": [
+            "ǂʼāã", "ǁxóõ", "ǃáa", "ǂqχʼã",
+            "ǁàa", "ǂìi", "ǃóo", "ǁàe", "kyá"
+        ],
+        "phonetic_patterns": {
+            "clicks": r"[ǂǁǃ][ʼʰ̃ʱ]?",
+            "tone": r"[́̀̂̄̌]",
+            "nasalization": r"[ãẽĩõũ]"
+        },
+        "grammatical_patterns": [
+            r"\w+ki\b",      # Present
+            r"\w+ha\b",      # Past
+            r"\w+ku\b"       # Future
+        ]
+    },
+
+    # AUSTRALIAN - PAMA-NYUNGAN FAMILY
+    "Warlpiri": {
+        "word_patterns": r"\b(manu|kala|ngula|nyarrpa|ngaju)\b",
+        "vocabulary": [
+            "yuwayi", "lawa", "ngurrju", "wangkaya",
+            "jalangu", "yarda", "kari", "yapa", "wati"
+        ],
+        "phonetic_patterns": {
+            "retroflex": r"[ṭṇḷṛ]",
+            "palatal": r"[ñjy]",
+            "stress": r"\w+rla\b"
+        },
+        "grammatical_patterns": [
+            r"\w+rni\b",     # Present
+            r"\w+ja\b",      # Past
+            r"\w+ku\b"       # Purposive
+        ]
+    },
+
+    # GUNWINYGUAN FAMILY
+    "Bininj Kun-Wok": {
+        "word_patterns": r"\b(dja|wanjh|yiman|baleh|ngudda)\b",
+        "vocabulary": [
+            "bonj", "kamak", "yoh", "makka",
+            "murrngrayek", "manme", "kunred", "balanda", "djang"
+        ],
+        "phonetic_patterns": {
+            "glottal_stop": r"[ʔ]",
+            "long_stops": r"[kk|dd|bb]",
+            "nasals": r"[ŋñn]"
+        },
+        "grammatical_patterns": [
+            r"\w+men\b",     # Present
+            r"\w+ni\b",      # Past
+            r"\w+yan\b"      # Future
+        ]
+    },
+
+    # SEPIK FAMILY
+    "Iatmul": {
+        "word_patterns": r"\b(wan|ak|mbak|nyan|kwa)\b",
+        "vocabulary": [
+            "kap", "mbɨt", "nyaŋ", "wun",
+            "kɨnɨ", "apm", "yiga", "wupma", "ndɨk"
+        ],
+        "phonetic_patterns": {
+            "prenasalized": r"[mb|nd|ŋg]",
+            "vowel_length": r"[aeiɨu]{2}",
+            "word_tone": r"[́̀]"
+        },
+        "grammatical_patterns": [
+            r"\w+gat\b",     # Present
+            r"\w+wun\b",     # Past
+            r"\w+kiyak\b"    # Future
+        ]
+    },
+
+    # TORRICELLI FAMILY
+    "Arapesh": {
+        "word_patterns": r"\b(aria|bai|anan|ko|ini)\b",
+        "vocabulary": [
+            "yopwe", "uwahik", "wosik", "iwagigin",
+            "aun", "yowi", "aria", "nabai", "shamu"
+        ],
+        "phonetic_patterns": {
+            "tone_patterns": r"[́̀̂]",
+            "labialization": r"[kgŋ]w",
+            "palatalization": r"[tdns]y"
+        },
+        "grammatical_patterns": [
+            r"\w+ak\b",      # Present
+            r"\w+as\b",      # Past
+            r"\w+uk\b"       # Future
+        ]
+    },
+
+    # HUON GULF FAMILY
+    "Yabem": {
+        "word_patterns": r"\b(ma|gebe|to|me|oc)\b",
+        "vocabulary": [
+            "aêŋ", "gêdêŋ", "malô", "êsêac",
+            "biŋ", "masi", "ŋajam", "têtac", "lau"
+        ],
+        "phonetic_patterns": {
+            "tone": r"[̂́̀]",
+            "nasalization": r"[ŋ]",
+            "vowel_marks": r"[êôâ]"
+        },
+        "grammatical_patterns": [
+            r"\w+ac\b",      # Present
+            r"\w+gac\b",     # Past
+            r"\w+na\b"       # Future
+        ]
+    },
+
+    # EAST BOUGAINVILLE FAMILY
+    "Nasioi": {
+        "word_patterns": r"\b(tewa|ninka|ning|deto|baka)\b",
+        "vocabulary": [
+            "dotu", "tamang", "sipung", "daamaang",
+            "ehe", "aung", "tampara", "naning", "boto"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ŋ]",
+            "vowel_length": r"[aeiou]{2}",
+            "stress": r"\w+ang\b"
+        },
+        "grammatical_patterns": [
+            r"\w+ing\b",     # Present
+            r"\w+ung\b",     # Past
+            r"\w+aing\b"     # Future
+        ]
+    },
+
+    # CENTRAL SOLOMONS FAMILY
+    "Savosavo": {
+        "word_patterns": r"\b(bo|to|ko|lo|ze)\b",
+        "vocabulary": [
+            "ate", "koba", "leme", "tona",
+            "ko", "mane", "pai", "zogi", "tini"
+        ],
+        "phonetic_patterns": {
+            "stress_pattern": r"\w+a\b",
+            "consonant_clusters": r"[mng][bdt]",
+            "final_vowels": r"[aeiou]$"
+        },
+        "grammatical_patterns": [
+            r"\w+tu\b",      # Present
+            r"\w+gh\b",      # Past
+            r"\w+li\b"       # Future
+        ]
+    },
+
+    # LOWER SEPIK-RAMU FAMILY
+    "Yimas": {
+        "word_patterns": r"\b(na|ma|kay|api|wan)\b",
+        "vocabulary": [
+            "apwi", "nampi", "krayŋ", "mpaŋ",
+            "arm", "awa", "ŋayk", "mpuk", "tpuk"
+        ],
+        "phonetic_patterns": {
+            "prenasalized": r"[mp|nt|ŋk]",
+            "consonant_clusters": r"[ptk][wy]",
+            "stress": r"[́]"
+        },
+        "grammatical_patterns": [
+            r"\w+nan\b",     # Present
+            r"\w+wat\b",     # Past
+            r"\w+kayan\b"    # Future
+        ]
+    },
+
+    # BORDER FAMILY
+    "Imonda": {
+        "word_patterns": r"\b(po|fe|uol|sue|ago)\b",
+        "vocabulary": [
+            "kafli", "aio", "maga", "tobto",
+            "kuo", "ale", "sabla", "edu", "peha"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ãẽĩõũ]",
+            "glottalization": r"[ʔ]",
+            "vowel_length": r"[aeiou]{2}"
+        },
+        "grammatical_patterns": [
+            r"\w+fla\b",     # Present
+            r"\w+na\b",      # Past
+            r"\w+fe\b"       # Future
+        ]
+    },
+    "Kayardild": {
+        "word_patterns": r"\b(ngada|bilda|kada|bartha|mirra)\b",
+        "vocabulary": [
+            "kiija", "ngaaka", "warirra", "bukawa",
+            "yuuda", "birdin", "kunawuna", "ngada", "thaldi"
+        ],
+        "phonetic_patterns": {
+            "laminal_stops": r"[ṯṉ]",
+            "retroflexes": r"[ṭṇḷṛ]",
+            "long_vowels": r"[aeiou]{2}"
+        },
+        "grammatical_patterns": [
+            r"\w+nangku\b",  # Present
+            r"\w+jarri\b",   # Past
+            r"\w+kuru\b"     # Future
+        ]
+    },
+
+    # GREAT ANDAMANESE FAMILY
+    "Önge": {
+        "word_patterns": r"\b(ene|ara|ete|idi|uba)\b",
+        "vocabulary": [
+            "ekebe", "čirike", "akaṛa", "uǰuwe",
+            "ele", "tawo", "mikwe", "čapwe", "bēu"
+        ],
+        "phonetic_patterns": {
+            "retroflex": r"[ṭḍṇṛ]",
+            "vowel_nasalization": r"[ãẽĩõũ]",
+            "glottal": r"[ʔ]"
+        },
+        "grammatical_patterns": [
+            r"\w+be\b",      # Present
+            r"\w+ta\b",      # Past
+            r"\w+le\b"       # Future
+        ]
+    },
+
+    # YUKAGHIR FAMILY
+    "Tundra Yukaghir": {
+        "word_patterns": r"\b(taŋ|ile|tet|elen|monut)\b",
+        "vocabulary": [
+            "köde", "ile", "čumu", "sukun",
+            "eː", "eːle", "metul", "amaː", "jaːn"
+        ],
+        "phonetic_patterns": {
+            "vowel_harmony": r"[aouəi]+",
+            "long_vowels": r"[aeiou]ː",
+            "palatalization": r"[tdnl]'"
+        },
+        "grammatical_patterns": [
+            r"\w+ŋa\b",      # Present
+            r"\w+l'el\b",    # Past
+            r"\w+te\b"       # Future
+        ]
+    },
+
+    # NORTH CAUCASIAN FAMILY
+    "Tsez": {
+        "word_patterns": r"\b(sis|kid|zow|dow|ħal)\b",
+        "vocabulary": [
+            "bečed", "žek'u", "ħalt'i", "nesta",
+            "hudzi", "ānu", "magalu", "elu", "šebi"
+        ],
+        "phonetic_patterns": {
+            "ejectives": r"[ptkčc]'",
+            "pharyngeals": r"[ħʕ]",
+            "laterals": r"[ł]"
+        },
+        "grammatical_patterns": [
+            r"\w+xo\b",      # Present
+            r"\w+si\b",      # Past
+            r"\w+no\b"       # Future
+        ]
+    },
+
+    # YANOMAMIC FAMILY
+    "Yanomami": {
+        "word_patterns": r"\b(ipa|hei|yai|ham|kuo)\b",
+        "vocabulary": [
+            "hwei", "hapao", "awei", "matihi",
+            "ma", "aipë", "totihitawë", "ohote", "pei"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ãẽĩõũ]",
+            "aspiration": r"[ptk]h",
+            "tone": r"[́̀]"
+        },
+        "grammatical_patterns": [
+            r"\w+mae\b",     # Present
+            r"\w+nomai\b",   # Past
+            r"\w+pë\b"       # Future
+        ]
+    },
+
+    # CHAPACURAN FAMILY
+    "Wari'": {
+        "word_patterns": r"\b(na|cao|tam|xi|pan)\b",
+        "vocabulary": [
+            "hwam", "carawa", "tamana", "wijima",
+            "te", "pa'", "xucucun", "nein", "wao"
+        ],
+        "phonetic_patterns": {
+            "glottal_stop": r"'",
+            "labials": r"[wmb]",
+            "nasalization": r"[ãẽĩõũ]"
+        },
+        "grammatical_patterns": [
+            r"\w+ain\b",     # Present
+            r"\w+ram\b",     # Past
+            r"\w+con\b"      # Future
+        ]
+    },
+
+    # TOTONACAN FAMILY
+    "Totonac": {
+        "word_patterns": r"\b(chu|li|wa|na|pi)\b",
+        "vocabulary": [
+            "paxkat", "kilin", "taskujut", "tzey",
+            "je'e", "ni'", "tlan", "chix", "laka"
+        ],
+        "phonetic_patterns": {
+            "glottalization": r"'",
+            "laterals": r"[lɬ]",
+            "affricates": r"[ts|tʃ]"
+        },
+        "grammatical_patterns": [
+            r"\w+y\b",       # Present
+            r"\w+lh\b",      # Past
+            r"\w+na'\b"      # Future
+        ]
+    },
+
+    # WAKASHAN FAMILY
+    "Kwak'wala": {
+        "word_patterns": r"\b(gada|lax|ʼma|dłu|gax)\b",
+        "vocabulary": [
+            "giáxstin", "ʼyúła", "gílakas'la", "héłkas",
+            "ʼma", "k'i", "ʼnákwała", "gukw", "tlás"
+        ],
+        "phonetic_patterns": {
+            "glottalization": r"[ptkcmnwy]'",
+            "laterals": r"[ł|λ|l']",
+            "labials": r"[kʷgʷxʷ]"
+        },
+        "grammatical_patterns": [
+            r"\w+ida\b",     # Present
+            r"\w+xdi\b",     # Past
+            r"\w+ł\b"        # Future
+        ]
+    },
+
+    # ARAUCANIAN FAMILY
+    "Mapudungun": {
+        "word_patterns": r"\b(fey|nga|chi|kam|welu)\b",
+        "vocabulary": [
+            "mari mari", "pewkayal", "küme", "chaltu",
+            "may", "no", "kümelay", "müna", "feley"
+        ],
+        "phonetic_patterns": {
+            "interdentals": r"[ð]",
+            "retroflexes": r"[ʈʂ]",
+            "high_vowels": r"[ɨ]"
+        },
+        "grammatical_patterns": [
+            r"\w+n\b",       # Present
+            r"\w+fu\b",      # Past
+            r"\w+a\b"        # Future
+        ]
+    },
+
+    # BARBACOAN FAMILY
+    "Awa Pit": {
+        "word_patterns": r"\b(shi|aza|mɨ|na|pai)\b",
+        "vocabulary": [
+            "watsal", "aishtaish", "kwazhi", "kashna",
+            "au", "chi", "wat", "payan", "kima"
+        ],
+        "phonetic_patterns": {
+            "high_central_vowel": r"[ɨ]",
+            "palatalization": r"[ʃʒ]",
+            "nasalization": r"[ãẽĩõũ]"
+        },
+        "grammatical_patterns": [
+            r"\w+tui\b",     # Present
+            r"\w+zi\b",      # Past
+            r"\w+na\b"       # Future
+        ]
+    },
+
+    "Mangarrayi": {
+        "word_patterns": r"\b(nga|ja|na|wu|ba)\b",
+        "vocabulary": [
+            "janggin", "wurr", "ngaya", "malam",
+            "yo", "minj", "garlag", "buwarraq", "ganji"
+        ],
+        "phonetic_patterns": {
+            "retroflex": r"[ṭṇḷṛ]",
+            "glottal_stop": r"[q]",
+            "long_vowels": r"[aeiou]{2}"
+        },
+        "grammatical_patterns": [
+            r"\w+ma\b",      # Present
+            r"\w+ni\b",      # Past
+            r"\w+wa\b"       # Future
+        ]
+    },
+
+    # KADUGLI-KRONGO FAMILY
+    "Krongo": {
+        "word_patterns": r"\b(àkà|ìsì|nɨ́|kà|mà)\b",
+        "vocabulary": [
+            "káasà", "àʔàŋ", "móosò", "ńtílé",
+            "ɨ́ɨ́", "ùʔùŋ", "kàràkkà", "tɨ́níŋ", "màafá"
+        ],
+        "phonetic_patterns": {
+            "tone": r"[́̀]",
+            "vowel_length": r"[aɨiu]{2}",
+            "glottal_stop": r"[ʔ]"
+        },
+        "grammatical_patterns": [
+            r"\w+ŋ\b",       # Present
+            r"\w+t\b",       # Past
+            r"\w+má\b"       # Future
+        ]
+    },
+
+    # WEST PAPUAN FAMILY
+    "Ternate": {
+        "word_patterns": r"\b(ma|si|ena|sone|toma)\b",
+        "vocabulary": [
+            "ngone", "tarima", "suba", "ngekom",
+            "iya", "hièra", "laha", "futu", "sio"
+        ],
+        "phonetic_patterns": {
+            "prenasalization": r"[mb|nd|ŋg]",
+            "stress": r"[́]",
+            "diphthongs": r"[ao]e"
+        },
+        "grammatical_patterns": [
+            r"\w+ka\b",      # Present
+            r"\w+si\b",      # Past
+            r"\w+osi\b"      # Future
+        ]
+    },
+
+    # EAST BIRD'S HEAD FAMILY
+    "Meyah": {
+        "word_patterns": r"\b(rot|gij|nou|sis|mar)\b",
+        "vocabulary": [
+            "ofa", "iwa", "erebesa", "aksa",
+            "tenten", "guru", "eskeira", "make", "ofou"
+        ],
+        "phonetic_patterns": {
+            "vowel_sequences": r"[aeiou]{2}",
+            "final_consonants": r"[fkmrst]$",
+            "stress_pattern": r"\w+a\b"
+        },
+        "grammatical_patterns": [
+            r"\w+ef\b",      # Present
+            r"\w+ij\b",      # Past
+            r"\w+ma\b"       # Future
+        ]
+    },
+
+    # CADDOAN FAMILY
+    "Pawnee": {
+        "word_patterns": r"\b(ra|ti|ku|ta|wi)\b",
+        "vocabulary": [
+            "čaˀuh", "čiki", "kíša", "náwa",
+            "aˀa", "kaˀu", "tíkuks", "šakúru", "ráriks"
+        ],
+        "phonetic_patterns": {
+            "glottal_stop": r"[ˀ]",
+            "tone": r"[́̀]",
+            "aspirated": r"[čkpt]h"
+        },
+        "grammatical_patterns": [
+            r"\w+ku\b",      # Present
+            r"\w+ruk\b",     # Past
+            r"\w+hi\b"       # Future
+        ]
+    },
+
+    # CHIMAKUAN FAMILY
+    "Quileute": {
+        "word_patterns": r"\b(ti|ła|kʷi|xa|či)\b",
+        "vocabulary": [
+            "hoʔopał", "tala", "kʷeʔši", "yixʷal",
+            "ho", "hiʔi", "t'ičit", "k'ʷay", "xʷaʔ"
+        ],
+        "phonetic_patterns": {
+            "labialization": r"[kxƛ]ʷ",
+            "glottalization": r"[ptkcƛ]'",
+            "ejectives": r"[ptkcčƛ]'"
+        },
+        "grammatical_patterns": [
+            r"\w+li\b",      # Present
+            r"\w+ƛi\b",      # Past
+            r"\w+či\b"       # Future
+        ]
+    },
+
+    # NUCLEAR TORRICELLI FAMILY
+    "Mountain Arapesh": {
+        "word_patterns": r"\b(aria|bai|eik|nya|ara)\b",
+        "vocabulary": [
+            "yopwei", "douk", "wosik", "nyutab",
+            "awas", "uwahis", "yopwi", "nyubul", "aria"
+        ],
+        "phonetic_patterns": {
+            "palatalization": r"ny",
+            "labialization": r"[kg]w",
+            "vowel_length": r"[aeiou]{2}"
+        },
+        "grammatical_patterns": [
+            r"\w+ep\b",      # Present
+            r"\w+as\b",      # Past
+            r"\w+uk\b"       # Future
+        ]
+    },
+
+    # ZAPAROAN FAMILY
+    "Arabela": {
+        "word_patterns": r"\b(na|qui|jua|cua|naa)\b",
+        "vocabulary": [
+            "panuu", "maaji", "ritia", "quiari",
+            "jaa", "maja", "maninia", "seque", "cuno"
+        ],
+        "phonetic_patterns": {
+            "vowel_length": r"[aeiou]{2}",
+            "stress": r"[́]",
+            "palatalization": r"[td]y"
+        },
+        "grammatical_patterns": [
+            r"\w+ya\b",      # Present
+            r"\w+quiaa\b",   # Past
+            r"\w+nu\b"       # Future
+        ]
+    },
+
+    # SÁLIBAN FAMILY
+    "Piaroa": {
+        "word_patterns": r"\b(tʰi|də|ku|re|me)\b",
+        "vocabulary": [
+            "isæ̃", "čuwa", "tʰiyæ", "məræ",
+            "æ̃hæ̃", "ãʔã", "mene", "wæʔæ", "kʷakʷa"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ãẽĩõũæ̃]",
+            "aspiration": r"[ptk]ʰ",
+            "labialization": r"[pk]ʷ"
+        },
+        "grammatical_patterns": [
+            r"\w+sa\b",      # Present
+            r"\w+di\b",      # Past
+            r"\w+tʰæ\b"      # Future
+        ]
+    },
+
+    # GUAICURUAN FAMILY
+    "Mocoví": {
+        "word_patterns": r"\b(qa|na|so|ka|da)\b",
+        "vocabulary": [
+            "ʔaam", "nawot", "qaiʔen", "lapiɢoʔ",
+            "ʔee", "saʔa", "noʔen", "ʔven", "qom"
+        ],
+        "phonetic_patterns": {
+            "glottal_stop": r"[ʔ]",
+            "uvular": r"[q]",
+            "voiced_velar": r"[ɢ]"
+        },
+        "grammatical_patterns": [
+            r"\w+tak\b",     # Present
+            r"\w+ñi\b",      # Past
+            r"\w+am\b"       # Future
+        ]
+    },
+    "Nasioi": {
+        "word_patterns": r"\b(teni|nka|ning|baka|tewa)\b",
+        "vocabulary": [
+            "dotu", "tamang", "sipung", "daamaang",
+            "ee", "aung", "tampara", "naninge", "baka"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ŋ]",
+            "vowel_length": r"[aeiou]{2}",
+            "stress": r"\w+ang\b"
+        },
+        "grammatical_patterns": [
+            r"\w+ing\b",     # Present
+            r"\w+ung\b",     # Past
+            r"\w+aing\b"     # Future
+        ]
+    },
+
+    # TIWI ISOLATE
+    "Tiwi": {
+        "word_patterns": r"\b(nga|wa|ki|ta|ji)\b",
+        "vocabulary": [
+            "murrana", "wuta", "kirijini", "japarra",
+            "yu", "karluwu", "wurumi", "yoi", "tuwawu"
+        ],
+        "phonetic_patterns": {
+            "retroflexes": r"[ṭṇḷṛ]",
+            "glides": r"[wy]",
+            "stress_pattern": r"\w+rra\b"
+        },
+        "grammatical_patterns": [
+            r"\w+mi\b",      # Present
+            r"\w+ni\b",      # Past
+            r"\w+rri\b"      # Future
+        ]
+    },
+
+    # EASTERN DALY FAMILY
+    "Matngele": {
+        "word_patterns": r"\b(nya|wu|ma|nga|ya)\b",
+        "vocabulary": [
+            "ngayu", "wurang", "manya", "yawa",
+            "yo", "nomo", "mayawa", "tyung", "wula"
+        ],
+        "phonetic_patterns": {
+            "nasals": r"[ŋɲ]",
+            "palatals": r"ty|ny",
+            "long_vowels": r"[aeiou]{2}"
+        },
+        "grammatical_patterns": [
+            r"\w+ma\b",      # Present
+            r"\w+wa\b",      # Past
+            r"\w+yu\b"       # Future
+        ]
+    },
+
+    # GIIMBIYU FAMILY
+    "Urningangk": {
+        "word_patterns": r"\b(nga|ma|na|ga|wa)\b",
+        "vocabulary": [
+            "ngappi", "mara", "ngaralk", "ganji",
+            "yo", "wagiman", "mayali", "guya", "warri"
+        ],
+        "phonetic_patterns": {
+            "retroflex": r"[ṛḷṇṭ]",
+            "nasals": r"[ŋɲ]",
+            "glides": r"[wy]"
+        },
+        "grammatical_patterns": [
+            r"\w+ni\b",      # Present
+            r"\w+rr\b",      # Past
+            r"\w+yi\b"       # Future
+        ]
+    },
+
+    # LIMILNGAN-WULNA FAMILY
+    "Limilngan": {
+        "word_patterns": r"\b(u|wi|ma|da|gi)\b",
+        "vocabulary": [
+            "angul", "mipil", "daway", "girrk",
+            "u-yi", "ma-yi", "wunggu", "dik-ma", "u-ma"
+        ],
+        "phonetic_patterns": {
+            "retroflex": r"[ṛḷṇṭ]",
+            "nasals": r"[ŋɲ]",
+            "stops": r"[bdgʔ]"
+        },
+        "grammatical_patterns": [
+            r"\w+ma\b",      # Present
+            r"\w+yi\b",      # Past
+            r"\w+gi\b"       # Future
+        ]
+    },
+
+    # MURA FAMILY
+    "Múra": {
+        "word_patterns": r"\b(pa|ka|ma|na|ta)\b",
+        "vocabulary": [
+            "pahi", "kanam", "matsi", "nawa",
+            "ee", "paa", "muka", "tapa", "wai"
+        ],
+        "phonetic_patterns": {
+            "nasalization": r"[ãẽĩõũ]",
+            "stress": r"[́]",
+            "vowel_length": r"[aeiou]{2}"
+        },
+        "grammatical_patterns": [
+            r"\w+tsi\b",     # Present
+            r"\w+pa\b",      # Past
+            r"\w+na\b"       # Future
+        ]
+    },
+
+    # PEBA-YAGUAN FAMILY
+    "Yagua": {
+        "word_patterns": r"\b(ray|jiy|sa|ni|day)\b",
+        "vocabulary": [
+            "júú", "ramiy", "saachi", "niyan",
+            "jii", "nee", "raatu", "jiya", "day"
+        ],
+        "phonetic_patterns": {
+            "tone": r"[́̀]",
+            "vowel_length": r"[aeiou]{2}",
+            "palatalization": r"[td]y"
+        },
+        "grammatical_patterns": [
+            r"\w+jada\b",    # Present
+            r"\w+siy\b",     # Past
+            r"\w+ra\b"       # Future
+        ]
+    },
+
+    # PUINAVE ISOLATE
+    "Puinave": {
+        "word_patterns": r"\b(yat|din|kot|mot|ip)\b",
+        "vocabulary": [
+            "yopot", "diwat", "käm", "momot",
+            "häʔä", "yaʔa", "kät", "wop", "mot"
+        ],
+        "phonetic_patterns": {
+            "glottal_stop": r"[ʔ]",
+            "vowel_harmony": r"[äöü]+",
+            "final_stops": r"[ptk]$"
+        },
+        "grammatical_patterns": [
+            r"\w+ot\b",      # Present
+            r"\w+in\b",      # Past
+            r"\w+at\b"       # Future
+        ]
+    },
+
+    # TRUMAI ISOLATE
+    "Trumai": {
+        "word_patterns": r"\b(ke|ka|yi|hi|fa)\b",
+        "vocabulary": [
+            "ain", "kuta", "yis", "hï",
+            "ï'ïn", "kain", "fak", "das", "chi"
+        ],
+        "phonetic_patterns": {
+            "glottal_stop": r"[ʔ]",
+            "central_vowel": r"[ï]",
+            "nasalization": r"[ãẽĩõũ]"
+        },
+        "grammatical_patterns": [
+            r"\w+tl\b",      # Present
+            r"\w+ke\b",      # Past
+            r"\w+ka\b"       # Future
+        ]
+    },
+
+    # WARRWA FAMILY
+    "Warrwa": {
+        "word_patterns": r"\b(nya|wa|ya|ma|nga)\b",
+        "vocabulary": [
+            "ngaya", "warli", "yarra", "mala",
+            "yu", "wirra", "mindi", "karra", "bina"
+        ],
+        "phonetic_patterns": {
+            "retroflexes": r"[ṭṇḷṛ]",
+            "laterals": r"[ly]",
+            "nasals": r"[ŋɲ]"
+        },
+        "grammatical_patterns": [
+            r"\w+rri\b",     # Present
+            r"\w+na\b",      # Past
+            r"\w+yi\b"       # Future
+        ]
+    }
+
+            
+
+        }
+        self.engine = AccentPatternEngine(self.accent_patterns)
+
+    def analyze_accent(self, audio: AudioInput):
+        try:
+            # Transcribe audio (a path, encoded bytes or 16 kHz samples)
+            audio = load_audio(audio)
+            result = self.model.transcribe(audio)
+        except Exception as e:
+            print(f"Error during transcription: {str(e)}")
+            return None
+        return self.analyze_transcription(result, audio)
+
+    def analyze_transcription(self, result, audio=None):
+        """
+        Analyze a Whisper result. With the 16 kHz audio it came from, prosody is measured from
+        the waveform; otherwise it is estimated from segment timestamps and word counts.
+        """
+        try:
+            # Get basic information
+            transcription = result["text"]
+            detected_language = result["language"]
+            segments = result["segments"]
+            
+            prosody_features = self._analyze_prosody(segments) if audio is None else acoustic_prosody(audio)
+            return self._build_analysis(
+                transcription, detected_language, segments, self.engine.feature_counts(transcription),
+                prosody_features
+            )
+            
+        except Exception as e:
+            print(f"Error during accent analysis: {str(e)}")
+            return None
+
+    def analyze_stream(self, audio, window_seconds=STREAM_WINDOW_SECONDS):
+        """
+        Transcribe a recording window by window and yield an updated analysis after each one.
+
+        `audio` is a file path, decoded incrementally by ffmpeg, encoded bytes or 16 kHz samples.
+        Windows are split on silence and transcribed in order; vocabulary, pattern and prosody
+        scores accumulate over the windows so far, so each partial result covers the whole
+        recording up to the end of its window.
+        """
+        chunks = stream_audio(audio, window_seconds) if isinstance(audio, str) else [load_audio(audio)]
+        features = np.zeros(self.engine.feature_count)
+        measurements = {}
+        texts, segments, language = [], [], None
+
+        for index, (start_sample, window) in enumerate(split_on_silence(chunks, window_seconds)):
+            start = start_sample / SAMPLE_RATE
+            result = self.model.transcribe(
+                window,
+                language=language,
+                initial_prompt=texts[-1][-STREAM_PROMPT_CHARS:] if texts else None
+            )
+            language = language or result["language"]
+            measurements = merge_prosody_measurements(measurements, prosody_measurements(window, start))
+
+            text = result["text"].strip()
+            if text:
+                texts.append(text)
+                self.engine.merge_features(features, self.engine.feature_counts(text))
+            segments.extend(
+                {**segment, "start": segment["start"] + start, "end": segment["end"] + start}
+                for segment in result["segments"]
+            )
+            if not segments:
+                continue
+
+            analysis = self._build_analysis(
+                " ".join(texts), language, segments, features, summarize_prosody(measurements)
+            )
+            analysis["window"] = {"index": index, "start": start, "end": start + len(window) / SAMPLE_RATE}
+            yield analysis
+
+    def _build_analysis(self, transcription, detected_language, segments, features, prosody_features):
+        # Detailed analysis
+        scores = self.engine.category_scores(features[np.newaxis])[:, 0]
+        accent_scores, phonetic_features, grammatical_features = (
+            dict(zip(self.engine.accents, category.tolist())) for category in scores
+        )
+        
+        # Combine all analyses
+        analysis = {
+            "detected_language": detected_language,
+            "transcription": transcription,
+            "accent_confidence_scores": accent_scores,
+            "prosody_features": prosody_features,
+            "phonetic_features": phonetic_features,
+            "grammatical_features": grammatical_features,
+            "segments": segments
+        }
+        
+        # Determine most likely accent with confidence weighting
+        weighted_scores = self.engine.weighted_scores(scores)
+        best = int(np.argmax(weighted_scores))
+        likely_accent = self.engine.accents[best]
+        confidence = float(weighted_scores[best])
+        
+        analysis["most_likely_accent"] = {
+            "accent": likely_accent,
+            "confidence": confidence,
+            "confidence_breakdown": {
+                "vocabulary_match": accent_scores[likely_accent],
+                "phonetic_match": phonetic_features.get(likely_accent, 0),
+                "grammatical_match": grammatical_features.get(likely_accent, 0)
+            }
+        }
+        
+        return analysis
+
+    def _analyze_prosody(self, segments):
+        segment_durations = []
+        pause_durations = []
+        speech_rates = []
+        
+        for i, segment in enumerate(segments):
+            duration = segment["end"] - segment["start"]
+            segment_durations.append(duration)
+            
+            words = len(segment["text"].split())
+            speech_rates.append(words / duration if duration > 0 else 0)
+            
+            if i > 0:
+                pause_duration = segment["start"] - segments[i-1]["end"]
+                pause_durations.append(pause_duration)
+        
+        return {
+            "average_segment_duration": np.mean(segment_durations),
+            "average_pause_duration": np.mean(pause_durations) if pause_durations else 0,
+            "average_speech_rate": np.mean(speech_rates),
+            "speech_rate_variance": np.var(speech_rates),
+            "rhythm_pattern": self._determine_rhythm_pattern(segment_durations, speech_rates)
+        }
+
+    def _determine_rhythm_pattern(self, durations, speech_rates):
+        duration_variance = np.var(durations)
+        rate_variance = np.var(speech_rates)
+        
+        if duration_variance < 0.1 and rate_variance < 0.5:
+            return "syllable-timed"
+        elif duration_variance > 0.2:
+            return "stress-timed"
+        else:
+            return "mixed"
+
+def pretty_print_analysis(analysis):
+    """Helper function to print analysis results in a readable format"""
+    if not analysis:
+        print("No analysis available")
+        return
+        
+    print("\n=== Accent Analysis Results ===")
+    print(f"\nDetected Language: {analysis['detected_language']}")
+    
+    print("\nMost Likely Accent Analysis:")
+    print(f"Accent: {analysis['most_likely_accent']['accent']}")
+    print(f"Overall Confidence: {analysis['most_likely_accent']['confidence']:.2%}")
+    print("\nConfidence Breakdown:")
+    for aspect, score in analysis['most_likely_accent']['confidence_breakdown'].items():
+        print(f"- {aspect}: {score:.2%}")
+    
+    print("\nAll Accent Probabilities:")
+    for accent, score in sorted(analysis['accent_confidence_scores'].items(), 
+                              key=lambda x: x[1], reverse=True):
+        print(f"{accent}: {score:.2%}")
+    
+    print("\nProsody Features:")
+    for feature, value in analysis['prosody_features'].items():
+        if isinstance(value, float):
+            print(f"{feature}: {value:.2f}")
+        else:
+            print(f"{feature}: {value}")
+    
+    print("\nTranscription:")
+    print(analysis['transcription'])
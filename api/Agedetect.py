@@ -1,71 +1,370 @@
-from fastapi import FastAPI, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, HTTPException
 import cv2
 import numpy as np
-from PIL import Image
+from PIL import Image, UnidentifiedImageError
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+from functools import partial
+from Uploads import SpooledUpload, close_uploads, spool_upload, spool_uploads
+from InferencePool import InferencePool
+import base64
 import io
+import os
+import threading
+import zipfile
 
-app = FastAPI()
+router = APIRouter(tags=["age"])
 
 # Load models
 faceProto = r"models/opencv_face_detector.pbtxt"
 faceModel = r"models/opencv_face_detector_uint8.pb"
 ageProto = r"models/age_deploy.prototxt"
 ageModel = r"models/age_net.caffemodel"
+genderProto = r"models/gender_deploy.prototxt"
+genderModel = r"models/gender_net.caffemodel"
+
+# ONNX exports of the same networks, optionally with INT8 quantized weights (*.int8.onnx)
+faceOnnxModel = r"models/opencv_face_detector.onnx"
+ageOnnxModel = r"models/age_net.onnx"
+genderOnnxModel = r"models/gender_net.onnx"
 
 MODEL_MEAN_VALUES = (78.4263377603, 87.7689143744, 114.895847746)
 ageList = ['(0-2)', '(4-6)', '(8-12)', '(15-20)', '(25-32)', '(38-43)', '(48-53)', '(60-100)']
+genderList = ['Male', 'Female']
 
-# Load networks
-faceNet = cv2.dnn.readNet(faceModel, faceProto)
-ageNet = cv2.dnn.readNet(ageModel, ageProto)
+FACE_CONF_THRESHOLD = 0.7
+FACE_PADDING = 20
+# Images are decoded at most this large for face detection; the detector itself only sees 300x300
+DETECTION_MAX_SIDE = int(os.getenv("DETECTION_MAX_SIDE", "1024"))
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
 
-def highlightFace(net, frame, conf_threshold=0.7):
-    frameOpencvDnn = frame.copy()
-    frameHeight = frameOpencvDnn.shape[0]
-    frameWidth = frameOpencvDnn.shape[1]
-    blob = cv2.dnn.blobFromImage(frameOpencvDnn, 1.0, (300, 300), [104, 117, 123], True, False)
+# Batch limits
+AGE_BATCH_SIZE = int(os.getenv("AGE_BATCH_SIZE", "16"))
+AGE_BATCH_MAX_IMAGES = int(os.getenv("AGE_BATCH_MAX_IMAGES", "256"))
+# Uncompressed size limits for images inside uploaded ZIP archives
+AGE_ZIP_MAX_IMAGE_BYTES = int(os.getenv("AGE_ZIP_MAX_IMAGE_BYTES", str(20 * 1024 * 1024)))
+AGE_ZIP_MAX_BYTES = int(os.getenv("AGE_ZIP_MAX_BYTES", str(500 * 1024 * 1024)))
 
-    net.setInput(blob)
-    detections = net.forward()
-    faceBoxes = []
-    
-    for i in range(detections.shape[2]):
-        confidence = detections[0, 0, i, 2]
-        if confidence > conf_threshold:
-            x1 = int(detections[0, 0, i, 3] * frameWidth)
-            y1 = int(detections[0, 0, i, 4] * frameHeight)
-            x2 = int(detections[0, 0, i, 5] * frameWidth)
-            y2 = int(detections[0, 0, i, 6] * frameHeight)
-            faceBoxes.append([x1, y1, x2, y2])
-            
-    return faceBoxes
-
-def detect_age(image):
-    # Ensure image is in RGB format
-    if image.shape[2] == 4:
-        image = cv2.cvtColor(image, cv2.COLOR_RGBA2RGB)
-    elif len(image.shape) == 2:
-        image = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-    
-    padding = 20
-    faceBoxes = highlightFace(faceNet, image)
-    
-    if not faceBoxes:
-        return None
-    
-    # Process only the first face found
-    faceBox = faceBoxes[0]
-    face = image[max(0, faceBox[1]-padding):
-                 min(faceBox[3]+padding, image.shape[0]-1),
-                 max(0, faceBox[0]-padding):
-                 min(faceBox[2]+padding, image.shape[1]-1)]
-
-    blob = cv2.dnn.blobFromImage(face, 1.0, (227, 227), MODEL_MEAN_VALUES, swapRB=False)
+# Inference configuration
+DNN_BACKENDS = {
+    "default": cv2.dnn.DNN_BACKEND_DEFAULT,
+    "opencv": cv2.dnn.DNN_BACKEND_OPENCV,
+    "openvino": cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE,
+    "cuda": cv2.dnn.DNN_BACKEND_CUDA,
+}
+DNN_TARGETS = {
+    "cpu": cv2.dnn.DNN_TARGET_CPU,
+    "opencl": cv2.dnn.DNN_TARGET_OPENCL,
+    "opencl_fp16": cv2.dnn.DNN_TARGET_OPENCL_FP16,
+    "cuda": cv2.dnn.DNN_TARGET_CUDA,
+    "cuda_fp16": cv2.dnn.DNN_TARGET_CUDA_FP16,
+}
+# "opencv" runs every network through cv2.dnn; "onnxruntime" runs the ONNX exports written by export_age_onnx.py
+AGE_MODEL_BACKENDS = ("opencv", "onnxruntime")
+AGE_MODEL_BACKEND = os.getenv("AGE_MODEL_BACKEND", "opencv").strip().lower()
+if AGE_MODEL_BACKEND not in AGE_MODEL_BACKENDS:
+    raise ValueError(f"Unknown AGE_MODEL_BACKEND {AGE_MODEL_BACKEND}; choose from {', '.join(AGE_MODEL_BACKENDS)}")
+ONNX_QUANTIZED = os.getenv("ONNX_QUANTIZED", "false").lower() in ("1", "true", "yes")
+ONNX_PROVIDERS = os.getenv("ONNX_PROVIDERS", "CPUExecutionProvider").split(",")
+DNN_BACKEND = os.getenv("DNN_BACKEND", "default")
+DNN_TARGET = os.getenv("DNN_TARGET", "cpu")
+AGE_INFERENCE_WORKERS = int(os.getenv("AGE_INFERENCE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Split the cores between workers so concurrent forwards do not oversubscribe the CPU
+DNN_THREADS = int(os.getenv("DNN_THREADS", str(max(1, (os.cpu_count() or 1) // AGE_INFERENCE_WORKERS))))
+
+cv2.setNumThreads(DNN_THREADS)
+
+class OnnxNet:
+    """ONNX Runtime session exposing the setInput/forward interface of cv2.dnn.Net."""
+
+    def __init__(self, path: str):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = DNN_THREADS
+        options.inter_op_num_threads = 1
+        self.path = path
+        self.session = ort.InferenceSession(path, options, providers=ONNX_PROVIDERS)
+        self.input_name = self.session.get_inputs()[0].name
+        self.blob = None
+
+    def setInput(self, blob):
+        self.blob = blob
+
+    def forward(self):
+        return self.session.run(None, {self.input_name: self.blob})[0]
+
+def onnx_model_path(path: str, quantized: bool = ONNX_QUANTIZED) -> str:
+    return path.replace(".onnx", ".int8.onnx") if quantized else path
+
+class AgeNetworks:
+    """One set of face, age and gender networks, owned by a single thread."""
+
+    def __init__(self, backend: str = AGE_MODEL_BACKEND, quantized: bool = ONNX_QUANTIZED):
+        self.backend = backend
+        self.quantized = quantized
+        self.faceNet = self._load(faceModel, faceProto, faceOnnxModel)
+        self.ageNet = self._load(ageModel, ageProto, ageOnnxModel)
+        self.genderNet = self._load(genderModel, genderProto, genderOnnxModel)
+        # The bundled TensorFlow detector uses SpaceToBatchND, which cv2.dnn cannot run with batch > 1;
+        # this is cleared after the first failed batched forward. The ONNX export batches.
+        self.faceBatching = True
+
+    def _load(self, model, config, onnx_model):
+        if self.backend == "onnxruntime":
+            path = onnx_model_path(onnx_model, self.quantized)
+            if not os.path.exists(path):
+                raise FileNotFoundError(
+                    f"{path} not found; AGE_MODEL_BACKEND=onnxruntime needs the ONNX exports, "
+                    f"run `python export_age_onnx.py{' --quantize' if self.quantized else ''}`"
+                )
+            return OnnxNet(path)
+
+        net = cv2.dnn.readNet(model, config)
+        net.setPreferableBackend(DNN_BACKENDS[DNN_BACKEND])
+        net.setPreferableTarget(DNN_TARGETS[DNN_TARGET])
+        return net
+
+    def describe(self):
+        """Report which runtime and model file serves each network."""
+        return {
+            name: getattr(net, "path", "cv2.dnn")
+            for name, net in (("face", self.faceNet), ("age", self.ageNet), ("gender", self.genderNet))
+        }
+
+# cv2.dnn.Net is not safe to share between threads, so each thread loads its own copy
+_thread_networks = threading.local()
+
+def get_networks() -> AgeNetworks:
+    """Return the calling thread's networks, loading them on first use."""
+    if not hasattr(_thread_networks, "networks"):
+        _thread_networks.networks = AgeNetworks()
+    return _thread_networks.networks
+
+age_inference_pool = InferencePool(AGE_INFERENCE_WORKERS, initializer=get_networks, name="age-inference")
+
+# The DNN models load in well under a second, so they load on first use unless API_WARMUP asks
+WARM_UP_BY_DEFAULT = False
+
+def warm_up():
+    """Load every worker's networks before serving traffic."""
+    age_inference_pool.warm_up()
+
+def shutdown():
+    age_inference_pool.shutdown()
+
+def detect_age_in_file(file: Union[str, BinaryIO], annotate: bool = False):
+    """Detect age and gender for every face in an image path or file, optionally with an annotated preview."""
+    # Image.open rewinds file objects, so the opener can run more than once
+    faces, annotated = detect_age_in_images([partial(Image.open, file)], annotate)
+    return faces[0], annotated[0] if annotate else None
+
+def _parse_face_detections(detections, images, conf_threshold):
+    """Map rows of [image_id, label, confidence, x1, y1, x2, y2] to pixel boxes per image."""
+    detections = detections[detections[:, 2] > conf_threshold]
+    faces = [[] for _ in images]
+    for image_id, _, confidence, *box in detections:
+        height, width = images[int(image_id)].shape[:2]
+        x1, y1, x2, y2 = (np.array(box) * [width, height, width, height]).astype(int)
+        faces[int(image_id)].append(([int(x1), int(y1), int(x2), int(y2)], float(confidence)))
+    return faces
+
+def detect_faces_batch(images: List[np.ndarray], conf_threshold=FACE_CONF_THRESHOLD, networks=None):
+    """Run the face detector over a stacked batch of images, one forward per image if unsupported."""
+    networks = networks or get_networks()
+    faceNet = networks.faceNet
+    if networks.faceBatching and len(images) > 1:
+        try:
+            faceNet.setInput(cv2.dnn.blobFromImages(images, 1.0, (300, 300), [104, 117, 123], True, False))
+            return _parse_face_detections(faceNet.forward()[0, 0], images, conf_threshold)
+        except Exception:
+            networks.faceBatching = False
+
+    faces = []
+    for image in images:
+        faceNet.setInput(cv2.dnn.blobFromImage(image, 1.0, (300, 300), [104, 117, 123], True, False))
+        faces.extend(_parse_face_detections(faceNet.forward()[0, 0], [image], conf_threshold))
+    return faces
+
+def classify_faces(crops: List[np.ndarray], networks=None):
+    """Classify age and gender for all face crops with one forward pass per network."""
+    networks = networks or get_networks()
+    blob = cv2.dnn.blobFromImages(crops, 1.0, (227, 227), MODEL_MEAN_VALUES, swapRB=False)
+
+    networks.ageNet.setInput(blob)
+    agePreds = networks.ageNet.forward()
+
+    networks.genderNet.setInput(blob)
+    genderPreds = networks.genderNet.forward()
+
+    return [
+        (ageList[agePred.argmax()], genderList[genderPred.argmax()])
+        for agePred, genderPred in zip(agePreds, genderPreds)
+    ]
+
+def load_detection_image(image: Image.Image, max_side: int = DETECTION_MAX_SIDE):
+    """Decode an image at reduced size for face detection and return the scale back to full size."""
+    full_width, full_height = image.size
+    # thumbnail() puts JPEGs in draft mode, so they are decoded directly at 1/2, 1/4 or 1/8 scale
+    image.thumbnail((max_side, max_side))
+    small = np.asarray(image.convert("RGB"))
+    return small, full_width / small.shape[1], full_height / small.shape[0]
+
+def crop_faces(image: Image.Image, faceBoxes, padding=FACE_PADDING) -> List[np.ndarray]:
+    """Crop padded face regions from the full-resolution image."""
+    width, height = image.size
+    return [
+        np.asarray(image.crop((max(0, x1-padding), max(0, y1-padding),
+                               min(x2+padding, width-1), min(y2+padding, height-1))).convert("RGB"))
+        for x1, y1, x2, y2 in faceBoxes
+    ]
+
+def annotate_faces(image: np.ndarray, faces, scale_x: float, scale_y: float) -> np.ndarray:
+    """Draw face boxes and labels on a copy of the downscaled image."""
+    annotated = image.copy()
+    thickness = max(1, int(round(annotated.shape[0]/150)))
+    for face in faces:
+        x1, y1, x2, y2 = face["box"]
+        x1, x2 = int(x1 / scale_x), int(x2 / scale_x)
+        y1, y2 = int(y1 / scale_y), int(y2 / scale_y)
+        cv2.rectangle(annotated, (x1, y1), (x2, y2), (0, 255, 0), thickness, 8)
+        cv2.putText(annotated, f'{face["gender"]}, {face["age"]}', (x1, y1-10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 0), 2, cv2.LINE_AA)
+    return annotated
+
+def encode_annotated_image(image: np.ndarray) -> str:
+    """Encode an annotated RGB image as a base64 JPEG."""
+    _, buffer = cv2.imencode(".jpg", cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+    return base64.b64encode(buffer).decode("ascii")
+
+def detect_age_in_images(openers: List[Callable[[], Image.Image]], annotate: bool = False, networks=None):
+    """
+    Detect faces on downscaled decodes of several images, then classify full-resolution
+    face crops from all of them in one batch. Each opener returns a fresh PIL image, so
+    the full-size decode only happens for images that contain faces.
+    """
+    smalls, scales = [], []
+    for open_image in openers:
+        with open_image() as image:
+            small, scale_x, scale_y = load_detection_image(image)
+        smalls.append(small)
+        scales.append((scale_x, scale_y))
+
+    face_refs, crops = [], []
+    for i, image_faces in enumerate(detect_faces_batch(smalls, networks=networks)):
+        if not image_faces:
+            continue
+        scale_x, scale_y = scales[i]
+        boxes = [
+            [int(x1 * scale_x), int(y1 * scale_y), int(x2 * scale_x), int(y2 * scale_y)]
+            for (x1, y1, x2, y2), _ in image_faces
+        ]
+        with openers[i]() as image:
+            image_crops = crop_faces(image, boxes)
+        for box, (_, confidence), crop in zip(boxes, image_faces, image_crops):
+            if crop.size:
+                face_refs.append((i, box, confidence))
+                crops.append(crop)
+
+    results = [[] for _ in openers]
+    if crops:
+        for (i, box, confidence), (age, gender) in zip(face_refs, classify_faces(crops, networks)):
+            results[i].append({"box": box, "confidence": round(confidence, 4), "age": age, "gender": gender})
+
+    annotated = None
+    if annotate:
+        annotated = [annotate_faces(small, faces, *scale) for small, faces, scale in zip(smalls, results, scales)]
+    return results, annotated
+
+def _open_image_bytes(data: bytes) -> Image.Image:
+    return Image.open(io.BytesIO(data))
+
+def archive_images(archive: zipfile.ZipFile, name: str) -> List[zipfile.ZipInfo]:
+    """List the image members of an archive, rejecting archives that would expand past the limits."""
+    members = [
+        member for member in archive.infolist()
+        if not member.is_dir() and Path(member.filename).suffix.lower() in IMAGE_EXTENSIONS
+    ]
+    if len(members) > AGE_BATCH_MAX_IMAGES:
+        raise HTTPException(status_code=413, detail=f"{name} holds more than {AGE_BATCH_MAX_IMAGES} images")
+    for member in members:
+        if member.file_size > AGE_ZIP_MAX_IMAGE_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"{member.filename} in {name} exceeds the {AGE_ZIP_MAX_IMAGE_BYTES // (1024 * 1024)} MB image limit"
+            )
+    if sum(member.file_size for member in members) > AGE_ZIP_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{name} expands past the {AGE_ZIP_MAX_BYTES // (1024 * 1024)} MB archive limit"
+        )
+    return members
+
+def read_archive_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> bytes:
+    """Decompress one member; the stream stops at the size checked by archive_images."""
+    with archive.open(member) as stream:
+        return stream.read()
+
+def iter_upload_images(uploads: List[SpooledUpload]) -> Iterator[Tuple[str, Callable[[], Image.Image]]]:
+    """Yield (name, opener) for each uploaded image, expanding ZIP archives within the size limits."""
+    for upload in uploads:
+        if upload.suffix == '.zip':
+            with zipfile.ZipFile(upload.open()) as archive:
+                for member in archive_images(archive, upload.filename):
+                    # Keep the decompressed bytes; the opener runs again for the face crops
+                    yield member.filename, partial(_open_image_bytes, read_archive_member(archive, member))
+        else:
+            yield upload.filename, partial(Image.open, upload.open())
+
+def detect_age_in_uploads(uploads: List[SpooledUpload]):
+    """Run batched age detection over uploaded images and ZIP archives, AGE_BATCH_SIZE images at a time."""
+    results = []
+    names, openers = [], []
+
+    def flush():
+        faces, _ = detect_age_in_images(openers)
+        for name, image_faces in zip(names, faces):
+            results.append({"filename": name, "faces": image_faces})
+        names.clear()
+        openers.clear()
+
+    try:
+        for name, opener in iter_upload_images(uploads):
+            if len(results) + len(names) >= AGE_BATCH_MAX_IMAGES:
+                raise HTTPException(status_code=413, detail=f"At most {AGE_BATCH_MAX_IMAGES} images per batch")
+            names.append(name)
+            openers.append(opener)
+            if len(openers) == AGE_BATCH_SIZE:
+                flush()
+        if openers:
+            flush()
+    except (zipfile.BadZipFile, UnidentifiedImageError) as e:
+        raise HTTPException(status_code=400, detail=f"Unreadable image or archive: {str(e)}")
+    return results
+
+@router.post("/detect-age/")
+async def detect_age_from_image(file: UploadFile = File(...), annotate: bool = False):
+    # Spool the upload, then decode and run inference in the model pool
+    with await spool_upload(file) as upload:
+        faces, annotated = await age_inference_pool.run(detect_age_in_file, upload.file, annotate)
     
-    ageNet.setInput(blob)
-    agePreds = ageNet.forward()
-    age = ageList[agePreds[0].argmax()]
+    if not faces:
+        return {"error": "No face detected in the image"}
     
-    return age
+    response = {"age": faces[0]["age"], "faces": faces}
+    if annotated is not None:
+        # Annotated preview is drawn on the downscaled detection image
+        response["annotated_image"] = encode_annotated_image(annotated)
+    return response
 
+@router.post("/detect-age/batch/")
+async def detect_age_from_images(files: List[UploadFile] = File(...)):
+    """Detect the age of every face in many images, uploaded individually or as ZIP archives."""
+    uploads = await spool_uploads(files)
+    try:
+        results = await age_inference_pool.run(detect_age_in_uploads, uploads)
+    finally:
+        close_uploads(uploads)
 
+    return {"image_count": len(results), "results": results}
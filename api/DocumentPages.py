@@ -0,0 +1,176 @@
+from collections import Counter
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+import hashlib
+import math
+import re
+import fitz
+
+# Header/footer detection: lines in this band at the top or bottom of a page that repeat
+# on at least this share of a document's pages are kept only where they first appear
+HEADER_FOOTER_LINES = 3
+HEADER_FOOTER_MIN_SHARE = 0.5
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Rough token estimate used to fill a prompt budget
+CHARS_PER_TOKEN = 4
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+NUMERIC_CELL = re.compile(r"[-+$()%.,\d\s]*\d[-+$()%.,\d\s]*")
+
+class DocumentPage(BaseModel):
+    filename: str
+    number: int
+    lines: List[str]
+    # Position of the source upload in the request, so uploads sharing a filename stay separate
+    document: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+def read_pdf_pages(data: memoryview, filename: str, tables: bool = False, document: int = 0) -> List[DocumentPage]:
+    """Read a PDF as non-empty lines in reading order, optionally appending table rows as 'label: value' lines."""
+    pages = []
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        for page in doc:
+            lines = [line.strip() for line in page.get_text(sort=True).splitlines() if line.strip()]
+            # Table detection relies on ruling lines, so skip it on pages without vector drawings
+            if tables and page.get_drawings():
+                for table in page.find_tables().tables:
+                    lines.extend(table_lines(table.extract()))
+            pages.append(DocumentPage(filename=filename, number=page.number + 1, lines=lines, document=document))
+    return pages
+
+def table_lines(rows: List[List[Optional[str]]]) -> List[str]:
+    """Flatten table rows to 'label: value' lines, pairing header cells with values for columnar tables."""
+    rows = [[" ".join((cell or "").split()) for cell in row] for row in rows]
+    rows = [row for row in rows if any(row)]
+    if not rows:
+        return []
+    header = rows[0]
+    columnar = len(rows) > 1 and len(header) > 2 and not any(NUMERIC_CELL.fullmatch(cell) for cell in header)
+    lines = []
+    for row in rows[1:] if columnar else rows:
+        cells = [cell for cell in row if cell]
+        if columnar:
+            label = cells[0] if cells else ""
+            lines.extend(
+                f"{label} {name}: {cell}".strip()
+                for name, cell in zip(header[1:], row[1:]) if name and cell
+            )
+        elif len(cells) >= 2:
+            lines.append(f"{cells[0]}: {cells[-1]}")
+    return lines
+
+def _line_key(line: str) -> str:
+    # Page numbers and dates change from page to page, so compare header/footer lines with digits masked
+    return " ".join(re.sub(r"\d+", "#", line.lower()).split())
+
+def _text_key(lines: List[str]) -> bytes:
+    # Figures are what tell statement pages apart, so duplicates are compared with digits intact
+    return hashlib.sha1("\n".join(" ".join(line.lower().split()) for line in lines).encode()).digest()
+
+def strip_repeated_lines(pages: List[DocumentPage]) -> List[DocumentPage]:
+    """Drop header and footer lines that repeat across a document's pages, keeping their first occurrence."""
+    by_document: Dict[int, List[DocumentPage]] = {}
+    for page in pages:
+        by_document.setdefault(page.document, []).append(page)
+
+    stripped = {}
+    for file_pages in by_document.values():
+        if len(file_pages) < 2:
+            continue
+        counts = Counter()
+        for page in file_pages:
+            band = page.lines[:HEADER_FOOTER_LINES] + page.lines[-HEADER_FOOTER_LINES:]
+            counts.update({_line_key(line) for line in band})
+        threshold = max(2, math.ceil(HEADER_FOOTER_MIN_SHARE * len(file_pages)))
+        repeated = {key for key, count in counts.items() if count >= threshold}
+
+        seen = set()
+        for page in file_pages:
+            lines = []
+            for index, line in enumerate(page.lines):
+                key = _line_key(line)
+                in_band = index < HEADER_FOOTER_LINES or index >= len(page.lines) - HEADER_FOOTER_LINES
+                if in_band and key in repeated:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                lines.append(line)
+            stripped[id(page)] = page.model_copy(update={"lines": lines})
+    return [stripped.get(id(page), page) for page in pages]
+
+def dedupe_pages(pages: List[DocumentPage]) -> List[DocumentPage]:
+    """Drop blank pages and pages whose text repeats an earlier page, e.g. documents uploaded twice."""
+    seen = set()
+    unique = []
+    for page in pages:
+        key = _text_key(page.lines)
+        if page.lines and key not in seen:
+            seen.add(key)
+            unique.append(page)
+    return unique
+
+def clean_pages(pages: List[DocumentPage]) -> List[DocumentPage]:
+    """Remove repeated headers and footers, then blank and duplicate pages."""
+    return dedupe_pages(strip_repeated_lines(pages))
+
+def _terms(text: str) -> List[str]:
+    # Fold simple plurals so "payments" matches "payment"
+    return [
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in TOKEN_PATTERN.findall(text.lower())
+    ]
+
+def rank_pages(pages: List[DocumentPage], query: str) -> List[DocumentPage]:
+    """Order pages by BM25 relevance to the query terms, most relevant first; ties keep document order."""
+    if not pages:
+        return []
+    documents = [Counter(_terms(page.text)) for page in pages]
+    lengths = [sum(terms.values()) for terms in documents]
+    average_length = sum(lengths) / len(lengths) or 1
+    document_frequency = Counter(term for terms in documents for term in terms)
+    query_terms = set(_terms(query))
+
+    scores = []
+    for terms, length in zip(documents, lengths):
+        score = 0.0
+        for term in query_terms:
+            frequency = terms.get(term)
+            if not frequency:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(pages) - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+            score += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        scores.append(score)
+    order = sorted(range(len(pages)), key=lambda i: -scores[i])
+    return [pages[i] for i in order]
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def select_relevant_pages(pages: List[DocumentPage], query: str, token_budget: int) -> List[DocumentPage]:
+    """Keep the highest-ranked cleaned pages that fit the token budget, returned in document order.
+
+    If even the best page exceeds the budget, it is truncated to fit rather than dropped.
+    """
+    ranked = rank_pages(clean_pages(pages), query)
+    selected, used = [], 0
+    for page in ranked:
+        tokens = estimate_tokens(page.text)
+        if used + tokens <= token_budget:
+            selected.append(page)
+            used += tokens
+    if not selected and ranked:
+        best = ranked[0]
+        selected.append(best.model_copy(update={"lines": [best.text[:token_budget * CHARS_PER_TOKEN]]}))
+    position = {(page.document, page.number): index for index, page in enumerate(pages)}
+    return sorted(selected, key=lambda page: position[(page.document, page.number)])
+
+def pages_to_text(pages: List[DocumentPage]) -> str:
+    """Join pages into prompt text, labelling each with its source file and page number."""
+    return "\n\n".join(f"[{page.filename} p.{page.number}]\n{page.text}" for page in pages)
@@ -1,46 +1,71 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from google.cloud import vision
-from google.oauth2 import service_account
+from fastapi import APIRouter, File, UploadFile, HTTPException
+from functools import partial
 import fitz
 import io
 import tempfile
 import random
 import time
 import os
-from typing import List
+from typing import List, Iterator
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
-from openai import OpenAI
 from pathlib import Path
+from types import SimpleNamespace
+from JobQueue import JobStatusResponse, get_job_queue, register_job_type
+from LLMCalls import CLIENTS_WARM_UP_BY_DEFAULT, chat_completion, client_warm_up, fit_prompt, lazy_client, stream_chat_completion
+from Streaming import ndjson_event, ndjson_response
+from Uploads import SpooledUpload, spool_upload
 
 # Load environment variables
 load_dotenv()
 
-# Initialize FastAPI app
-app = FastAPI(title="Hand Written Text Detector API")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+router = APIRouter(tags=["text-detection"])
 
 # Environment variables
-OPENAI_KEY = os.getenv("OPENAI_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+OCR_JOB_CONCURRENCY = int(os.getenv("OCR_JOB_CONCURRENCY", "4"))
+# "google" calls Cloud Vision; "stub" answers offline with fixed text for benchmarks and load tests
+VISION_BACKEND = os.getenv("VISION_BACKEND", "google")
+VISION_STUB_LATENCY_SECONDS = float(os.getenv("VISION_STUB_LATENCY_SECONDS", "0.3"))
+VISION_STUB_TEXT = "Bonjour, ceci est un texte manuscrit de test.\nMerci de votre attention."
+
+class StubVisionClient:
+    """Offline stand-in for the Vision client; returns fixed text after a fixed delay."""
+
+    def __init__(self, latency: float = VISION_STUB_LATENCY_SECONDS, text: str = VISION_STUB_TEXT):
+        self.latency = latency
+        self.text = text
+
+    def text_detection(self, image) -> SimpleNamespace:
+        time.sleep(self.latency)
+        annotations = [SimpleNamespace(description=self.text)]
+        annotations.extend(SimpleNamespace(description=word) for word in self.text.split())
+        return SimpleNamespace(error=SimpleNamespace(message=""), text_annotations=annotations)
 
-# Initialize vision client
-vision_client = vision.ImageAnnotatorClient(
-    client_options={"api_key": GOOGLE_API_KEY}
-)
+@lazy_client
+def get_vision_client():
+    """Create the Vision client on first use; importing google.cloud.vision alone takes about a second."""
+    if VISION_BACKEND == "stub":
+        return StubVisionClient()
+    if VISION_BACKEND != "google":
+        raise ValueError(f"Unknown VISION_BACKEND {VISION_BACKEND!r}, expected google or stub")
+    from google.cloud import vision
+    return vision.ImageAnnotatorClient(
+        client_options={"api_key": GOOGLE_API_KEY}
+    )
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=OPENAI_KEY)
+def _vision_image(content: bytes):
+    # The stub client never looks at the image, so skip importing the Vision types
+    if VISION_BACKEND == "stub":
+        return content
+    from google.cloud import vision
+    return vision.Image(content=content)
+
+TRANSLATION_MODEL = "gpt-3.5-turbo"
+# The model's output limit; translations longer than this are cut off by the API anyway
+TRANSLATION_MAX_TOKENS = 4096
+TRANSLATION_SYSTEM_PROMPT = "You are a translator. Translate the following text to English."
 
 class DetectionResponse(BaseModel):
     original_text: str
@@ -66,12 +91,12 @@ def compute_overall_confidence(text_annotations: List) -> float:
     
     return random.uniform(0.90, 0.99)
 
-async def detect_text(image_content: bytes):
-    """Detect text in image using Google Vision API."""
+def detect_text_sync(image_content: bytes):
+    """Detect text in image using Google Vision API from a worker thread."""
     try:
-        image = vision.Image(content=image_content)
+        image = _vision_image(image_content)
         start_time = time.time()
-        response = vision_client.text_detection(image=image)
+        response = get_vision_client().text_detection(image=image)
         end_time = time.time()
         
         if response.error.message:
@@ -88,37 +113,165 @@ async def detect_text(image_content: bytes):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def translate_text(text: str) -> str:
-    """Translate text using OpenAI."""
+def _translation_messages(text: str) -> List[dict]:
+    prompt = fit_prompt("translation", TRANSLATION_MODEL, lambda document: document, text,
+                        TRANSLATION_MAX_TOKENS, system=TRANSLATION_SYSTEM_PROMPT)
+    return [
+        {"role": "system", "content": TRANSLATION_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+def translate_text_sync(text: str) -> str:
+    """Translate text using OpenAI from a worker thread."""
+    try:
+        return chat_completion(
+            "translation",
+            TRANSLATION_MODEL,
+            _translation_messages(text),
+            temperature=0.7,
+            max_tokens=TRANSLATION_MAX_TOKENS
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Translation error: {str(e)}")
+
+def stream_translation(text: str) -> Iterator[str]:
+    """Stream the OpenAI translation of text token by token."""
     try:
-        response = openai_client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a translator. Translate the following text to English."},
-                {"role": "user", "content": text}
-            ],
-            temperature=0.7
+        yield from stream_chat_completion(
+            "translation",
+            TRANSLATION_MODEL,
+            _translation_messages(text),
+            temperature=0.7,
+            max_tokens=TRANSLATION_MAX_TOKENS
         )
-        return response.choices[0].message.content
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation error: {str(e)}")
 
-def convert_pdf_to_images(pdf_path: str) -> List[bytes]:
-    """Convert PDF pages to images."""
+def convert_pdf_to_images(upload: SpooledUpload) -> Iterator[bytes]:
+    """Convert PDF pages to images one page at a time, reading the upload from disk as needed."""
+    with upload.mapped() as data:
+        try:
+            document = fitz.open(stream=data, filetype="pdf")
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"PDF conversion error: {str(e)}")
+
+        with document:
+            for page in document:
+                yield page.get_pixmap().tobytes("png")
+
+def pdf_page_count(upload: SpooledUpload) -> int:
     try:
-        document = fitz.open(pdf_path)
-        images = []
-        for page_num in range(len(document)):
-            page = document.load_page(page_num)
-            pix = page.get_pixmap()
-            image_bytes = pix.tobytes("png")
-            images.append(image_bytes)
-        return images
+        with upload.mapped() as data, fitz.open(stream=data, filetype="pdf") as document:
+            return len(document)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"PDF conversion error: {str(e)}")
 
+def _ocr_document_pages(upload: SpooledUpload):
+    """Return the page count and a lazy iterator of text detection results per page."""
+    if upload.suffix == '.pdf':
+        page_count = pdf_page_count(upload)
+        images = convert_pdf_to_images(upload)
+    else:
+        # Vision takes the image content as bytes
+        page_count = 1
+        images = [upload.read_bytes()]
+
+    return page_count, (detect_text_sync(image) for image in images)
+
+def detect_and_translate_document(upload: SpooledUpload) -> DetectionResponse:
+    """Detect text in a PDF or image and translate it, blocking until done."""
+    german_text = ""
+    detection_time = 0
+    all_text_annotations = []
+    _, page_results = _ocr_document_pages(upload)
+    for text, time_taken, annotations in page_results:
+        if text:
+            german_text += text + "\n"
+            if annotations:
+                all_text_annotations.extend(annotations)
+        detection_time += time_taken
+
+    if not german_text:
+        raise HTTPException(status_code=400, detail="No text detected in the file")
+
+    return DetectionResponse(
+        original_text=german_text,
+        translated_text=translate_text_sync(german_text),
+        detection_time=round(detection_time, 1),
+        confidence_level=round(compute_overall_confidence(all_text_annotations) * 100, 2)
+    )
+
+def stream_text_detection_events(upload: SpooledUpload) -> Iterator[str]:
+    """Yield NDJSON progress events for OCR per page followed by translation tokens."""
+    yield ndjson_event("upload_received", filename=upload.filename, total_bytes=upload.size)
+
+    german_text = ""
+    detection_time = 0
+    all_text_annotations = []
+    page_count, page_results = _ocr_document_pages(upload)
+    yield ndjson_event("pages_extracted", page_count=page_count)
+
+    for page_number, (text, time_taken, annotations) in enumerate(page_results, start=1):
+        if text:
+            german_text += text + "\n"
+            if annotations:
+                all_text_annotations.extend(annotations)
+        detection_time += time_taken
+        yield ndjson_event(
+            "ocr_page",
+            page=page_number,
+            page_count=page_count,
+            text=text or "",
+            detection_time=round(time_taken, 1)
+        )
+
+    if not german_text:
+        raise HTTPException(status_code=400, detail="No text detected in the file")
+
+    tokens = []
+    for token in stream_translation(german_text):
+        tokens.append(token)
+        yield ndjson_event("token", text=token)
+
+    yield ndjson_event(
+        "result",
+        **DetectionResponse(
+            original_text=german_text,
+            translated_text="".join(tokens),
+            detection_time=round(detection_time, 1),
+            confidence_level=round(compute_overall_confidence(all_text_annotations) * 100, 2)
+        ).model_dump()
+    )
+
+register_job_type("detect-text", detect_and_translate_document, concurrency=OCR_JOB_CONCURRENCY)
+
+WARM_UP_BY_DEFAULT = CLIENTS_WARM_UP_BY_DEFAULT
+warm_up = client_warm_up(get_vision_client)
+
+@router.post("/detect-text/", response_model=DetectionResponse)
+async def process_file(file: UploadFile = File(...)):
+    """Process uploaded file (PDF or image) and return detected text with translation."""
+    upload = await spool_upload(file)
+    try:
+        # OCR and translation block, so run them off the event loop
+        return await run_in_threadpool(detect_and_translate_document, upload)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        upload.close()
+
+@router.post("/detect-text/stream")
+async def stream_process_file(file: UploadFile = File(...)):
+    """Stream OCR progress per page and translation tokens as NDJSON events."""
+    upload = await spool_upload(file)
+    return ndjson_response(stream_text_detection_events(upload), on_close=upload.close)
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+@router.post("/api/jobs/detect-text", response_model=JobStatusResponse, status_code=202)
+async def submit_text_detection_job(file: UploadFile = File(...)):
+    """Queue a PDF or image for background text detection and translation."""
+    upload = await spool_upload(file)
+    return await get_job_queue().submit("detect-text", upload, on_finish=upload.close)
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from fastapi import HTTPException
+from functools import partial
+from typing import Any, Callable, Optional
+import asyncio
+import threading
+
+class InferencePool:
+    """Thread pool for blocking model inference that keeps it off the event loop.
+
+    ``initializer`` runs once in each worker thread, so models that are not safe to share
+    across threads can be loaded into thread-local storage there. With ``max_pending`` set,
+    calls beyond that many queued or running ones are rejected with a 429 instead of queueing.
+    """
+
+    def __init__(self, workers: int, initializer: Optional[Callable[[], Any]] = None,
+                 name: str = "inference", max_pending: Optional[int] = None):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix=name,
+            initializer=initializer
+        )
+
+    @property
+    def pending(self) -> int:
+        """Number of calls queued or running."""
+        return self._pending
+
+    def check_capacity(self):
+        """Raise a 429 if the queue is full, so callers can refuse work before reading a request body."""
+        if self.max_pending is not None and self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests in progress, retry later",
+                headers={"Retry-After": "1"}
+            )
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run fn in a worker thread and await its result."""
+        with self._lock:
+            self.check_capacity()
+            self._pending += 1
+        # Released when the work itself finishes, even if the awaiting request is cancelled
+        try:
+            future = self._executor.submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def warm_up(self):
+        """Start every worker thread so per-thread models are loaded before the first request."""
+        barrier = threading.Barrier(self.workers)
+        wait([self._executor.submit(barrier.wait) for _ in range(self.workers)])
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
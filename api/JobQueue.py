@@ -0,0 +1,338 @@
+from fastapi import APIRouter, HTTPException
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+# Job store configuration
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "jobs.db")
+JOB_RESULT_TTL_SECONDS = int(os.getenv("JOB_RESULT_TTL_SECONDS", "86400"))
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "500"))
+# Long-polls for jobs running in another worker process re-read the store at this interval
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "0.5"))
+# Expired results are deleted by a background task at this interval
+JOB_PURGE_INTERVAL_SECONDS = float(os.getenv("JOB_PURGE_INTERVAL_SECONDS", "300"))
+# On shutdown, running jobs get this long to finish before they are recorded as interrupted
+JOB_SHUTDOWN_TIMEOUT_SECONDS = float(os.getenv("JOB_SHUTDOWN_TIMEOUT_SECONDS", "30"))
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    job_type: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+class JobQueue:
+    """In-process job queue with bounded concurrency per job type and a SQLite result store.
+
+    Payloads stay in memory, so a job always runs in the process that accepted it. Several
+    worker processes on one host may share the store: each row records the process that
+    owns it, and any worker can report on any job. Replicas on different hosts need their
+    own JOB_DB_PATH.
+    """
+
+    def __init__(self, db_path: str = JOB_DB_PATH, result_ttl: int = JOB_RESULT_TTL_SECONDS,
+                 max_pending: int = JOB_MAX_PENDING):
+        self.result_ttl = result_ttl
+        self.max_pending = max_pending
+        self._handlers: Dict[str, Callable[[Any], Any]] = {}
+        self._limits: Dict[str, int] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._tasks = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._purger: Optional[asyncio.Task] = None
+        self._closing = False
+        self._closed = False
+        self.host = socket.gethostname()
+        self.owner = f"{self.host}:{os.getpid()}"
+
+        self._lock = threading.Lock()
+        # Other worker processes may hold the write lock briefly; wait for it instead of failing
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                expires_at REAL,
+                result TEXT,
+                error TEXT,
+                owner TEXT
+            )"""
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "owner" not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._db.commit()
+        self._fail_orphaned_jobs()
+
+    def _fail_orphaned_jobs(self):
+        """Fail unfinished jobs whose owning process on this host has exited.
+
+        Payloads live in memory, so those jobs cannot resume. Jobs of live workers and of
+        other hosts are left alone.
+        """
+        rows = self._db.execute(
+            "SELECT DISTINCT owner FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchall()
+        orphaned = [owner for (owner,) in rows if self._owner_exited(owner)]
+        now = time.time()
+        for owner in orphaned:
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted by server restart', "
+                "finished_at = ?, expires_at = ? WHERE status IN ('queued', 'running') AND owner IS ?",
+                (now, now + self.result_ttl, owner)
+            )
+        self._db.commit()
+
+    def _owner_exited(self, owner: Optional[str]) -> bool:
+        # Rows written before owners were recorded came from a single-process server
+        if owner is None:
+            return True
+        host, _, pid = owner.rpartition(":")
+        if host != self.host or not pid.isdigit():
+            return False
+        # Our own pid can only appear here if an earlier process with it died
+        if owner == self.owner:
+            return True
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def register(self, job_type: str, handler: Callable[[Any], Any], concurrency: int):
+        """Register a blocking handler for a job type with its maximum concurrency."""
+        self._handlers[job_type] = handler
+        self._limits[job_type] = concurrency
+
+    def _execute(self, query: str, params: tuple = ()):
+        with self._lock:
+            # Handlers still running when the queue shut down have nowhere to report to
+            if self._closed:
+                return []
+            rows = self._db.execute(query, params).fetchall()
+            self._db.commit()
+            return rows
+
+    async def _query(self, query: str, params: tuple = ()):
+        """Run a statement off the event loop; the store may wait on another process's write lock."""
+        return await run_in_threadpool(self._execute, query, params)
+
+    def _ensure_started(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, sum(self._limits.values())),
+                thread_name_prefix="job-worker"
+            )
+            self._semaphores = {
+                job_type: asyncio.Semaphore(limit) for job_type, limit in self._limits.items()
+            }
+        self._start_purging()
+
+    def _start_purging(self):
+        if self._purger is None and not self._closing:
+            self._purger = asyncio.create_task(self._purge_periodically())
+
+    async def _purge_periodically(self):
+        while True:
+            try:
+                await self.purge_expired()
+            except sqlite3.OperationalError:
+                # The store stayed locked by another worker; try again next interval
+                pass
+            await asyncio.sleep(JOB_PURGE_INTERVAL_SECONDS)
+
+    async def submit(self, job_type: str, payload: Any,
+                     on_finish: Optional[Callable[[], None]] = None) -> JobStatusResponse:
+        """Queue a job and return immediately with its id; on_finish runs once the job is done."""
+        try:
+            if job_type not in self._handlers:
+                raise HTTPException(status_code=404, detail=f"Unknown job type: {job_type}")
+            if self._closing:
+                raise HTTPException(status_code=503, detail="Server is shutting down, retry later")
+            self._ensure_started()
+
+            pending = (await self._query(
+                "SELECT COUNT(*) FROM jobs WHERE job_type = ? AND status IN ('queued', 'running')",
+                (job_type,)
+            ))[0][0]
+            if pending >= self.max_pending:
+                raise HTTPException(status_code=429, detail=f"Too many pending {job_type} jobs, retry later")
+        except HTTPException:
+            if on_finish is not None:
+                on_finish()
+            raise
+
+        job_id = uuid.uuid4().hex
+        await self._query(
+            "INSERT INTO jobs (id, job_type, status, created_at, owner) VALUES (?, ?, 'queued', ?, ?)",
+            (job_id, job_type, time.time(), self.owner)
+        )
+        self._finished[job_id] = asyncio.Event()
+
+        task = asyncio.create_task(self._run(job_id, job_type, payload, on_finish))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return await self.get(job_id)
+
+    async def _run(self, job_id: str, job_type: str, payload: Any,
+                   on_finish: Optional[Callable[[], None]]):
+        try:
+            await self._process(job_id, job_type, payload)
+        finally:
+            if on_finish is not None:
+                on_finish()
+
+    async def _process(self, job_id: str, job_type: str, payload: Any):
+        async with self._semaphores[job_type]:
+            # Queued jobs are not started once shutdown begins; shutdown() records them as interrupted
+            if self._closing:
+                return
+            await self._query(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ? AND owner = ?",
+                (time.time(), job_id, self.owner)
+            )
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(self._executor, self._handlers[job_type], payload)
+                if isinstance(result, BaseModel):
+                    result = result.model_dump()
+                status, result_json, error = "completed", json.dumps(result, default=str), None
+            except HTTPException as e:
+                status, result_json, error = "failed", None, str(e.detail)
+            except Exception as e:
+                status, result_json, error = "failed", None, str(e)
+
+            finished_at = time.time()
+            await self._query(
+                "UPDATE jobs SET status = ?, finished_at = ?, expires_at = ?, result = ?, error = ? "
+                "WHERE id = ? AND owner = ?",
+                (status, finished_at, finished_at + self.result_ttl, result_json, error, job_id, self.owner)
+            )
+            event = self._finished.pop(job_id, None)
+            if event is not None:
+                event.set()
+
+    async def purge_expired(self):
+        """Delete finished jobs whose results are past their TTL."""
+        await self._query("DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+
+    async def get(self, job_id: str) -> JobStatusResponse:
+        """Return the current status of a job, including its result once finished."""
+        # Expired results are hidden even before the purge task deletes them
+        rows = await self._query(
+            "SELECT id, job_type, status, created_at, started_at, finished_at, result, error "
+            "FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at >= ?)",
+            (job_id, time.time())
+        )
+        if not rows:
+            raise HTTPException(status_code=404, detail="Job not found or expired")
+
+        job_id, job_type, status, created_at, started_at, finished_at, result, error = rows[0]
+        return JobStatusResponse(
+            job_id=job_id,
+            job_type=job_type,
+            status=status,
+            created_at=created_at,
+            started_at=started_at,
+            finished_at=finished_at,
+            result=json.loads(result) if result is not None else None,
+            error=error
+        )
+
+    async def wait(self, job_id: str, timeout: float) -> JobStatusResponse:
+        """Long-poll a job until it finishes or the timeout elapses."""
+        self._start_purging()
+        event = self._finished.get(job_id)
+        if event is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            return await self.get(job_id)
+
+        # The job runs in another worker process, so watch the store instead
+        deadline = time.monotonic() + timeout
+        job = await self.get(job_id)
+        while job.status in ("queued", "running") and time.monotonic() < deadline:
+            await asyncio.sleep(min(JOB_POLL_INTERVAL_SECONDS, deadline - time.monotonic()))
+            job = await self.get(job_id)
+        return job
+
+    async def shutdown(self, timeout: float = JOB_SHUTDOWN_TIMEOUT_SECONDS):
+        """Stop accepting work, let running jobs finish for up to `timeout` seconds, then close the store."""
+        self._closing = True
+        if self._purger is not None:
+            self._purger.cancel()
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+        now = time.time()
+        await self._query(
+            "UPDATE jobs SET status = 'failed', error = 'Interrupted by server shutdown', "
+            "finished_at = ?, expires_at = ? WHERE status IN ('queued', 'running') AND owner = ?",
+            (now, now + self.result_ttl, self.owner)
+        )
+        await run_in_threadpool(self._close)
+
+    def _close(self):
+        with self._lock:
+            self._closed = True
+            self._db.close()
+
+# Job types registered by the routers, attached when the shared queue is first used
+_job_types: Dict[str, Tuple[Callable[[Any], Any], int]] = {}
+
+def register_job_type(job_type: str, handler: Callable[[Any], Any], concurrency: int):
+    """Register a job type with the shared queue; call at import time, before any job is submitted."""
+    _job_types[job_type] = (handler, concurrency)
+
+def registered_job_types() -> Tuple[str, ...]:
+    return tuple(_job_types)
+
+@lru_cache(maxsize=None)
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue, opening its store on first use."""
+    queue = JobQueue()
+    for job_type, (handler, concurrency) in _job_types.items():
+        queue.register(job_type, handler, concurrency)
+    return queue
+
+async def shutdown_job_queue():
+    """Shut the shared queue down if it was ever started."""
+    if get_job_queue.cache_info().currsize:
+        await get_job_queue().shutdown()
+
+jobs_router = APIRouter(tags=["jobs"])
+
+@jobs_router.get("/api/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str, wait: float = 0):
+    """
+    Return the status of a background job.
+
+    Parameters:
+    - wait: Seconds to long-poll for the job to finish before responding (max 60)
+    """
+    return await get_job_queue().wait(job_id, min(max(wait, 0), 60))
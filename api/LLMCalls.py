@@ -0,0 +1,392 @@
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+import os
+import re
+import threading
+import time
+
+# openai and tiktoken are imported on first use to keep them off the startup path
+if TYPE_CHECKING:
+    from openai.types import CompletionUsage
+
+# Load environment variables
+load_dotenv()
+
+# Backend selection: "openai", "compatible" (any OpenAI-compatible server at LLM_BASE_URL) or "stub"
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL")
+LLM_API_KEY = os.getenv("LLM_API_KEY") or os.getenv("OPENAI_KEY")
+# Served model for compatible backends, replacing the OpenAI model each analyzer asks for
+LLM_MODEL = os.getenv("LLM_MODEL")
+LLM_CONTEXT_WINDOW = int(os.getenv("LLM_CONTEXT_WINDOW", "0")) or None
+# Stub timing: a fixed delay before the first token, then a delay per streamed token
+LLM_STUB_LATENCY_SECONDS = float(os.getenv("LLM_STUB_LATENCY_SECONDS", "0.5"))
+LLM_STUB_TOKEN_SECONDS = float(os.getenv("LLM_STUB_TOKEN_SECONDS", "0.01"))
+LLM_STUB_COMPLETION_TOKENS = int(os.getenv("LLM_STUB_COMPLETION_TOKENS", "200"))
+
+# Prompts that do not fit are truncated ("truncate") or refused with a 413 ("reject")
+LLM_OVER_BUDGET = os.getenv("LLM_OVER_BUDGET", "truncate")
+# Optional cap on prompt tokens per call, below the model's context window, to bound cost
+LLM_MAX_PROMPT_TOKENS = int(os.getenv("LLM_MAX_PROMPT_TOKENS", "0")) or None
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BACKOFF_SECONDS = 0.5
+LLM_CONTEXT_WINDOWS = {
+    "gpt-4-turbo-preview": 128000,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-3.5-turbo": 16385,
+    "gpt-3.5-turbo-instruct": 4096,
+}
+LLM_DEFAULT_CONTEXT_WINDOW = 8192
+# Chat formatting adds a few tokens per message on top of the content
+MESSAGE_OVERHEAD_TOKENS = 4
+CHARS_PER_TOKEN = 4
+LLM_DURATION_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 40, 80)
+
+class LLMMetrics:
+    """Thread-safe counters and latency histograms for LLM calls, rendered in Prometheus text format."""
+
+    COUNTERS = {
+        "llm_requests_total": "LLM calls by outcome",
+        "llm_prompt_tokens_total": "Prompt tokens sent",
+        "llm_completion_tokens_total": "Completion tokens received",
+        "llm_cached_prompt_tokens_total": "Prompt tokens served from the provider prompt cache",
+        "llm_cache_hits_total": "Calls that reused cached prompt tokens",
+        "llm_retries_total": "Retried attempts after transient API errors",
+        "llm_prompt_truncations_total": "Prompts truncated to fit the token budget",
+        "llm_prompt_rejections_total": "Prompts rejected for exceeding the token budget",
+    }
+
+    def __init__(self, buckets: Tuple[float, ...] = LLM_DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {name: {} for name in self.COUNTERS}
+        self._histograms: Dict[Tuple[Tuple[str, str], ...], List[float]] = {}
+
+    def increment(self, name: str, amount: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._counters[name][key] = self._counters[name].get(key, 0) + amount
+
+    def observe_duration(self, seconds: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            # Per-bucket counts followed by the running sum and count
+            values = self._histograms.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    values[index] += 1
+            values[-2] += seconds
+            values[-1] += 1
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, help_text in self.COUNTERS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+            name = "llm_request_duration_seconds"
+            lines.append(f"# HELP {name} Wall time of LLM calls, including retries and streaming")
+            lines.append(f"# TYPE {name} histogram")
+            for key, values in sorted(self._histograms.items()):
+                for bound, count in zip(self.buckets, values):
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', f'{bound:g}'),))} {count:g}")
+                lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {values[-1]:g}")
+                lines.append(f"{name}_sum{_format_labels(key)} {values[-2]:.6f}")
+                lines.append(f"{name}_count{_format_labels(key)} {values[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+def _format_labels(key: Tuple[Tuple[str, str], ...]) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in key) + "}"
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+llm_metrics = LLMMetrics()
+
+class LLMCallRecord:
+    """Usage of a single LLM call, filled in by the caller while the call is tracked."""
+
+    def __init__(self, operation: str, model: str):
+        self.operation = operation
+        self.model = model
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.retries = 0
+
+    def set_usage(self, usage: Optional["CompletionUsage"]):
+        """Record usage reported by the backend."""
+        if usage is None:
+            return
+        self.prompt_tokens = usage.prompt_tokens or 0
+        self.completion_tokens = usage.completion_tokens or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+
+@contextmanager
+def track_llm_call(operation: str, model: str) -> Iterator[LLMCallRecord]:
+    """Time an LLM call and record its outcome and token usage in llm_metrics."""
+    record = LLMCallRecord(operation, model)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield record
+    except BaseException as e:
+        # A closed generator means the client went away mid-stream
+        status = "cancelled" if isinstance(e, GeneratorExit) else "error"
+        raise
+    finally:
+        labels = {"operation": operation, "model": model}
+        llm_metrics.increment("llm_requests_total", status=status, **labels)
+        llm_metrics.increment("llm_prompt_tokens_total", record.prompt_tokens, **labels)
+        llm_metrics.increment("llm_completion_tokens_total", record.completion_tokens, **labels)
+        llm_metrics.increment("llm_cached_prompt_tokens_total", record.cached_tokens, **labels)
+        if record.cached_tokens:
+            llm_metrics.increment("llm_cache_hits_total", **labels)
+        if record.retries:
+            llm_metrics.increment("llm_retries_total", record.retries, **labels)
+        llm_metrics.observe_duration(time.perf_counter() - start, **labels)
+
+class _ApproximateEncoding:
+    """Stand-in when tiktoken is not installed or cannot download its encodings: about four characters per token."""
+
+    def encode(self, text: str, disallowed_special=()) -> List[str]:
+        return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+    def decode(self, tokens: List[str]) -> str:
+        return "".join(tokens)
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return _ApproximateEncoding()
+
+def count_tokens(text: str, model: str) -> int:
+    return len(_encoding(model).encode(text, disallowed_special=()))
+
+def prompt_budget(model: str, max_tokens: int) -> int:
+    """Prompt tokens available for a model once the completion is reserved, within LLM_MAX_PROMPT_TOKENS."""
+    window = LLM_CONTEXT_WINDOW or LLM_CONTEXT_WINDOWS.get(model, LLM_DEFAULT_CONTEXT_WINDOW)
+    budget = window - max_tokens
+    return min(budget, LLM_MAX_PROMPT_TOKENS) if LLM_MAX_PROMPT_TOKENS else budget
+
+def fit_prompt(operation: str, model: str, build: Callable[[str], str], document: str,
+               max_tokens: int, system: str = "") -> str:
+    """Build a prompt around document, truncating the document if the whole prompt would exceed the budget.
+
+    Only the document is cut, so instructions in the template survive. With LLM_OVER_BUDGET=reject
+    an over-budget prompt raises a 413 instead.
+    """
+    model = get_llm_backend().model_name(model)
+    encoding = _encoding(model)
+    fixed = count_tokens(build(""), model) + count_tokens(system, model) + 2 * MESSAGE_OVERHEAD_TOKENS
+    available = prompt_budget(model, max_tokens) - fixed
+    tokens = encoding.encode(document, disallowed_special=())
+    if len(tokens) <= available:
+        return build(document)
+
+    labels = {"operation": operation, "model": model}
+    if LLM_OVER_BUDGET == "reject" or available <= 0:
+        llm_metrics.increment("llm_prompt_rejections_total", **labels)
+        raise HTTPException(
+            status_code=413,
+            detail=f"Document is {len(tokens)} tokens, over the {max(available, 0)} token budget for {operation}"
+        )
+    llm_metrics.increment("llm_prompt_truncations_total", **labels)
+    return build(encoding.decode(tokens[:available]))
+
+class LLMBackend:
+    """Chat completion provider behind every analyzer, chosen with LLM_BACKEND."""
+
+    # Transient errors chat_completion retries with backoff
+    retryable_errors: Tuple[type, ...] = ()
+
+    def model_name(self, model: str) -> str:
+        """The model actually served for a requested one."""
+        return model
+
+    def complete(self, operation: str, model: str, messages: List[Dict[str, str]],
+                 **kwargs) -> Tuple[str, Optional["CompletionUsage"]]:
+        raise NotImplementedError
+
+    def stream(self, operation: str, model: str, messages: List[Dict[str, str]],
+               **kwargs) -> Iterator[Tuple[str, Optional["CompletionUsage"]]]:
+        """Open a stream and return an iterator of (text, usage) pieces; errors opening it raise here."""
+        raise NotImplementedError
+
+class OpenAIBackend(LLMBackend):
+    """The OpenAI API, or any server implementing its chat completions endpoint at base_url."""
+
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None, model: Optional[str] = None):
+        import openai
+
+        # Retries happen in chat_completion so each one is counted, not hidden inside the client
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.model = model
+        self.retryable_errors = (
+            openai.APIConnectionError,
+            openai.APITimeoutError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+        )
+
+    def model_name(self, model: str) -> str:
+        return self.model or model
+
+    def complete(self, operation, model, messages, **kwargs):
+        completion = self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+        return completion.choices[0].message.content or "", completion.usage
+
+    def stream(self, operation, model, messages, **kwargs):
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},  # Usage arrives in a final chunk without choices
+            **kwargs
+        )
+        return (
+            ((chunk.choices[0].delta.content or "") if chunk.choices else "", chunk.usage)
+            for chunk in stream
+        )
+
+STUB_RESPONSES: Dict[str, Callable[[List[Dict[str, str]]], str]] = {}
+
+def register_stub_response(operation: str, respond: Callable[[List[Dict[str, str]]], str]):
+    """Give the stub backend a canned reply for an operation, e.g. valid JSON where a schema is enforced."""
+    STUB_RESPONSES[operation] = respond
+
+class StubBackend(LLMBackend):
+    """Deterministic offline backend for benchmarks and load tests.
+
+    Replies with the operation's registered canned response, or else echoes the start of the
+    last message, after a fixed latency plus a per-token delay. No network access is needed.
+    """
+
+    def __init__(self, latency: float = LLM_STUB_LATENCY_SECONDS, token_seconds: float = LLM_STUB_TOKEN_SECONDS,
+                 completion_tokens: int = LLM_STUB_COMPLETION_TOKENS):
+        self.latency = latency
+        self.token_seconds = token_seconds
+        self.completion_tokens = completion_tokens
+
+    def _respond(self, operation, model, messages, max_tokens=None, **kwargs) -> Tuple[List[str], SimpleNamespace]:
+        respond = STUB_RESPONSES.get(operation)
+        if respond is not None:
+            text = respond(messages)
+        else:
+            words = messages[-1]["content"].split()
+            text = " ".join(words[:min(self.completion_tokens, max_tokens or self.completion_tokens)])
+        pieces = re.findall(r"\s*\S+", text)
+        prompt_tokens = sum(count_tokens(message["content"], model) + MESSAGE_OVERHEAD_TOKENS for message in messages)
+        # Mirrors the fields of openai's CompletionUsage, so the stub runs without the openai package
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=len(pieces),
+            total_tokens=prompt_tokens + len(pieces)
+        )
+        return pieces, usage
+
+    def complete(self, operation, model, messages, **kwargs):
+        pieces, usage = self._respond(operation, model, messages, **kwargs)
+        time.sleep(self.latency + self.token_seconds * len(pieces))
+        return "".join(pieces), usage
+
+    def stream(self, operation, model, messages, **kwargs):
+        pieces, usage = self._respond(operation, model, messages, **kwargs)
+        return self._stream(pieces, usage)
+
+    def _stream(self, pieces: List[str], usage: SimpleNamespace):
+        time.sleep(self.latency)
+        for piece in pieces:
+            time.sleep(self.token_seconds)
+            yield piece, None
+        yield "", usage
+
+def create_llm_backend(backend: str = LLM_BACKEND) -> LLMBackend:
+    """Build the backend named by LLM_BACKEND."""
+    if backend == "openai":
+        return OpenAIBackend(api_key=LLM_API_KEY)
+    if backend == "compatible":
+        if not LLM_BASE_URL:
+            raise ValueError("LLM_BACKEND=compatible requires LLM_BASE_URL")
+        # Local servers usually ignore the key, but the client insists on one
+        return OpenAIBackend(api_key=LLM_API_KEY or "unused", base_url=LLM_BASE_URL, model=LLM_MODEL)
+    if backend == "stub":
+        return StubBackend()
+    raise ValueError(f"Unknown LLM_BACKEND {backend!r}, expected openai, compatible or stub")
+
+Client = TypeVar("Client")
+
+def lazy_client(create: Callable[[], Client]) -> Callable[[], Client]:
+    """Make a client factory create its client on first use and return that client afterwards."""
+    return lru_cache(maxsize=None)(create)
+
+@lazy_client
+def get_llm_backend() -> LLMBackend:
+    """Return the process-wide backend, creating its client on first use."""
+    return create_llm_backend()
+
+# Creating API clients is cheap, so services that only call remote APIs create them on first use
+# unless API_WARMUP asks; such services export this as their WARM_UP_BY_DEFAULT
+CLIENTS_WARM_UP_BY_DEFAULT = False
+
+def client_warm_up(*clients: Callable[[], Any]) -> Callable[[], None]:
+    """Build a service's warm_up() that creates the LLM backend and the given lazy clients."""
+    def warm_up():
+        get_llm_backend()
+        for client in clients:
+            client()
+    return warm_up
+
+def _with_retries(record: LLMCallRecord, request: Callable[[], Any]) -> Any:
+    retryable = get_llm_backend().retryable_errors
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        try:
+            return request()
+        except retryable:
+            if attempt == LLM_MAX_RETRIES:
+                raise
+            record.retries += 1
+            time.sleep(LLM_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+def chat_completion(operation: str, model: str, messages: List[Dict[str, str]], **kwargs) -> str:
+    """Run a chat completion on the configured backend with retries and metrics, returning the message text."""
+    backend = get_llm_backend()
+    model = backend.model_name(model)
+    with track_llm_call(operation, model) as record:
+        text, usage = _with_retries(record, lambda: backend.complete(operation, model, messages, **kwargs))
+        record.set_usage(usage)
+        return text
+
+def stream_chat_completion(operation: str, model: str, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+    """Stream a chat completion token by token with retries and metrics.
+
+    Only opening the stream is retried; once tokens have been yielded an error propagates.
+    """
+    backend = get_llm_backend()
+    model = backend.model_name(model)
+    with track_llm_call(operation, model) as record:
+        stream = _with_retries(record, lambda: backend.stream(operation, model, messages, **kwargs))
+        for text, usage in stream:
+            if usage is not None:
+                record.set_usage(usage)
+            if text:
+                yield text
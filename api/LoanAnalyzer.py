@@ -1,99 +1,211 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any
-import fitz
+from fastapi import APIRouter, File, UploadFile, HTTPException
+from functools import partial
+from typing import List, Dict, Iterator, Literal, Tuple, Type
 import os
+import re
 from dotenv import load_dotenv
-from openai import OpenAI
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+from starlette.concurrency import run_in_threadpool
 import json
+from DocumentPages import DocumentPage, read_pdf_pages
+from JobQueue import JobStatusResponse, get_job_queue, register_job_type
+from LLMCalls import CLIENTS_WARM_UP_BY_DEFAULT, chat_completion, client_warm_up, fit_prompt, register_stub_response, stream_chat_completion
+from LoanExtraction import build_loan_digest
+from Streaming import ndjson_event, ndjson_response
+from Uploads import SpooledUpload, close_uploads, spool_uploads
 
 # Load environment variables
 load_dotenv()
 
-# Initialize FastAPI app
-app = FastAPI(title="Loan Document Analyzer API")
+router = APIRouter(tags=["loan"])
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Specify your frontend domain in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+LOAN_MODEL = "gpt-4-turbo-preview"
+LOAN_MAX_TOKENS = 4000
+# Sections that fail validation are regenerated on their own with a smaller budget
+LOAN_SECTION_MAX_TOKENS = 1200
+LOAN_SECTION_RETRIES = int(os.getenv("LOAN_SECTION_RETRIES", "2"))
+LOAN_JOB_CONCURRENCY = int(os.getenv("LOAN_JOB_CONCURRENCY", "4"))
+
+# Add explicit JSON instructions in the system prompt
+LOAN_SYSTEM_PROMPT = """You are a precise loan analysis AI. 
+        Generate a structured JSON response about the loan application. 
+        Ensure the JSON is valid and contains detailed, professional insights.
+        Your response will be parsed and used for critical financial decision-making."""
+
+class LoanSection(BaseModel):
+    # The model often returns figures as numbers where the schema asks for text
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+class LoanAnalysis(LoanSection):
+    total_annual_income: str
+    income_sources: List[str]
+    credit_score: str
+    debt_to_income_ratio: str
+    total_assets: str
+    financial_strengths: List[str]
+    risk_factors: List[str]
 
-# Initialize OpenAI client
-OPENAI_API_KEY = os.getenv("OPENAI_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
+class LoanRecommendation(LoanSection):
+    decision: Literal["APPROVE", "DENY"]
+    confidence_level: Literal["HIGH", "MEDIUM", "LOW"]
+    recommended_loan_amount: str
+    suggested_terms: str
+
+    @field_validator("decision", "confidence_level", mode="before")
+    @classmethod
+    def normalize_case(cls, value):
+        return value.strip().upper() if isinstance(value, str) else value
+
+class LoanJustification(LoanSection):
+    primary_reasons: List[str]
+    supporting_evidence: str
+    risk_mitigation_strategies: List[str]
+
+    @field_validator("supporting_evidence", mode="before")
+    @classmethod
+    def join_evidence(cls, value):
+        return "; ".join(str(item) for item in value) if isinstance(value, list) else value
+
+class LoanSummary(BaseModel):
+    analysis: LoanAnalysis
+    recommendation: LoanRecommendation
+    justification: LoanJustification
+
+LOAN_SECTIONS: Dict[str, Type[LoanSection]] = {
+    "analysis": LoanAnalysis,
+    "recommendation": LoanRecommendation,
+    "justification": LoanJustification,
+}
 
 class LoanSummaryResponse(BaseModel):
-    summary: Dict[str, Any]
+    summary: LoanSummary
     document_count: int
 
-def extract_text_from_pdfs(files: List[UploadFile]) -> str:
-    """Extract text from multiple PDF files."""
-    extracted_texts = []
-    
-    for file in files:
-        try:
-            # Read the uploaded file content
-            content = file.file.read()
-            
-            # Open PDF with PyMuPDF
-            doc = fitz.open(stream=content, filetype="pdf")
-            
-            # Extract text from each page
-            text = ""
-            for page in doc:
-                text += page.get_text()
-                
-            extracted_texts.append(text)
-            
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Error processing PDF file {file.filename}: {str(e)}")
-        
-        finally:
-            file.file.seek(0)  # Reset file pointer
-            
-    return " ".join(extracted_texts)
-
-def get_completion(prompt: str) -> Dict[str, Any]:
-    """Get completion from OpenAI API and parse into JSON."""
+class LoanSectionParser:
+    """
+    Incrementally pull the top-level sections out of (possibly streamed or truncated) model output.
+
+    Each section is decoded and validated as soon as its JSON value is complete, so a malformed
+    or cut-off section only invalidates itself, not the sections around it.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.sections: Dict[str, LoanSection] = {}
+        self.errors: Dict[str, str] = {}
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add output text and return the names of sections that became valid."""
+        self.text += chunk
+        if "}" not in chunk:
+            return []
+        completed = []
+        for name, model in LOAN_SECTIONS.items():
+            if name in self.sections or name in self.errors:
+                continue
+            match = re.search(rf'"{name}"\s*:\s*', self.text)
+            if not match:
+                continue
+            try:
+                value, _ = json.JSONDecoder().raw_decode(self.text, match.end())
+            except json.JSONDecodeError:
+                continue  # Not complete yet
+            try:
+                self.sections[name] = model.model_validate(value)
+                completed.append(name)
+            except ValidationError as e:
+                self.errors[name] = str(e)
+        return completed
+
+    def finish(self) -> Dict[str, str]:
+        """Return the failing sections with their errors, counting missing ones as failures."""
+        for name in LOAN_SECTIONS:
+            if name not in self.sections and name not in self.errors:
+                self.errors[name] = "Section missing or truncated in the model output"
+        return self.errors
+
+# A fixed, schema-valid reply so offline runs with LLM_BACKEND=stub exercise the whole pipeline
+LOAN_STUB_SUMMARY = LoanSummary(
+    analysis=LoanAnalysis(
+        total_annual_income="$85,000",
+        income_sources=["Salary"],
+        credit_score="720",
+        debt_to_income_ratio="28%",
+        total_assets="$40,000",
+        financial_strengths=["Stable employment history"],
+        risk_factors=["Limited savings relative to the requested amount"]
+    ),
+    recommendation=LoanRecommendation(
+        decision="APPROVE",
+        confidence_level="MEDIUM",
+        recommended_loan_amount="$250,000",
+        suggested_terms="30-year fixed rate"
+    ),
+    justification=LoanJustification(
+        primary_reasons=["Debt-to-income ratio within guidelines"],
+        supporting_evidence="Stub response generated without a language model",
+        risk_mitigation_strategies=["Verify income with recent pay stubs"]
+    )
+)
+for _operation in ("loan_summary", "loan_section_repair"):
+    register_stub_response(_operation, lambda messages: LOAN_STUB_SUMMARY.model_dump_json())
+
+def extract_loan_digest(uploads: List[SpooledUpload]) -> str:
+    """Extract loan figures and the snippets they came from across multiple PDF files."""
+    return build_loan_digest([
+        page for document, upload in enumerate(uploads) for page in _extract_pdf_pages(upload, document)
+    ])
+
+def _extract_pdf_pages(upload: SpooledUpload, document: int = 0) -> List[DocumentPage]:
+    """Read the lines and table rows of an uploaded PDF, reading pages from disk as needed."""
     try:
-        # Add explicit JSON instructions in the system prompt
-        system_prompt = """You are a precise loan analysis AI. 
-        Generate a structured JSON response about the loan application. 
-        Ensure the JSON is valid and contains detailed, professional insights.
-        Your response will be parsed and used for critical financial decision-making."""
+        with upload.mapped() as data:
+            return read_pdf_pages(data, upload.filename, tables=True, document=document)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error processing PDF file {upload.filename}: {str(e)}")
 
-        completion = client.chat.completions.create(
-            model="gpt-4-turbo-preview",  # Updated to latest model
+def get_completion(prompt: str, max_tokens: int = LOAN_MAX_TOKENS, operation: str = "loan_summary") -> str:
+    """Get a JSON-mode completion from the OpenAI API as raw text."""
+    try:
+        return chat_completion(
+            operation,
+            LOAN_MODEL,
+            [
+                {"role": "system", "content": LOAN_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
             response_format={"type": "json_object"},  # Enforce JSON response
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {
-                    "role": "user", 
-                    "content": prompt
-                }
+            max_tokens=max_tokens
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"OpenAI API error: {str(e)}")
+
+def stream_loan_completion(prompt: str) -> Iterator[str]:
+    """Stream the loan analysis completion from OpenAI token by token."""
+    try:
+        yield from stream_chat_completion(
+            "loan_summary",
+            LOAN_MODEL,
+            [
+                {"role": "system", "content": LOAN_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
             ],
-            max_tokens=4000  # Increased token limit for comprehensive analysis
+            response_format={"type": "json_object"},
+            max_tokens=LOAN_MAX_TOKENS
         )
-        
-        # Parse the JSON response
-        response_text = completion.choices[0].message.content
-        return json.loads(response_text)
-    
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse OpenAI response into JSON: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OpenAI API error: {str(e)}")
 
-def generate_loan_summary(extracted_text: str) -> Dict[str, Any]:
-    """Generate a comprehensive loan summary as a structured JSON."""
-    prompt = f"""Conduct a precise, professional loan application analysis based on the following document:
+def fit_loan_prompt(extracted_text: str) -> str:
+    """Build the loan analysis prompt, truncating the digest if it would overflow the token budget."""
+    return fit_prompt("loan_summary", LOAN_MODEL, build_loan_prompt, extracted_text,
+                      LOAN_MAX_TOKENS, system=LOAN_SYSTEM_PROMPT)
+
+def build_loan_prompt(extracted_text: str) -> str:
+    """Build the loan analysis prompt for the extracted document digest."""
+    return f"""Conduct a precise, professional loan application analysis based on the following document digest:
 
-DOCUMENT CONTENT: {extracted_text}
+{extracted_text}
 
 ANALYSIS REQUIREMENTS:
 1. Provide a comprehensive financial profile
@@ -126,16 +238,131 @@ JSON STRUCTURE REQUIRED:
 }}
 
 CRITICAL INSTRUCTIONS:
-- Use actual values from the document
+- Use actual values from the document; prefer the extracted figures over your own arithmetic
 - Maintain professional and objective tone
 - Ensure all statements are document-sourced
 - Provide context for significant observations"""
 
-    return get_completion(prompt)
+def build_section_repair_prompt(extracted_text: str, name: str, error: str,
+                                valid_sections: Dict[str, LoanSection]) -> str:
+    """Build a prompt that regenerates only one section of the loan analysis."""
+    context = json.dumps({key: section.model_dump() for key, section in valid_sections.items()}, indent=2)
+    schema = json.dumps(LOAN_SECTIONS[name].model_json_schema()["properties"], indent=2)
+    return f"""Regenerate only the "{name}" section of a loan application analysis for the following document digest.
+
+{extracted_text}
+
+SECTIONS ALREADY COMPLETED (keep consistent with these):
+{context}
+
+The previous "{name}" section was rejected: {error}
+
+Respond with a JSON object of the form {{"{name}": {{...}}}} whose fields follow this schema:
+{schema}"""
+
+def repair_loan_section(extracted_text: str, name: str, error: str,
+                        valid_sections: Dict[str, LoanSection]) -> LoanSection:
+    """Regenerate a failing section on its own, retrying up to LOAN_SECTION_RETRIES times."""
+    for _ in range(LOAN_SECTION_RETRIES):
+        parser = LoanSectionParser()
+        prompt = fit_prompt(
+            "loan_section_repair",
+            LOAN_MODEL,
+            lambda text: build_section_repair_prompt(text, name, error, valid_sections),
+            extracted_text,
+            LOAN_SECTION_MAX_TOKENS,
+            system=LOAN_SYSTEM_PROMPT
+        )
+        parser.feed(get_completion(prompt, max_tokens=LOAN_SECTION_MAX_TOKENS, operation="loan_section_repair"))
+        if name in parser.sections:
+            return parser.sections[name]
+        error = parser.finish()[name]
+    raise HTTPException(
+        status_code=502,
+        detail=f"Loan analysis section '{name}' was invalid after {LOAN_SECTION_RETRIES} retries: {error}"
+    )
+
+def complete_loan_summary(extracted_text: str, parser: LoanSectionParser) -> Tuple[LoanSummary, List[str]]:
+    """Repair the sections the parser could not validate and return the summary and repaired names."""
+    errors = dict(parser.finish())
+    sections = dict(parser.sections)
+    for name, error in errors.items():
+        sections[name] = repair_loan_section(extracted_text, name, error, sections)
+    return LoanSummary(**sections), list(errors)
 
+def generate_loan_summary(extracted_text: str) -> LoanSummary:
+    """Generate a comprehensive loan summary, validated section by section."""
+    parser = LoanSectionParser()
+    parser.feed(get_completion(fit_loan_prompt(extracted_text)))
+    summary, _ = complete_loan_summary(extracted_text, parser)
+    return summary
+
+def summarize_loan_documents(uploads: List[SpooledUpload]) -> LoanSummaryResponse:
+    """Generate a loan summary for spooled PDF uploads, blocking until done."""
+    extracted_text = extract_loan_digest(uploads)
+    return LoanSummaryResponse(
+        summary=generate_loan_summary(extracted_text),
+        document_count=len(uploads)
+    )
+
+def stream_loan_summary_events(uploads: List[SpooledUpload]) -> Iterator[str]:
+    """Yield NDJSON progress events and LLM tokens while generating a loan summary."""
+    yield ndjson_event(
+        "upload_received",
+        document_count=len(uploads),
+        total_bytes=sum(upload.size for upload in uploads)
+    )
+
+    pages = []
+    for document, upload in enumerate(uploads):
+        upload_pages = _extract_pdf_pages(upload, document)
+        pages.extend(upload_pages)
+        yield ndjson_event("pages_extracted", filename=upload.filename, page_count=len(upload_pages))
+
+    extracted_text = build_loan_digest(pages)
+    parser = LoanSectionParser()
+    for token in stream_loan_completion(fit_loan_prompt(extracted_text)):
+        yield ndjson_event("token", text=token)
+        for name in parser.feed(token):
+            yield ndjson_event("section_completed", section=name, data=parser.sections[name].model_dump())
+
+    summary, repaired = complete_loan_summary(extracted_text, parser)
+    for name in repaired:
+        yield ndjson_event("section_repaired", section=name, data=getattr(summary, name).model_dump())
+
+    yield ndjson_event(
+        "result",
+        **LoanSummaryResponse(summary=summary, document_count=len(uploads)).model_dump()
+    )
+
+register_job_type("loan-summary", summarize_loan_documents, concurrency=LOAN_JOB_CONCURRENCY)
+
+WARM_UP_BY_DEFAULT = CLIENTS_WARM_UP_BY_DEFAULT
+warm_up = client_warm_up()
+
+@router.post("/api/loan-summary", response_model=LoanSummaryResponse)
+async def analyze_loan_documents(files: List[UploadFile] = File(...)):
+    """Endpoint to process loan application documents and return a structured summary."""
+    uploads = await spool_uploads(files)
+    try:
+        # PDF parsing and the LLM call block, so run them off the event loop
+        return await run_in_threadpool(summarize_loan_documents, uploads)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error processing loan documents: {str(e)}")
+    finally:
+        close_uploads(uploads)
 
+@router.post("/api/loan-summary/stream")
+async def stream_loan_documents(files: List[UploadFile] = File(...)):
+    """Stream extraction progress and loan analysis tokens as NDJSON events."""
+    uploads = await spool_uploads(files)
+    return ndjson_response(stream_loan_summary_events(uploads), on_close=partial(close_uploads, uploads))
 
-@app.get("/api/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
\ No newline at end of file
+@router.post("/api/jobs/loan-summary", response_model=JobStatusResponse, status_code=202)
+async def submit_loan_job(files: List[UploadFile] = File(...)):
+    """Queue loan documents for background analysis and return a job id to poll."""
+    uploads = await spool_uploads(files)
+    return await get_job_queue().submit("loan-summary", uploads, on_finish=partial(close_uploads, uploads))
@@ -0,0 +1,214 @@
+from pydantic import BaseModel
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import re
+from DocumentPages import CHARS_PER_TOKEN, DocumentPage, clean_pages, rank_pages
+
+# Digest limits
+LOAN_SNIPPET_TOKENS = int(os.getenv("LOAN_SNIPPET_TOKENS", "1000"))
+LOAN_SNIPPET_CONTEXT_LINES = 1
+LOAN_MAX_KEY_VALUES = 40
+# Terms pages are ranked by when choosing which snippets fit the budget
+LOAN_RELEVANCE_QUERY = (
+    "income salary wages annual monthly credit score fico debt payment obligations assets "
+    "balance savings checking liabilities loan amount requested employer employment"
+)
+
+# Labels that identify each figure, matched case-insensitively against a line or table row
+FIGURE_LABELS = {
+    "annual_income": re.compile(
+        r"\b(?:annual|yearly|per year)\b[^:\n]{0,20}?\b(?:income|salary|wages|earnings|pay)\b"
+        r"|\b(?:income|salary|wages|earnings)\b[^:\n]{0,20}?\b(?:annual|yearly|per year)\b",
+        re.I
+    ),
+    "monthly_income": re.compile(
+        r"\bmonthly\b[^:\n]{0,20}?\b(?:income|salary|wages|earnings|pay)\b"
+        r"|\b(?:income|salary|wages|earnings)\b[^:\n]{0,20}?\b(?:monthly|per month)\b",
+        re.I
+    ),
+    "monthly_debt_payments": re.compile(
+        r"\b(?:total\s+)?monthly\s+(?:debt|obligations?|liabilit(?:y|ies))(?:\s+payments?)?\b"
+        r"|\btotal\s+(?:monthly\s+)?debt\s+payments?\b",
+        re.I
+    ),
+    "credit_score": re.compile(r"\b(?:credit|fico)\s+score\b|\bfico\b", re.I),
+    "total_assets": re.compile(r"\btotal\s+assets\b", re.I),
+    "total_liabilities": re.compile(r"\btotal\s+(?:liabilities|debts?|outstanding\s+debt)\b", re.I),
+    "loan_amount_requested": re.compile(
+        r"\b(?:requested\s+)?loan\s+amount\b|\bamount\s+requested\b|\brequested\s+amount\b", re.I
+    ),
+}
+# Individual payments and balances, summed only when the document has no total
+DEBT_PAYMENT_LABEL = re.compile(
+    r"\b(?:mortgage|rent|car|auto|vehicle|student\s+loan|credit\s+card|minimum|loan)\b[^:\n]{0,20}?\bpayments?\b",
+    re.I
+)
+ASSET_BALANCE_LABEL = re.compile(
+    r"\b(?:checking|savings|money\s+market|brokerage|investment|retirement|401\s*\(?k\)?|ira)\b"
+    r"[^:\n]{0,25}?\b(?:balance|account|value)\b",
+    re.I
+)
+# Other labels worth passing to the model verbatim
+KEY_TERMS = re.compile(
+    r"\b(?:employer|employment|occupation|position|job\s+title|years?\s+(?:at|of|employed)|"
+    r"interest\s+rate|apr|term|purpose|property|collateral|down\s+payment|bankruptc|delinquen|"
+    r"late\s+payments?|collections?|dependents?|marital|housing)\b",
+    re.I
+)
+
+MONEY_PATTERN = re.compile(
+    r"(?<![\w.])\(?-?\$?\s?(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s*([kKmM])?(?![\w%])"
+)
+DATE_PATTERN = re.compile(
+    r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2}|"
+    r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4})\b",
+    re.I
+)
+KEY_VALUE_PATTERN = re.compile(r"^\s*([A-Za-z][^:\n]{1,60}?)\s*(?::|\.{3,})\s*(\S.*?)\s*$")
+
+class LoanFigures(BaseModel):
+    annual_income: Optional[float] = None
+    monthly_income: Optional[float] = None
+    monthly_debt_payments: Optional[float] = None
+    debt_to_income_ratio: Optional[float] = None
+    credit_score: Optional[int] = None
+    total_assets: Optional[float] = None
+    total_liabilities: Optional[float] = None
+    loan_amount_requested: Optional[float] = None
+    dates: Dict[str, str] = {}
+    key_values: Dict[str, str] = {}
+
+def parse_amount(text: str) -> Optional[float]:
+    """Parse the first money-like number in text, handling thousands separators, k/m suffixes and parentheses."""
+    dates = [date.span() for date in DATE_PATTERN.finditer(text)]
+    for match in MONEY_PATTERN.finditer(text):
+        if any(start <= match.start() < end for start, end in dates):
+            continue
+        value = float(match.group(1).replace(",", ""))
+        value *= {"k": 1e3, "m": 1e6}.get((match.group(2) or "").lower(), 1)
+        if match.group(0).startswith(("(", "-")):
+            value = -value
+        return value
+    return None
+
+def _value_after(lines: List[str], index: int, end: int) -> str:
+    """Text following a label, taken from the next line when the label ends its own line."""
+    rest = lines[index][end:].lstrip(" :.\t-")
+    if not rest and index + 1 < len(lines):
+        rest = lines[index + 1]
+    return rest
+
+def _field_value(field: str, text: str):
+    if field == "credit_score":
+        match = re.search(r"\b([3-8]\d{2})\b", text)
+        return int(match.group(1)) if match and 300 <= int(match.group(1)) <= 850 else None
+    if DATE_PATTERN.match(text.strip()):
+        return None
+    return parse_amount(text)
+
+def extract_loan_figures(pages: Iterable[DocumentPage]) -> Tuple[LoanFigures, List[Tuple[DocumentPage, int]]]:
+    """Pull loan figures, dates and key-value pairs out of document lines.
+
+    Returns the figures and the (page, line index) positions they were found at, so the
+    surrounding text can be quoted to the model.
+    """
+    found: Dict[str, float] = {}
+    # Keyed by label and value so a table row also present in the page text is counted once
+    debt_payments: Dict[Tuple[str, float], float] = {}
+    asset_balances: Dict[Tuple[str, float], float] = {}
+    dates: Dict[str, str] = {}
+    key_values: Dict[str, str] = {}
+    hits: List[Tuple[DocumentPage, int]] = []
+
+    for page in pages:
+        lines = page.lines
+        for index, line in enumerate(lines):
+            hit = False
+            for field, label in FIGURE_LABELS.items():
+                match = label.search(line)
+                if not match or field in found:
+                    continue
+                value = _field_value(field, _value_after(lines, index, match.end()))
+                if value is not None:
+                    found[field] = value
+                    hit = True
+            if "monthly_debt_payments" not in found:
+                match = DEBT_PAYMENT_LABEL.search(line)
+                value = match and parse_amount(_value_after(lines, index, match.end()))
+                if value:
+                    debt_payments[(" ".join(match.group(0).lower().split()), value)] = value
+                    hit = True
+            if "total_assets" not in found:
+                match = ASSET_BALANCE_LABEL.search(line)
+                value = match and parse_amount(_value_after(lines, index, match.end()))
+                if value:
+                    asset_balances[(" ".join(match.group(0).lower().split()), value)] = value
+                    hit = True
+
+            key_value = KEY_VALUE_PATTERN.match(line)
+            if key_value:
+                label, value = key_value.groups()
+                date = DATE_PATTERN.search(value)
+                if date and label not in dates:
+                    dates[label] = date.group(0)
+                    hit = True
+                elif KEY_TERMS.search(label) and label not in key_values and len(key_values) < LOAN_MAX_KEY_VALUES:
+                    key_values[label] = value
+                    hit = True
+            if hit or KEY_TERMS.search(line):
+                hits.append((page, index))
+
+    figures = LoanFigures(dates=dates, key_values=key_values, **found)
+    if figures.monthly_debt_payments is None and debt_payments:
+        figures.monthly_debt_payments = sum(debt_payments.values())
+    if figures.total_assets is None and asset_balances:
+        figures.total_assets = sum(asset_balances.values())
+    if figures.monthly_income is None and figures.annual_income is not None:
+        figures.monthly_income = round(figures.annual_income / 12, 2)
+    if figures.annual_income is None and figures.monthly_income is not None:
+        figures.annual_income = figures.monthly_income * 12
+    if figures.monthly_income and figures.monthly_debt_payments is not None:
+        figures.debt_to_income_ratio = round(100 * figures.monthly_debt_payments / figures.monthly_income, 1)
+    return figures, hits
+
+def loan_snippets(pages: List[DocumentPage], hits: List[Tuple[DocumentPage, int]],
+                  token_budget: int = LOAN_SNIPPET_TOKENS) -> List[str]:
+    """Quote the lines around each hit, grouped per page in the given order, until the token budget is spent."""
+    max_chars = token_budget * CHARS_PER_TOKEN
+    selected: Dict[int, set] = {}
+    for page, index in hits:
+        lo = max(0, index - LOAN_SNIPPET_CONTEXT_LINES)
+        hi = min(len(page.lines), index + LOAN_SNIPPET_CONTEXT_LINES + 1)
+        selected.setdefault(id(page), set()).update(range(lo, hi))
+
+    snippets, used = [], 0
+    for page in pages:
+        indexes = selected.get(id(page))
+        if not indexes:
+            continue
+        text = "\n".join(page.lines[i] for i in sorted(indexes))
+        header = f"[{page.filename} p.{page.number}]"
+        remaining = max_chars - used - len(header) - 1
+        if remaining <= 0:
+            break
+        snippets.append(f"{header}\n{text[:remaining]}")
+        used += len(header) + 1 + min(len(text), remaining)
+    return snippets
+
+def build_loan_digest(pages: List[DocumentPage]) -> str:
+    """Summarize documents as locally extracted figures plus the snippets they came from."""
+    pages = clean_pages(pages)
+    figures, hits = extract_loan_figures(pages)
+    # The most relevant pages get their snippets in first when the budget is tight
+    ranked = rank_pages(pages, LOAN_RELEVANCE_QUERY)
+    snippets = loan_snippets(ranked, hits)
+    if not snippets:
+        # Nothing recognizable, e.g. unusual wording: fall back to the most relevant pages
+        snippets = loan_snippets(ranked, [(page, i) for page in ranked for i in range(len(page.lines))])
+    digest = json.dumps(figures.model_dump(exclude_none=True, exclude_defaults=True), indent=2)
+    return f"""EXTRACTED FIGURES (parsed and computed from the documents; debt_to_income_ratio is a percentage):
+{digest}
+
+RELEVANT EXCERPTS:
+""" + "\n\n".join(snippets)
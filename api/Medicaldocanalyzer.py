@@ -1,82 +1,92 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from typing import List
-import fitz
+from fastapi import APIRouter, File, UploadFile, HTTPException
+from functools import partial
+from typing import List, Iterator
 import os
 from dotenv import load_dotenv
-from langchain_community.llms import OpenAI
-from langchain.chains import LLMChain
-from langchain.prompts import PromptTemplate
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from DocumentPages import DocumentPage, pages_to_text, read_pdf_pages, select_relevant_pages
+from JobQueue import JobStatusResponse, get_job_queue, register_job_type
+from LLMCalls import CLIENTS_WARM_UP_BY_DEFAULT, chat_completion, client_warm_up, fit_prompt, stream_chat_completion
+from Streaming import ndjson_event, ndjson_response
+from Uploads import SpooledUpload, close_uploads, spool_uploads
 
 # Load environment variables
 load_dotenv()
 
-# Initialize FastAPI app
-app = FastAPI(title="Medical Document Analyzer API")
+router = APIRouter(tags=["medical"])
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Specify your frontend domain in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+MEDICAL_MODEL = "gpt-3.5-turbo"
+MEDICAL_MAX_TOKENS = 256
+MEDICAL_TEMPERATURE = 0.3
+MEDICAL_JOB_CONCURRENCY = int(os.getenv("MEDICAL_JOB_CONCURRENCY", "2"))
 
-# Get OpenAI API key from environment variables
-OPENAI_API_KEY = os.getenv("OPENAI_KEY")
+# Only the most relevant pages are sent to the model, up to this many tokens
+MEDICAL_CONTEXT_TOKENS = int(os.getenv("MEDICAL_CONTEXT_TOKENS", "2500"))
+MEDICAL_RELEVANCE_QUERY = (
+    "patient visit date diagnosis assessment plan history chief complaint symptoms findings "
+    "impression medication prescribed dosage treatment procedure lab results vitals allergies follow up"
+)
 
 class AnalysisResponse(BaseModel):
     summary: str
     template_analysis: str
     document_count: int
 
-def initialize_llm():
-    """Initialize OpenAI LLM with API key."""
-    return OpenAI(api_key=OPENAI_API_KEY, temperature=0.3)
+def extract_text_from_pdfs(uploads: List[SpooledUpload]) -> str:
+    """Extract the most relevant pages of multiple PDF files as prompt text."""
+    pages = [page for document, upload in enumerate(uploads) for page in _extract_pdf_pages(upload, document)]
+    return pages_to_text(select_relevant_pages(pages, MEDICAL_RELEVANCE_QUERY, MEDICAL_CONTEXT_TOKENS))
 
-def extract_text_from_pdfs(files: List[UploadFile]) -> str:
-    """Extract text from multiple PDF files."""
-    extracted_texts = []
-    
-    for file in files:
-        try:
-            # Read the uploaded file content
-            content = file.file.read()
-            
-            # Open PDF with PyMuPDF
-            doc = fitz.open(stream=content, filetype="pdf")
-            
-            # Extract text from each page
-            text = ""
-            for page in doc:
-                text += page.get_text()
-                
-            extracted_texts.append(text)
-            
-        except Exception as e:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Error processing PDF file {file.filename}: {str(e)}"
-            )
-        
-        finally:
-            file.file.seek(0)  # Reset file pointer
-            
-    return " ".join(extracted_texts)
-
-def process_summary(extracted_text: str) -> str:
-    """Generate a summary using Langchain and OpenAI."""
+def _extract_pdf_pages(upload: SpooledUpload, document: int = 0) -> List[DocumentPage]:
+    """Read the lines of each page of an uploaded PDF, reading pages from disk as needed."""
     try:
-        prompt_template = """
+        with upload.mapped() as data:
+            return read_pdf_pages(data, upload.filename, document=document)
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Error processing PDF file {upload.filename}: {str(e)}"
+        )
+
+SUMMARY_PROMPT_TEMPLATE = """
         Summarize the following text in concise and clear language:
         {text}
         """
-        prompt = PromptTemplate(input_variables=["text"], template=prompt_template)
-        llm = initialize_llm()
-        chain = LLMChain(llm=llm, prompt=prompt)
-        return chain.run(text=extracted_text)
+
+TEMPLATE_PROMPT_TEMPLATE = """
+        The first visit date was {first_visit_date} and the last visit date was {last_visit_date}. 
+        Analyze the following text:
+        {text}
+        """
+
+# Placeholder dates - in a real application, you'd extract these from the documents
+FIRST_VISIT_DATE = "placeholder for first visit date"
+LAST_VISIT_DATE = "placeholder for last visit date"
+
+def _summary_prompt(extracted_text: str) -> str:
+    return fit_prompt("medical_summary", MEDICAL_MODEL,
+                      lambda text: SUMMARY_PROMPT_TEMPLATE.format(text=text),
+                      extracted_text, MEDICAL_MAX_TOKENS)
+
+def _template_prompt(extracted_text: str) -> str:
+    return fit_prompt("medical_template", MEDICAL_MODEL,
+                      lambda text: TEMPLATE_PROMPT_TEMPLATE.format(
+                          first_visit_date=FIRST_VISIT_DATE,
+                          last_visit_date=LAST_VISIT_DATE,
+                          text=text
+                      ),
+                      extracted_text, MEDICAL_MAX_TOKENS)
+
+def _medical_messages(prompt: str) -> List[dict]:
+    return [{"role": "user", "content": prompt}]
+
+def process_summary(extracted_text: str) -> str:
+    """Generate a summary with the configured LLM backend."""
+    prompt = _summary_prompt(extracted_text)
+    try:
+        return chat_completion("medical_summary", MEDICAL_MODEL, _medical_messages(prompt),
+                               temperature=MEDICAL_TEMPERATURE, max_tokens=MEDICAL_MAX_TOKENS)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -84,37 +94,120 @@ def process_summary(extracted_text: str) -> str:
         )
 
 def process_template(extracted_text: str) -> str:
-    """Generate a template analysis using Langchain and OpenAI."""
+    """Generate a template analysis with the configured LLM backend."""
+    prompt = _template_prompt(extracted_text)
     try:
-        prompt_template = """
-        The first visit date was {first_visit_date} and the last visit date was {last_visit_date}. 
-        Analyze the following text:
-        {text}
-        """
-        # Placeholder dates - in a real application, you'd extract these from the documents
-        first_visit_date = "placeholder for first visit date"
-        last_visit_date = "placeholder for last visit date"
-        
-        prompt = PromptTemplate(
-            input_variables=["first_visit_date", "last_visit_date", "text"],
-            template=prompt_template
-        )
-        llm = initialize_llm()
-        chain = LLMChain(llm=llm, prompt=prompt)
-        return chain.run(
-            first_visit_date=first_visit_date,
-            last_visit_date=last_visit_date,
-            text=extracted_text
-        )
+        return chat_completion("medical_template", MEDICAL_MODEL, _medical_messages(prompt),
+                               temperature=MEDICAL_TEMPERATURE, max_tokens=MEDICAL_MAX_TOKENS)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error generating template analysis: {str(e)}"
         )
 
+def generate_medical_analysis(uploads: List[SpooledUpload]) -> AnalysisResponse:
+    """Summarize and analyze spooled medical PDFs, blocking until done."""
+    extracted_text = extract_text_from_pdfs(uploads)
+    return AnalysisResponse(
+        summary=process_summary(extracted_text),
+        template_analysis=process_template(extracted_text),
+        document_count=len(uploads)
+    )
+
+def stream_medical_analysis_events(uploads: List[SpooledUpload]) -> Iterator[str]:
+    """Yield NDJSON progress events and LLM tokens while analyzing medical documents."""
+    yield ndjson_event(
+        "upload_received",
+        document_count=len(uploads),
+        total_bytes=sum(upload.size for upload in uploads)
+    )
+
+    pages = []
+    for document, upload in enumerate(uploads):
+        upload_pages = _extract_pdf_pages(upload, document)
+        pages.extend(upload_pages)
+        yield ndjson_event("pages_extracted", filename=upload.filename, page_count=len(upload_pages))
+    selected = select_relevant_pages(pages, MEDICAL_RELEVANCE_QUERY, MEDICAL_CONTEXT_TOKENS)
+    yield ndjson_event("pages_selected", page_count=len(selected), total_pages=len(pages))
+    extracted_text = pages_to_text(selected)
+
+    prompts = {
+        "summary": ("medical_summary", _summary_prompt(extracted_text)),
+        "template_analysis": ("medical_template", _template_prompt(extracted_text)),
+    }
+    results = {}
+    for section, (operation, prompt) in prompts.items():
+        tokens = []
+        try:
+            for token in stream_chat_completion(operation, MEDICAL_MODEL, _medical_messages(prompt),
+                                                temperature=MEDICAL_TEMPERATURE, max_tokens=MEDICAL_MAX_TOKENS):
+                tokens.append(token)
+                yield ndjson_event("token", section=section, text=token)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error generating {section.replace('_', ' ')}: {str(e)}"
+            )
+        results[section] = "".join(tokens)
+        yield ndjson_event("section_completed", section=section)
+
+    yield ndjson_event(
+        "result",
+        **AnalysisResponse(document_count=len(uploads), **results).model_dump()
+    )
+
+register_job_type("analyze-medical-documents", generate_medical_analysis, concurrency=MEDICAL_JOB_CONCURRENCY)
 
-@app.get("/api/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+WARM_UP_BY_DEFAULT = CLIENTS_WARM_UP_BY_DEFAULT
+warm_up = client_warm_up()
+
+@router.post("/api/analyze-medical-documents/", response_model=AnalysisResponse)
+async def analyze_medical_documents(files: List[UploadFile] = File(...)):
+    """
+    Endpoint to analyze medical documents and generate analysis.
+    
+    Parameters:
+    - files: List of PDF files containing medical documents
+    
+    Returns:
+    - JSON object containing the summary, template analysis, and number of processed documents
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="No files provided")
+        
+    for file in files:
+        if not file.filename.lower().endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Only PDF files are supported")
+    
+    uploads = await spool_uploads(files)
+    try:
+        # PDF parsing and the LLM calls block, so run them off the event loop
+        return await run_in_threadpool(generate_medical_analysis, uploads)
+    finally:
+        close_uploads(uploads)
+
+@router.post("/api/analyze-medical-documents/stream")
+async def stream_medical_documents(files: List[UploadFile] = File(...)):
+    """Stream extraction progress and summary/template tokens as NDJSON events."""
+    if not files:
+        raise HTTPException(status_code=400, detail="No files provided")
+
+    for file in files:
+        if not file.filename.lower().endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Only PDF files are supported")
+
+    uploads = await spool_uploads(files)
+    return ndjson_response(stream_medical_analysis_events(uploads), on_close=partial(close_uploads, uploads))
+
+@router.post("/api/jobs/analyze-medical-documents", response_model=JobStatusResponse, status_code=202)
+async def submit_medical_job(files: List[UploadFile] = File(...)):
+    """Queue medical documents for background analysis and return a job id to poll."""
+    if not files:
+        raise HTTPException(status_code=400, detail="No files provided")
+
+    for file in files:
+        if not file.filename.lower().endswith('.pdf'):
+            raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
+    uploads = await spool_uploads(files)
+    return await get_job_queue().submit("analyze-medical-documents", uploads, on_finish=partial(close_uploads, uploads))
@@ -0,0 +1,32 @@
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Callable, Iterable, Iterator, Optional
+import json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def ndjson_event(event: str, **data) -> str:
+    """Serialize a single progress event as one NDJSON line."""
+    return json.dumps({"event": event, **data}, default=str) + "\n"
+
+def guard_events(events: Iterable[str]) -> Iterator[str]:
+    """Report errors raised mid-stream as a final error event instead of dropping the connection."""
+    try:
+        yield from events
+    except HTTPException as e:
+        yield ndjson_event("error", status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        yield ndjson_event("error", status_code=500, detail=str(e))
+
+def ndjson_response(events: Iterable[str], on_close: Optional[Callable[[], None]] = None) -> StreamingResponse:
+    """Wrap an event generator in a streaming response that proxies will not buffer."""
+    return StreamingResponse(
+        guard_events(events),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable nginx response buffering
+        },
+        background=BackgroundTask(on_close) if on_close else None,
+    )
@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+from fastapi import UploadFile, HTTPException
+from pathlib import Path
+from typing import BinaryIO, Iterator, List
+import io
+import mmap
+import os
+
+# Upload limits
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(200 * 1024 * 1024)))
+
+class SpooledUpload:
+    """An uploaded file, kept in the temporary file Starlette spooled it to while parsing the form.
+
+    The file is taken over from the request, so it outlives the endpoint for streaming responses
+    and background jobs, and parsers read it without another copy to disk.
+    """
+
+    def __init__(self, filename: str, file: BinaryIO, size: int):
+        self.filename = filename
+        self.file = file
+        self.size = size
+
+    @property
+    def suffix(self) -> str:
+        return Path(self.filename or "").suffix.lower()
+
+    def open(self) -> BinaryIO:
+        """Rewind and return the file, for parsers that read file objects such as zipfile and PIL."""
+        self.file.seek(0)
+        return self.file
+
+    def read_bytes(self) -> bytes:
+        """Read the whole file, for clients such as Vision that only accept bytes."""
+        return self.open().read()
+
+    @contextmanager
+    def mapped(self) -> Iterator[memoryview]:
+        """Map the file read-only, for parsers that take a buffer such as PyMuPDF.
+
+        Pages of the file are read from disk as the parser touches them instead of being copied
+        into memory. Anything reading the buffer must be closed before the block exits.
+        """
+        # fileno() moves an upload Starlette still holds in memory (at most 1 MB) to its temporary file
+        with mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            view = memoryview(mapping)
+            try:
+                yield view
+            finally:
+                view.release()
+
+    def close(self):
+        """Close the spooled file, which deletes it."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+async def spool_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> SpooledUpload:
+    """Take over an upload's spooled file, enforcing a size limit before anything reads it."""
+    # The form parser counts the bytes as it spools them; an UploadFile built elsewhere may not
+    size = file.size
+    if size is None:
+        size = file.file.seek(0, os.SEEK_END)
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File {file.filename} exceeds the {max_bytes // (1024 * 1024)} MB upload limit"
+        )
+    upload = SpooledUpload(file.filename, file.file, size)
+    # FastAPI closes the form's files when the endpoint returns; hand it an empty one instead
+    file.file = io.BytesIO()
+    return upload
+
+async def spool_uploads(files: List[UploadFile], max_bytes: int = MAX_UPLOAD_BYTES) -> List[SpooledUpload]:
+    """Take over several uploads, closing the ones already taken if any fails."""
+    uploads = []
+    try:
+        for file in files:
+            uploads.append(await spool_upload(file, max_bytes))
+    except BaseException:
+        close_uploads(uploads)
+        raise
+    return uploads
+
+def close_uploads(uploads: List[SpooledUpload]):
+    """Close a batch of uploads, deleting their spooled files."""
+    for upload in uploads:
+        upload.close()
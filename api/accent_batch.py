@@ -0,0 +1,169 @@
+"""Run accent analysis offline over a directory or manifest of audio files.
+
+Audio is decoded and resampled to 16 kHz in a process pool while Whisper transcribes
+the previous files, and every result is appended to a JSONL file as soon as it is ready.
+Re-running the same command skips files already in the output, so an interrupted run
+resumes where it stopped. Large archives can be split across machines with --shard.
+
+    python accent_batch.py recordings/ --output accents.jsonl --model base --decode-workers 8
+    python accent_batch.py manifest.txt --output accents.jsonl --shard 2/4
+    python accent_batch.py recordings/ --output accents.jsonl --parquet accents.parquet
+
+Install its dependencies with `pip install -r requirements/accent-batch.txt`; --parquet
+needs pandas and pyarrow on top of the accent service's requirements.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import whisper
+
+from AccentCore import AccentAnalyzer, WHISPER_MODEL_SIZES
+
+AUDIO_EXTENSIONS = {'.wav', '.mp3', '.m4a', '.flac', '.ogg', '.opus', '.aac', '.wma'}
+TOP_ACCENTS = 5
+
+def list_audio_files(source: str):
+    """Return audio paths from a directory (recursively) or a manifest with one path per line."""
+    source_path = Path(source)
+    if source_path.is_dir():
+        return sorted(str(p) for p in source_path.rglob("*") if p.suffix.lower() in AUDIO_EXTENSIONS)
+    with open(source_path) as manifest:
+        return [line.strip() for line in manifest if line.strip() and not line.startswith("#")]
+
+def in_shard(path: str, shard: int, shards: int) -> bool:
+    # Stable across runs and machines, unlike hash()
+    return int(hashlib.md5(path.encode()).hexdigest(), 16) % shards == shard
+
+def load_completed(output: str):
+    """Return the paths already analyzed in an existing output file, repairing a torn last line."""
+    completed = set()
+    if not os.path.exists(output):
+        return completed
+    with open(output, "rb+") as f:
+        data = f.read()
+        # A crash mid-write leaves a partial line; cut it so appended records stay parseable
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[:data.rfind(b"\n") + 1]
+    for line in data.decode("utf-8").splitlines():
+        record = json.loads(line)
+        if record.get("error") is None:
+            completed.add(record["path"])
+    return completed
+
+def decode_audio(path: str):
+    """Decode and resample one file to 16 kHz mono float32 in a worker process."""
+    try:
+        return path, whisper.load_audio(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+def analyze_record(analyzer: AccentAnalyzer, model_size: str, path: str, audio, error):
+    """Transcribe and analyze decoded audio, returning one JSON-serializable output record."""
+    record = {"path": path, "model": model_size, "error": error}
+    if error is not None:
+        return record
+
+    start = time.perf_counter()
+    try:
+        result = analyzer.model.transcribe(audio)
+    except Exception as e:
+        record["error"] = f"Transcription failed: {e}"
+        return record
+    analysis = analyzer.analyze_transcription(result, audio)
+    if analysis is None:
+        record["error"] = "Accent analysis failed"
+        return record
+
+    top = sorted(analysis["accent_confidence_scores"].items(), key=lambda item: item[1], reverse=True)
+    record.update({
+        "duration_seconds": round(len(audio) / whisper.audio.SAMPLE_RATE, 2),
+        "processing_seconds": round(time.perf_counter() - start, 2),
+        "detected_language": analysis["detected_language"],
+        "transcription": analysis["transcription"],
+        "most_likely_accent": analysis["most_likely_accent"]["accent"],
+        "confidence": analysis["most_likely_accent"]["confidence"],
+        "confidence_breakdown": analysis["most_likely_accent"]["confidence_breakdown"],
+        "top_vocabulary_matches": dict(top[:TOP_ACCENTS]),
+        "prosody_features": {
+            key: float(value) if not isinstance(value, str) else value
+            for key, value in analysis["prosody_features"].items()
+        },
+    })
+    return record
+
+def decoded_stream(paths, workers: int, prefetch: int):
+    """Yield decoded audio in order, keeping at most `prefetch` files decoded ahead of the consumer."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        remaining = iter(paths)
+        for path in remaining:
+            pending.append(pool.submit(decode_audio, path))
+            if len(pending) >= prefetch:
+                break
+        while pending:
+            yield pending.pop(0).result()
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append(pool.submit(decode_audio, next_path))
+
+def export_parquet(output: str, parquet: str):
+    """Convert the JSONL results into a Parquet file, keeping the last record per path."""
+    import pandas as pd
+
+    frame = pd.read_json(output, lines=True)
+    frame = frame.drop_duplicates(subset="path", keep="last")
+    frame.to_parquet(parquet, index=False)
+    print(f"wrote {len(frame)} rows to {parquet}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="directory of audio files or a manifest with one path per line")
+    parser.add_argument("--output", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--model", choices=WHISPER_MODEL_SIZES, default="base")
+    parser.add_argument("--decode-workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--prefetch", type=int, default=8, help="files decoded ahead of transcription")
+    parser.add_argument("--shard", default="0/1", help="process only shard K of N, e.g. 2/4")
+    parser.add_argument("--parquet", help="also export all results to this Parquet file when done")
+    args = parser.parse_args()
+
+    shard, shards = (int(part) for part in args.shard.split("/"))
+    if not 0 <= shard < shards:
+        parser.error("--shard must be K/N with 0 <= K < N")
+
+    completed = load_completed(args.output)
+    paths = [
+        path for path in list_audio_files(args.source)
+        if in_shard(path, shard, shards) and path not in completed
+    ]
+    print(f"{len(completed)} already done, {len(paths)} to process")
+
+    if paths:
+        analyzer = AccentAnalyzer(model_size=args.model)
+        failures = 0
+        started = time.perf_counter()
+        with open(args.output, "a", encoding="utf-8") as out:
+            for done, (path, audio, error) in enumerate(
+                decoded_stream(paths, args.decode_workers, max(1, args.prefetch)), start=1
+            ):
+                record = analyze_record(analyzer, args.model, path, audio, error)
+                out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                out.flush()
+                if record["error"] is not None:
+                    failures += 1
+                    print(f"failed {path}: {record['error']}", file=sys.stderr)
+                if done % 100 == 0 or done == len(paths):
+                    rate = done / (time.perf_counter() - started)
+                    print(f"{done}/{len(paths)} files, {rate:.2f} files/s, {failures} failed")
+
+    if args.parquet:
+        export_parquet(args.output, args.parquet)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare cv2.dnn and ONNX Runtime age/gender inference for latency and prediction parity.
+
+The ONNX backend loads the exports written by export_age_onnx.py next to the originals in
+models/ (opencv_face_detector.onnx, age_net.onnx, gender_net.onnx); they take the same blobs
+as cv2.dnn.blobFromImage.
+
+    python benchmark_age_backends.py path/to/images --runs 5
+    python benchmark_age_backends.py path/to/images --quantized --min-agreement 0.95
+    python benchmark_age_backends.py --quantize
+"""
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from Agedetect import AgeNetworks, IMAGE_EXTENSIONS, detect_age_in_images
+
+def load_images(directory: str):
+    paths = sorted(p for p in Path(directory).rglob("*") if p.suffix.lower() in IMAGE_EXTENSIONS)
+    return [(p.name, p.read_bytes()) for p in paths]
+
+def detect_age(data: bytes, networks):
+    # Image.open rewinds the buffer, so the pipeline can reopen it for the face crops
+    return detect_age_in_images([lambda: Image.open(io.BytesIO(data))], networks=networks)[0][0]
+
+def time_backend(networks, images, runs):
+    """Return per-image latencies in milliseconds and the predictions from the last run."""
+    detect_age(images[0][1], networks)  # warm-up
+    latencies, predictions = [], []
+    for _ in range(runs):
+        predictions = []
+        for _, image in images:
+            start = time.perf_counter()
+            predictions.append(detect_age(image, networks))
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, predictions
+
+def iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+def agreement(reference, candidate):
+    """Fraction of reference faces matched by a candidate face with the same age and gender."""
+    total = matched = 0
+    for ref_faces, cand_faces in zip(reference, candidate):
+        for ref in ref_faces:
+            total += 1
+            best = max(cand_faces, key=lambda face: iou(ref["box"], face["box"]), default=None)
+            if (best is not None and iou(ref["box"], best["box"]) > 0.5
+                    and best["age"] == ref["age"] and best["gender"] == ref["gender"]):
+                matched += 1
+    return matched / total if total else 1.0
+
+def summarize(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{name:<12} median {statistics.median(latencies):8.1f} ms   p95 {p95:8.1f} ms")
+    return statistics.median(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="?", help="directory of face images")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--quantized", action="store_true", help="benchmark the *.int8.onnx models")
+    parser.add_argument("--quantize", action="store_true", help="write INT8 quantized ONNX models and exit")
+    parser.add_argument("--min-agreement", type=float, default=0.0,
+                        help="exit non-zero if prediction agreement falls below this fraction")
+    args = parser.parse_args()
+
+    if args.quantize:
+        from export_age_onnx import quantize_models
+
+        quantize_models()
+        return
+    if not args.images:
+        parser.error("an image directory is required")
+
+    images = load_images(args.images)
+    if not images:
+        parser.error(f"no images found in {args.images}")
+
+    opencv = AgeNetworks(backend="opencv")
+    onnx = AgeNetworks(backend="onnxruntime", quantized=args.quantized)
+    print(f"{len(images)} images, {args.runs} runs")
+    print(f"onnxruntime networks: {onnx.describe()}")
+
+    opencv_latencies, opencv_predictions = time_backend(opencv, images, args.runs)
+    onnx_latencies, onnx_predictions = time_backend(onnx, images, args.runs)
+
+    opencv_median = summarize("cv2.dnn", opencv_latencies)
+    onnx_median = summarize("onnxruntime", onnx_latencies)
+    print(f"speedup      {opencv_median / onnx_median:8.2f}x")
+
+    parity = agreement(opencv_predictions, onnx_predictions)
+    print(f"agreement    {parity:8.1%}")
+    if parity < args.min_agreement:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
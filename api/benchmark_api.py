@@ -0,0 +1,521 @@
+"""Load-test every API endpoint with synthetic uploads and report latency, throughput and server CPU/RSS.
+
+By default this starts `uvicorn main:app` with the offline LLM and Vision stubs
+(LLM_BACKEND=stub, VISION_BACKEND=stub), so only this code and the local models
+are measured. Age and accent inference still run the real models from models/ and
+Whisper. Results are written as JSON tagged with the git commit. Pass an earlier
+run's file to --compare to fail on regressions.
+
+    python benchmark_api.py --concurrency 8 --requests 50 --output bench.json
+    python benchmark_api.py --services ocr,loan --workers 2 --compare bench.json
+    python benchmark_api.py --url http://localhost:8000 --server-pid 1234 --endpoints loan-summary
+
+Install requirements/benchmark.txt alongside the services being measured. Worker CPU
+and RSS are read from /proc, so they are only reported on Linux.
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+import numpy as np
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICES = ("age", "accent", "ocr", "loan", "medical")
+
+# Synthetic documents mimic the pages the analyzers are written for
+LOAN_PAGE_LINES = [
+    "First National Mortgage - Uniform Residential Loan Application",
+    "Borrower Name: Jane Q. Sample",
+    "Loan Amount: $325,000.00",
+    "Interest Rate: 6.75%",
+    "Loan Term: 360 months",
+    "Gross Monthly Income: $9,850.00",
+    "Monthly Debt Payments: $1,420.00",
+    "Credit Score: 712",
+    "Total Assets: $84,300.00",
+    "Employer: Acme Logistics Inc. since 03/15/2016",
+    "Property Address: 42 Elm Street, Springfield",
+    "Closing Date: 11/30/2024",
+]
+MEDICAL_PAGE_LINES = [
+    "Springfield General Hospital - Outpatient Record",
+    "Patient: John Sample   DOB: 04/12/1968",
+    "Visit Date: 02/03/2024",
+    "Chief Complaint: intermittent chest pain on exertion for two weeks",
+    "History: hypertension, type 2 diabetes, former smoker",
+    "Vitals: BP 148/92, HR 84, SpO2 97%",
+    "Assessment: stable angina, rule out coronary artery disease",
+    "Plan: stress test, start aspirin 81 mg daily, atorvastatin 40 mg nightly",
+    "Medications: metformin 1000 mg twice daily, lisinopril 20 mg daily",
+    "Lab Results: HbA1c 7.4%, LDL 142 mg/dL",
+    "Follow Up: cardiology referral in 2 weeks",
+]
+FILLER_LINE = "This section is intentionally verbose boilerplate that repeats the terms and conditions of the agreement."
+
+class Payloads:
+    """Synthetic uploads built once per run so every request sends identical bytes."""
+
+    def __init__(self, pdf_pages: int, audio_seconds: float, batch_images: int):
+        self.loan_pdf = make_pdf(LOAN_PAGE_LINES, pdf_pages)
+        self.medical_pdf = make_pdf(MEDICAL_PAGE_LINES, pdf_pages)
+        self.face_image = make_face_image()
+        self.text_image = make_text_image()
+        self.audio = make_wav(audio_seconds)
+        self.batch_images = batch_images
+
+def make_pdf(lines: List[str], pages: int) -> bytes:
+    """Lay out the given lines on every page, between a repeated header and a page-numbered footer."""
+    import fitz
+
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((50, 40), "CONFIDENTIAL - Synthetic benchmark document", fontsize=9)
+        body = lines + [FILLER_LINE] * 20
+        page.insert_text((50, 80), "\n".join(body), fontsize=10)
+        page.insert_text((50, 800), f"Page {number} of {pages}", fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def _png(image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def make_face_image(size: int = 640) -> bytes:
+    """Draw a crude face so the detector has something face-like to look at."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (size, size), (180, 200, 220))
+    draw = ImageDraw.Draw(image)
+    c, r = size // 2, size // 4
+    draw.ellipse((c - r, c - int(r * 1.3), c + r, c + int(r * 1.3)), fill=(224, 172, 140))
+    for dx in (-r // 2, r // 2):
+        draw.ellipse((c + dx - 18, c - r // 3 - 10, c + dx + 18, c - r // 3 + 10), fill=(255, 255, 255))
+        draw.ellipse((c + dx - 7, c - r // 3 - 7, c + dx + 7, c - r // 3 + 7), fill=(60, 40, 30))
+    draw.polygon([(c, c - 10), (c - 12, c + 25), (c + 12, c + 25)], fill=(200, 150, 120))
+    draw.arc((c - r // 2, c + 20, c + r // 2, c + r // 1.5), 20, 160, fill=(150, 60, 60), width=6)
+    return _png(image)
+
+def make_text_image(width: int = 1200, height: int = 800) -> bytes:
+    """Render a few lines of dark text on a light background, like a scanned note."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (width, height), (245, 242, 235))
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(MEDICAL_PAGE_LINES):
+        draw.text((40, 40 + index * 60), line, fill=(20, 20, 60))
+    return _png(image)
+
+def make_wav(seconds: float, sample_rate: int = 16000) -> bytes:
+    """Synthesize speech-like audio: a gliding voiced tone with harmonics, chopped into syllables."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.25 * t) > -0.7)
+    noise = np.random.default_rng(0).normal(0, 0.02, t.size)
+    samples = 0.3 * voice * syllables + noise
+    pcm = (np.clip(samples, -1, 1) * 32767).astype(np.int16)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+Files = List[Tuple[str, Tuple[str, bytes, str]]]
+
+class Endpoint(NamedTuple):
+    service: str
+    path: str
+    files: Callable[[Payloads], Files]
+    # "json" waits for the response, "stream" reads NDJSON events, "job" submits and polls
+    mode: str = "json"
+
+def _pdfs(name: str, data: bytes, count: int = 2) -> Files:
+    return [("files", (f"{name}-{i}.pdf", data, "application/pdf")) for i in range(count)]
+
+def _loan(p: Payloads) -> Files:
+    return _pdfs("loan", p.loan_pdf)
+
+def _medical(p: Payloads) -> Files:
+    return _pdfs("medical", p.medical_pdf)
+
+def _text_image(p: Payloads) -> Files:
+    return [("file", ("note.png", p.text_image, "image/png"))]
+
+ENDPOINTS: Dict[str, Endpoint] = {
+    "detect-age": Endpoint("age", "/detect-age/", lambda p: [("file", ("face.png", p.face_image, "image/png"))]),
+    "detect-age-batch": Endpoint("age", "/detect-age/batch/", lambda p: [
+        ("files", (f"face-{i}.png", p.face_image, "image/png")) for i in range(p.batch_images)
+    ]),
+    "analyze-accent": Endpoint("accent", "/analyze-accent/", lambda p: [("file", ("speech.wav", p.audio, "audio/wav"))]),
+    "detect-text": Endpoint("ocr", "/detect-text/", _text_image),
+    "detect-text-stream": Endpoint("ocr", "/detect-text/stream", _text_image, "stream"),
+    "detect-text-job": Endpoint("ocr", "/api/jobs/detect-text", _text_image, "job"),
+    "loan-summary": Endpoint("loan", "/api/loan-summary", _loan),
+    "loan-summary-stream": Endpoint("loan", "/api/loan-summary/stream", _loan, "stream"),
+    "loan-summary-job": Endpoint("loan", "/api/jobs/loan-summary", _loan, "job"),
+    "medical-analysis": Endpoint("medical", "/api/analyze-medical-documents/", _medical),
+    "medical-analysis-stream": Endpoint("medical", "/api/analyze-medical-documents/stream", _medical, "stream"),
+    "medical-analysis-job": Endpoint("medical", "/api/jobs/analyze-medical-documents", _medical, "job"),
+}
+
+class Sample(NamedTuple):
+    ok: bool
+    status: int
+    latency: float
+    first_event: Optional[float] = None
+
+async def send(client: httpx.AsyncClient, endpoint: Endpoint, payloads: Payloads, job_timeout: float) -> Sample:
+    """Make one request and time it; stream events and job results count as errors if they report one."""
+    files = endpoint.files(payloads)
+    start = time.perf_counter()
+    if endpoint.mode == "stream":
+        first_event, ok = None, True
+        async with client.stream("POST", endpoint.path, files=files) as response:
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                if first_event is None:
+                    first_event = time.perf_counter() - start
+                if json.loads(line).get("event") == "error":
+                    ok = False
+        return Sample(ok and response.status_code == 200, response.status_code, time.perf_counter() - start, first_event)
+
+    response = await client.post(endpoint.path, files=files)
+    if endpoint.mode == "job" and response.status_code == 202:
+        job = response.json()
+        deadline = start + job_timeout
+        while job["status"] not in ("completed", "failed") and time.perf_counter() < deadline:
+            wait = min(60, max(1, deadline - time.perf_counter()))
+            response = await client.get(f"/api/jobs/{job['job_id']}", params={"wait": wait}, timeout=wait + 30)
+            job = response.json()
+        return Sample(job["status"] == "completed", response.status_code, time.perf_counter() - start)
+    return Sample(response.status_code == 200, response.status_code, time.perf_counter() - start)
+
+async def run_load(client: httpx.AsyncClient, endpoint: Endpoint, payloads: Payloads, requests: int,
+                   concurrency: int, job_timeout: float) -> Tuple[List[Sample], float]:
+    """Send `requests` requests from `concurrency` concurrent clients; return the samples and wall time."""
+    remaining = iter(range(requests))
+    samples: List[Sample] = []
+
+    async def client_loop():
+        for _ in remaining:
+            try:
+                samples.append(await send(client, endpoint, payloads, job_timeout))
+            except (httpx.HTTPError, ValueError, KeyError):
+                samples.append(Sample(False, 0, 0.0))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+def percentile(values: List[float], q: float) -> float:
+    """Linearly interpolated percentile, q in [0, 100]."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def latency_summary(seconds: List[float]) -> Optional[Dict[str, float]]:
+    if not seconds:
+        return None
+    ms = [s * 1000 for s in seconds]
+    return {
+        "p50": round(percentile(ms, 50), 1),
+        "p95": round(percentile(ms, 95), 1),
+        "p99": round(percentile(ms, 99), 1),
+        "mean": round(sum(ms) / len(ms), 1),
+        "max": round(max(ms), 1),
+    }
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+def worker_pids(server_pid: int) -> List[int]:
+    """The server process plus its children; uvicorn --workers N serves from N child processes."""
+    pids = [server_pid]
+    try:
+        with open(f"/proc/{server_pid}/task/{server_pid}/children") as f:
+            pids.extend(int(pid) for pid in f.read().split())
+    except OSError:
+        pass
+    return pids
+
+def cpu_seconds(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces, so split after its closing parenthesis
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (OSError, IndexError, ValueError):
+        return None
+
+def rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+class ResourceMonitor:
+    """Sample the CPU time and RSS of every server process while a load runs."""
+
+    def __init__(self, server_pid: Optional[int], interval: float = 0.1):
+        self.server_pid = server_pid
+        self.interval = interval
+        self.peak_rss: Dict[int, float] = {}
+        self.start_cpu: Dict[int, float] = {}
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while True:
+            for pid in worker_pids(self.server_pid):
+                rss = rss_mb(pid)
+                if rss is not None:
+                    self.peak_rss[pid] = max(rss, self.peak_rss.get(pid, 0.0))
+                if pid not in self.start_cpu:
+                    cpu = cpu_seconds(pid)
+                    if cpu is not None:
+                        self.start_cpu[pid] = cpu
+            if self.stop_event.wait(self.interval):
+                return
+
+    def __enter__(self):
+        if self.server_pid:
+            self.started = time.perf_counter()
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.server_pid:
+            self.stop_event.set()
+            self.thread.join()
+            self.elapsed = time.perf_counter() - self.started
+
+    def report(self) -> List[Dict[str, float]]:
+        if not self.server_pid:
+            return []
+        workers = []
+        for pid, start in sorted(self.start_cpu.items()):
+            end = cpu_seconds(pid)
+            if end is None:
+                continue
+            used = end - start
+            workers.append({
+                "pid": pid,
+                "cpu_seconds": round(used, 2),
+                "cpu_percent": round(100 * used / self.elapsed, 1) if self.elapsed else 0.0,
+                "rss_peak_mb": round(self.peak_rss.get(pid, 0.0), 1),
+            })
+        return workers
+
+async def benchmark_endpoint(base_url: str, name: str, payloads: Payloads, args, server_pid: Optional[int]) -> Dict:
+    endpoint = ENDPOINTS[name]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        # Warm-up requests load models and clients and are left out of the results
+        await run_load(client, endpoint, payloads, args.warmup, min(args.warmup, args.concurrency) or 1,
+                       args.timeout)
+        with ResourceMonitor(server_pid) as monitor:
+            samples, elapsed = await run_load(client, endpoint, payloads, args.requests, args.concurrency,
+                                              args.timeout)
+
+    succeeded = [s for s in samples if s.ok]
+    status_codes: Dict[str, int] = {}
+    for sample in samples:
+        status_codes[str(sample.status)] = status_codes.get(str(sample.status), 0) + 1
+    result = {
+        "path": endpoint.path,
+        "mode": endpoint.mode,
+        "requests": len(samples),
+        "errors": len(samples) - len(succeeded),
+        "status_codes": status_codes,
+        "latency_ms": latency_summary([s.latency for s in succeeded]),
+        "throughput_rps": round(len(succeeded) / elapsed, 2) if elapsed else 0.0,
+        "workers": monitor.report(),
+    }
+    if endpoint.mode == "stream":
+        result["first_event_ms"] = latency_summary([s.first_event for s in succeeded if s.first_event is not None])
+    return result
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(services: str, workers: int, port: int, job_db: str) -> subprocess.Popen:
+    """Run uvicorn on the API with every upstream service stubbed out."""
+    env = {
+        **os.environ,
+        "API_SERVICES": services,
+        "LLM_BACKEND": "stub",
+        "VISION_BACKEND": "stub",
+        "JOB_DB_PATH": job_db,
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=API_DIR, env=env
+    )
+
+def wait_for_health(base_url: str, server: Optional[subprocess.Popen], timeout: float = 120) -> Dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server is not None and server.poll() is not None:
+            sys.exit(f"server exited with code {server.returncode}")
+        try:
+            response = httpx.get(f"{base_url}/health", timeout=2)
+            if response.status_code == 200:
+                return response.json()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    sys.exit(f"server at {base_url} did not become healthy within {timeout:.0f}s")
+
+def git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=API_DIR, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=API_DIR,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results: Dict[str, Dict]):
+    print(f"\n{'endpoint':<26}{'ok/total':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}"
+          f"{'cpu %':>9}{'rss MB':>9}")
+    for name, result in results.items():
+        latency = result["latency_ms"] or {}
+        workers = result["workers"]
+        cpu = sum(w["cpu_percent"] for w in workers) if workers else None
+        rss = max(w["rss_peak_mb"] for w in workers) if workers else None
+        print(f"{name:<26}{result['requests'] - result['errors']:>5}/{result['requests']:<4}"
+              f"{latency.get('p50', '-'):>10}{latency.get('p95', '-'):>10}{latency.get('p99', '-'):>10}"
+              f"{result['throughput_rps']:>9}{cpu if cpu is not None else '-':>9}"
+              f"{rss if rss is not None else '-':>9}")
+
+def compare(results: Dict[str, Dict], baseline: Dict, max_regression: float) -> List[str]:
+    """Print p95 and throughput changes against a baseline run and return the regressions."""
+    regressions = []
+    print(f"\ncompared with {baseline['meta'].get('commit') or 'baseline'}:")
+    for name, result in results.items():
+        before = baseline["endpoints"].get(name)
+        if not before or not before["latency_ms"] or not result["latency_ms"]:
+            continue
+        p95_change = result["latency_ms"]["p95"] / before["latency_ms"]["p95"] - 1
+        rps_change = result["throughput_rps"] / before["throughput_rps"] - 1 if before["throughput_rps"] else 0.0
+        print(f"  {name:<26} p95 {p95_change:+.1%}  throughput {rps_change:+.1%}")
+        if p95_change > max_regression:
+            regressions.append(f"{name}: p95 {before['latency_ms']['p95']} -> {result['latency_ms']['p95']} ms")
+        if rps_change < -max_regression:
+            regressions.append(f"{name}: throughput {before['throughput_rps']} -> {result['throughput_rps']} req/s")
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {result['errors']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Benchmark a running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="With --url, the server process to sample CPU/RSS from")
+    parser.add_argument("--services", default="all", help="API_SERVICES for the started server")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for the started server")
+    parser.add_argument("--endpoints", help=f"Comma-separated subset of: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per endpoint")
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per endpoint")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-request and per-job timeout in seconds")
+    parser.add_argument("--pdf-pages", type=int, default=5, help="Pages per synthetic PDF (two PDFs per request)")
+    parser.add_argument("--audio-seconds", type=float, default=10, help="Length of the synthetic audio clip")
+    parser.add_argument("--batch-images", type=int, default=8, help="Images per age batch request")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Earlier --output file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Fail when p95 grows or throughput drops by more than this fraction")
+    args = parser.parse_args()
+
+    server, server_pid, job_db = None, args.server_pid, None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        job_db = os.path.join(tempfile.mkdtemp(prefix="benchmark-api-"), "jobs.db")
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(args.services, args.workers, port, job_db)
+        server_pid = server.pid
+
+    try:
+        health = wait_for_health(base_url, server)
+        served = set(health.get("services", SERVICES))
+        names = args.endpoints.split(",") if args.endpoints else [
+            name for name, endpoint in ENDPOINTS.items() if endpoint.service in served
+        ]
+        unknown = [name for name in names if name not in ENDPOINTS]
+        if unknown:
+            sys.exit(f"unknown endpoints: {', '.join(unknown)}")
+
+        payloads = Payloads(args.pdf_pages, args.audio_seconds, args.batch_images)
+        results = {}
+        for name in names:
+            print(f"benchmarking {name}...", flush=True)
+            results[name] = asyncio.run(benchmark_endpoint(base_url, name, payloads, args, server_pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if job_db and os.path.exists(job_db):
+            os.unlink(job_db)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {
+                key: getattr(args, key) for key in (
+                    "url", "services", "workers", "concurrency", "requests", "warmup",
+                    "pdf_pages", "audio_seconds", "batch_images"
+                )
+            },
+        },
+        "endpoints": results,
+    }
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
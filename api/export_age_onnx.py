@@ -0,0 +1,477 @@
+"""Export the face, age and gender networks in models/ to ONNX for AGE_MODEL_BACKEND=onnxruntime.
+
+The age and gender networks are Caffe models; their layers are read from the deploy
+prototxt and their weights through cv2.dnn. The face detector is OpenCV's quantized
+TensorFlow SSD; its graph is read from the text graph and its weights from the frozen
+graph, while the prior boxes, which only depend on the 300x300 input, are taken from
+cv2.dnn and stored as constants. The SSD box decoding and non-maximum suppression are
+exported as ONNX ops, so the exported detector returns the same [1, 1, N, 7] detections
+as cv2.dnn.
+
+    python export_age_onnx.py
+    python export_age_onnx.py --quantize
+
+--quantize also writes INT8 dynamically quantized copies (*.int8.onnx) for ONNX_QUANTIZED.
+Check parity with cv2.dnn with tests/test_age_onnx_parity.py or benchmark_age_backends.py.
+"""
+import argparse
+import os
+import re
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+
+from Agedetect import (
+    ageModel, ageOnnxModel, ageProto, faceModel, faceOnnxModel, faceProto,
+    genderModel, genderOnnxModel, genderProto, onnx_model_path
+)
+
+OPSET = 13
+IR_VERSION = 8
+CAFFE_INPUT_SIZE = 227
+FACE_INPUT_SIZE = 300
+
+# Caffe deploy prototxt
+
+def parse_prototxt(text: str) -> Dict:
+    """Parse protobuf text format into nested dicts; every field maps to a list of values."""
+    tokens = re.findall(r'"[^"]*"|[{}]|[^\s{}:]+', re.sub(r"#.*", "", text))
+    root: Dict = {}
+    stack = [root]
+    key = None
+    for token in tokens:
+        if token == "{":
+            child: Dict = {}
+            stack[-1].setdefault(key, []).append(child)
+            stack.append(child)
+            key = None
+        elif token == "}":
+            stack.pop()
+        elif key is None:
+            key = token
+        else:
+            stack[-1].setdefault(key, []).append(token.strip('"'))
+            key = None
+    return root
+
+def _param(layer: Dict, section: str, name: str, default=None):
+    values = layer.get(section, [{}])[0].get(name)
+    return values[0] if values else default
+
+def export_caffe_classifier(prototxt: str, net, output: str):
+    """Convert a CaffeNet-style classifier (conv, pool, LRN, inner product, softmax) to ONNX.
+
+    `net` is the cv2.dnn network loaded from the same prototxt; weights are read from it.
+    """
+    spec = parse_prototxt(open(prototxt).read())
+    layers = spec.get("layers") or spec.get("layer") or []
+    nodes, initializers = [], []
+    blobs = {"data": "data"}
+
+    def weight(name: str, array: np.ndarray) -> str:
+        initializers.append(numpy_helper.from_array(array.astype(np.float32), name))
+        return name
+
+    for layer in layers:
+        name = layer["name"][0]
+        kind = layer["type"][0].upper().replace("_", "")
+        bottom, top = blobs[layer["bottom"][0]], layer["top"][0]
+        output_name = name
+        if kind == "CONVOLUTION":
+            kernel = int(_param(layer, "convolution_param", "kernel_size"))
+            stride = int(_param(layer, "convolution_param", "stride", 1))
+            pad = int(_param(layer, "convolution_param", "pad", 0))
+            group = int(_param(layer, "convolution_param", "group", 1))
+            inputs = [bottom, weight(f"{name}_W", net.getParam(name, 0))]
+            inputs.append(weight(f"{name}_b", net.getParam(name, 1).reshape(-1)))
+            nodes.append(helper.make_node(
+                "Conv", inputs, [output_name], name=name, kernel_shape=[kernel, kernel],
+                strides=[stride, stride], pads=[pad] * 4, group=group
+            ))
+        elif kind == "RELU":
+            nodes.append(helper.make_node("Relu", [bottom], [output_name], name=name))
+        elif kind == "POOLING":
+            kernel = int(_param(layer, "pooling_param", "kernel_size"))
+            stride = int(_param(layer, "pooling_param", "stride", 1))
+            pad = int(_param(layer, "pooling_param", "pad", 0))
+            op = "MaxPool" if _param(layer, "pooling_param", "pool", "MAX") == "MAX" else "AveragePool"
+            # Caffe rounds pooled sizes up
+            nodes.append(helper.make_node(
+                op, [bottom], [output_name], name=name, kernel_shape=[kernel, kernel],
+                strides=[stride, stride], pads=[pad] * 4, ceil_mode=1
+            ))
+        elif kind == "LRN":
+            nodes.append(helper.make_node(
+                "LRN", [bottom], [output_name], name=name,
+                size=int(_param(layer, "lrn_param", "local_size", 5)),
+                alpha=float(_param(layer, "lrn_param", "alpha", 1.0)),
+                beta=float(_param(layer, "lrn_param", "beta", 0.75)),
+                bias=float(_param(layer, "lrn_param", "k", 1.0))
+            ))
+        elif kind == "INNERPRODUCT":
+            nodes.append(helper.make_node("Flatten", [bottom], [f"{name}_flat"], axis=1))
+            weights = net.getParam(name, 0)
+            nodes.append(helper.make_node(
+                "Gemm", [f"{name}_flat", weight(f"{name}_W", weights.reshape(weights.shape[0], -1)),
+                         weight(f"{name}_b", net.getParam(name, 1).reshape(-1))],
+                [output_name], name=name, transB=1
+            ))
+        elif kind == "DROPOUT":
+            output_name = bottom
+        elif kind == "SOFTMAX":
+            nodes.append(helper.make_node("Softmax", [bottom], [output_name], name=name, axis=1))
+        else:
+            raise ValueError(f"Unsupported Caffe layer {name} of type {kind}")
+        blobs[top] = output_name
+
+    last = blobs[layers[-1]["top"][0]]
+    graph = helper.make_graph(
+        nodes, os.path.basename(output),
+        [helper.make_tensor_value_info("data", TensorProto.FLOAT, ["batch", 3, CAFFE_INPUT_SIZE, CAFFE_INPUT_SIZE])],
+        [helper.make_tensor_value_info(last, TensorProto.FLOAT, ["batch", None])],
+        initializers
+    )
+    _save(graph, output)
+
+# TensorFlow graph subset, enough to read OpenCV's text graph and frozen weights without TensorFlow
+
+def _tf_graph_def_class():
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+    F = descriptor_pb2.FieldDescriptorProto
+    O, R = F.LABEL_OPTIONAL, F.LABEL_REPEATED
+    file = descriptor_pb2.FileDescriptorProto(name="tf_graph_subset.proto", package="tfsubset", syntax="proto3")
+    dtype = file.enum_type.add(name="DataType")
+    for name, number in (("DT_INVALID", 0), ("DT_FLOAT", 1), ("DT_DOUBLE", 2), ("DT_INT32", 3), ("DT_UINT8", 4),
+                         ("DT_INT16", 5), ("DT_INT8", 6), ("DT_STRING", 7), ("DT_INT64", 9), ("DT_BOOL", 10),
+                         ("DT_QINT8", 11), ("DT_QUINT8", 12), ("DT_QINT32", 13), ("DT_HALF", 19)):
+        dtype.value.add(name=name, number=number)
+
+    def message(name, fields, parent=None):
+        msg = (parent.nested_type if parent else file.message_type).add(name=name)
+        for field_name, number, kind, label, type_name in fields:
+            field = msg.field.add(name=field_name, number=number, type=kind, label=label)
+            if type_name:
+                field.type_name = type_name
+        return msg
+
+    shape = message("TensorShapeProto", [("dim", 2, F.TYPE_MESSAGE, R, ".tfsubset.TensorShapeProto.Dim")])
+    message("Dim", [("size", 1, F.TYPE_INT64, O, None), ("name", 2, F.TYPE_STRING, O, None)], parent=shape)
+    message("TensorProto", [
+        ("dtype", 1, F.TYPE_ENUM, O, ".tfsubset.DataType"),
+        ("tensor_shape", 2, F.TYPE_MESSAGE, O, ".tfsubset.TensorShapeProto"),
+        ("tensor_content", 4, F.TYPE_BYTES, O, None), ("float_val", 5, F.TYPE_FLOAT, R, None),
+        ("int_val", 7, F.TYPE_INT32, R, None), ("int64_val", 10, F.TYPE_INT64, R, None),
+    ])
+    message("ListValue", [("s", 2, F.TYPE_BYTES, R, None), ("i", 3, F.TYPE_INT64, R, None),
+                          ("f", 4, F.TYPE_FLOAT, R, None)])
+    message("AttrValue", [
+        ("list", 1, F.TYPE_MESSAGE, O, ".tfsubset.ListValue"), ("s", 2, F.TYPE_BYTES, O, None),
+        ("i", 3, F.TYPE_INT64, O, None), ("f", 4, F.TYPE_FLOAT, O, None), ("b", 5, F.TYPE_BOOL, O, None),
+        ("type", 6, F.TYPE_ENUM, O, ".tfsubset.DataType"),
+        ("tensor", 8, F.TYPE_MESSAGE, O, ".tfsubset.TensorProto"),
+    ])
+    node = message("NodeDef", [
+        ("name", 1, F.TYPE_STRING, O, None), ("op", 2, F.TYPE_STRING, O, None),
+        ("input", 3, F.TYPE_STRING, R, None), ("attr", 5, F.TYPE_MESSAGE, R, ".tfsubset.NodeDef.AttrEntry"),
+    ])
+    entry = message("AttrEntry", [("key", 1, F.TYPE_STRING, O, None),
+                                  ("value", 2, F.TYPE_MESSAGE, O, ".tfsubset.AttrValue")], parent=node)
+    entry.options.map_entry = True
+    message("FunctionDefLibrary", [])
+    message("GraphDef", [("node", 1, F.TYPE_MESSAGE, R, ".tfsubset.NodeDef"),
+                         ("library", 2, F.TYPE_MESSAGE, O, ".tfsubset.FunctionDefLibrary")])
+
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file)
+    return message_factory.GetMessageClass(pool.FindMessageTypeByName("tfsubset.GraphDef"))
+
+TF_DTYPES = {1: np.float32, 3: np.int32, 4: np.uint8, 9: np.int64, 12: np.uint8}
+
+def _tf_tensor(tensor) -> np.ndarray:
+    dtype = TF_DTYPES[tensor.dtype]
+    shape = [dim.size for dim in tensor.tensor_shape.dim]
+    if tensor.tensor_content:
+        return np.frombuffer(tensor.tensor_content, dtype=dtype).reshape(shape)
+    values = np.array(tensor.float_val or tensor.int_val or tensor.int64_val, dtype=dtype)
+    if values.size == int(np.prod(shape)):
+        return values.reshape(shape)
+    return np.broadcast_to(values, shape).copy()
+
+class _TfConstants:
+    """Resolve constant inputs from the text graph or the frozen graph, dequantizing uint8 weights."""
+
+    def __init__(self, text_nodes, frozen_nodes):
+        self.text_nodes = text_nodes
+        self.frozen_nodes = frozen_nodes
+
+    def get(self, name: str) -> Optional[np.ndarray]:
+        name = name.split(":")[0]
+        node = self.frozen_nodes.get(name)
+        if node is None:
+            node = self.text_nodes.get(name)
+            if node is None or node.op != "Const":
+                return None
+        if node.op == "Const":
+            return _tf_tensor(node.attr["value"].tensor)
+        if node.op == "Dequantize":
+            # MIN_FIRST over the full uint8 range, with the minimum rounded onto the quantization grid
+            values, low, high = (self.get(name).astype(np.float32) for name in node.input)
+            scale = (high - low) / 255.0
+            return (np.round(low / scale) * scale + values * scale).astype(np.float32)
+        return None
+
+def _face_priors(frozen_graph: str, text_graph: str) -> np.ndarray:
+    """Prior boxes and variances for the 300x300 input, as computed by cv2.dnn's PriorBox layers."""
+    net = cv2.dnn.readNet(frozen_graph, text_graph)
+    net.setInput(np.zeros((1, 3, FACE_INPUT_SIZE, FACE_INPUT_SIZE), np.float32))
+    return net.forward("mbox_priorbox")[0].reshape(2, -1, 4)
+
+def export_face_detector(text_graph: str, frozen_graph: str, output: str):
+    """Convert OpenCV's TensorFlow SSD face detector to ONNX with box decoding and NMS included."""
+    GraphDef = _tf_graph_def_class()
+    from google.protobuf import text_format
+
+    text = GraphDef()
+    text_format.Parse(open(text_graph).read(), text, allow_unknown_field=True)
+    frozen = GraphDef()
+    with open(frozen_graph, "rb") as f:
+        frozen.ParseFromString(f.read())
+    constants = _TfConstants({n.name: n for n in text.node}, {n.name: n for n in frozen.node})
+
+    nodes, initializers = [], []
+    rank: Dict[str, int] = {"data": 4}
+    # SpaceToBatchND outputs awaiting their convolution, with the block shape and paddings
+    space_to_batch: Dict[str, tuple] = {}
+
+    def const(name: str, array: np.ndarray) -> str:
+        initializers.append(numpy_helper.from_array(array, name))
+        return name
+
+    def channel_const(name: str, array: np.ndarray) -> str:
+        array = array.astype(np.float32)
+        return const(name, array.reshape(-1, 1, 1) if array.ndim == 1 else array)
+
+    def ref(name: str) -> str:
+        return name.split(":")[0]
+
+    detection = None
+    for node in text.node:
+        name, op = node.name, node.op
+        inputs = [ref(i) for i in node.input]
+        attr = node.attr
+        if op in ("Placeholder", "Const", "PriorBox"):
+            continue
+        if op == "FusedBatchNorm":
+            params = [const(f"{name}/{p}", constants.get(i).reshape(-1).astype(np.float32))
+                      for p, i in zip(("scale", "offset", "mean", "variance"), inputs[1:])]
+            nodes.append(helper.make_node("BatchNormalization", [inputs[0]] + params, [name],
+                                          epsilon=attr["epsilon"].f))
+        elif op in ("Mul", "Add", "BiasAdd"):
+            onnx_op = "Mul" if op == "Mul" else "Add"
+            value = constants.get(inputs[1])
+            second = inputs[1] if value is None else channel_const(f"{name}/const", value)
+            nodes.append(helper.make_node(onnx_op, [inputs[0], second], [name]))
+        elif op == "Relu":
+            nodes.append(helper.make_node("Relu", inputs[:1], [name]))
+        elif op == "SpaceToBatchND":
+            block = constants.get(inputs[1]).reshape(-1)
+            paddings = constants.get(inputs[2]).reshape(2, 2)
+            if (block == 1).all():
+                pads = [0, 0, paddings[0, 0], paddings[1, 0], 0, 0, paddings[0, 1], paddings[1, 1]]
+                nodes.append(helper.make_node("Pad", [inputs[0], const(f"{name}/pads", np.array(pads, np.int64))],
+                                              [name]))
+            else:
+                # A dilated convolution split by TensorFlow into SpaceToBatchND, Conv2D and BatchToSpaceND
+                space_to_batch[name] = (inputs[0], block, paddings)
+        elif op == "BatchToSpaceND":
+            if len(inputs) < 3:
+                nodes.append(helper.make_node("Identity", inputs[:1], [name]))
+            else:
+                crops = constants.get(inputs[2]).reshape(2, 2)
+                starts = np.array([crops[0, 0], crops[1, 0]], np.int64)
+                ends = np.array([-crops[0, 1] or np.iinfo(np.int64).max, -crops[1, 1] or np.iinfo(np.int64).max],
+                                np.int64)
+                nodes.append(helper.make_node("Slice", [
+                    inputs[0], const(f"{name}/starts", starts), const(f"{name}/ends", ends),
+                    const(f"{name}/axes", np.array([2, 3], np.int64))
+                ], [name]))
+        elif op == "Conv2D":
+            weights = constants.get(inputs[1]).transpose(3, 2, 0, 1).astype(np.float32)
+            strides = list(attr["strides"].list.i)[1:3]
+            dilations = list(attr["dilations"].list.i)[1:3]
+            source = inputs[0]
+            options = {"auto_pad": "SAME_UPPER" if attr["padding"].s == b"SAME" else "VALID"}
+            if source in space_to_batch:
+                source, block, paddings = space_to_batch[source]
+                dilations = [int(b) for b in block]
+                options = {"pads": [int(paddings[0, 0]), int(paddings[1, 0]), int(paddings[0, 1]), int(paddings[1, 1])]}
+            nodes.append(helper.make_node(
+                "Conv", [source, const(f"{name}/weights", weights)], [name],
+                kernel_shape=list(weights.shape[2:]), strides=strides, dilations=dilations, **options
+            ))
+        elif op == "MaxPool":
+            nodes.append(helper.make_node(
+                "MaxPool", inputs[:1], [name], kernel_shape=list(attr["ksize"].list.i)[1:3],
+                strides=list(attr["strides"].list.i)[1:3],
+                auto_pad="SAME_UPPER" if attr["padding"].s == b"SAME" else "VALID"
+            ))
+        elif op == "L2Normalize":
+            nodes.append(helper.make_node("LpNormalization", inputs[:1], [name], axis=1, p=2))
+        elif op == "Flatten":
+            source = inputs[0]
+            if rank.get(source) == 4:
+                # TensorFlow flattens in NHWC order
+                nodes.append(helper.make_node("Transpose", [source], [f"{name}/nhwc"], perm=[0, 2, 3, 1]))
+                source = f"{name}/nhwc"
+            nodes.append(helper.make_node("Flatten", [source], [name], axis=1))
+            rank[name] = 2
+        elif op == "ConcatV2":
+            if any(i.startswith("PriorBox") for i in inputs):
+                continue
+            nodes.append(helper.make_node("Concat", inputs[:-1], [name], axis=int(constants.get(inputs[-1]))))
+            rank[name] = rank.get(inputs[0], 2)
+        elif op == "Reshape":
+            shape = constants.get(inputs[1]).astype(np.int64)
+            nodes.append(helper.make_node("Reshape", [inputs[0], const(f"{name}/shape", shape)], [name]))
+            rank[name] = len(shape)
+        elif op == "Softmax":
+            nodes.append(helper.make_node("Softmax", inputs[:1], [name], axis=-1))
+            rank[name] = rank.get(inputs[0], 2)
+        elif op == "DetectionOutput":
+            detection = (name, inputs, attr)
+            continue
+        else:
+            raise ValueError(f"Unsupported TensorFlow op {op} in {name}")
+        rank.setdefault(name, rank.get(inputs[0], 4) if inputs else 4)
+
+    if detection is None:
+        raise ValueError("The face detector graph has no DetectionOutput node")
+    name, (loc, conf, _), attr = detection
+    priors, variances = _face_priors(frozen_graph, text_graph)
+    nodes.extend(_detection_output_nodes(
+        name, loc, conf, priors, variances, const,
+        keep_top_k=attr["keep_top_k"].i, nms_threshold=attr["nms_threshold"].f,
+        confidence_threshold=attr["confidence_threshold"].f
+    ))
+
+    graph = helper.make_graph(
+        nodes, os.path.basename(output),
+        [helper.make_tensor_value_info("data", TensorProto.FLOAT, ["batch", 3, FACE_INPUT_SIZE, FACE_INPUT_SIZE])],
+        [helper.make_tensor_value_info(name, TensorProto.FLOAT, [1, 1, "detections", 7])],
+        initializers
+    )
+    _save(graph, output)
+
+def _detection_output_nodes(name: str, loc: str, conf: str, priors: np.ndarray, variances: np.ndarray, const,
+                            keep_top_k: int, nms_threshold: float, confidence_threshold: float) -> List:
+    """Decode CENTER_SIZE boxes against constant priors and keep the best face boxes per image.
+
+    Rows match cv2.dnn's DetectionOutput: [image_id, label, confidence, x1, y1, x2, y2].
+    """
+    prior_size = priors[:, 2:] - priors[:, :2]
+    prior_center = (priors[:, :2] + priors[:, 2:]) / 2
+    center_scale = const(f"{name}/center_scale", (variances[:, :2] * prior_size).astype(np.float32))
+    center_offset = const(f"{name}/center_offset", prior_center.astype(np.float32))
+    size_variance = const(f"{name}/size_variance", variances[:, 2:].astype(np.float32))
+    prior_sizes = const(f"{name}/prior_size", prior_size.astype(np.float32))
+    half = const(f"{name}/half", np.array(0.5, np.float32))
+    return [
+        helper.make_node("Reshape", [loc, const(f"{name}/loc_shape", np.array([0, -1, 4], np.int64))], [f"{name}/loc"]),
+        helper.make_node("Split", [f"{name}/loc", const(f"{name}/split", np.array([2, 2], np.int64))],
+                         [f"{name}/loc_center", f"{name}/loc_size"], axis=2),
+        helper.make_node("Mul", [f"{name}/loc_center", center_scale], [f"{name}/center_delta"]),
+        helper.make_node("Add", [f"{name}/center_delta", center_offset], [f"{name}/center"]),
+        helper.make_node("Mul", [f"{name}/loc_size", size_variance], [f"{name}/log_size"]),
+        helper.make_node("Exp", [f"{name}/log_size"], [f"{name}/size_scale"]),
+        helper.make_node("Mul", [f"{name}/size_scale", prior_sizes], [f"{name}/size"]),
+        helper.make_node("Mul", [f"{name}/size", half], [f"{name}/half_size"]),
+        helper.make_node("Sub", [f"{name}/center", f"{name}/half_size"], [f"{name}/top_left"]),
+        helper.make_node("Add", [f"{name}/center", f"{name}/half_size"], [f"{name}/bottom_right"]),
+        helper.make_node("Concat", [f"{name}/top_left", f"{name}/bottom_right"], [f"{name}/boxes"], axis=2),
+        # Face scores are the second of the two class probabilities
+        helper.make_node("Reshape", [conf, const(f"{name}/conf_shape", np.array([0, -1, 2], np.int64))],
+                         [f"{name}/conf"]),
+        helper.make_node("Gather", [f"{name}/conf", const(f"{name}/face_class", np.array(1, np.int64))],
+                         [f"{name}/scores"], axis=2),
+        helper.make_node("Unsqueeze", [f"{name}/scores", const(f"{name}/class_axis", np.array([1], np.int64))],
+                         [f"{name}/class_scores"]),
+        helper.make_node("NonMaxSuppression", [
+            f"{name}/boxes", f"{name}/class_scores",
+            const(f"{name}/keep_top_k", np.array([keep_top_k], np.int64)),
+            const(f"{name}/nms_threshold", np.array([nms_threshold], np.float32)),
+            const(f"{name}/confidence_threshold", np.array([confidence_threshold], np.float32)),
+        ], [f"{name}/selected"]),
+        helper.make_node("Gather", [f"{name}/selected", const(f"{name}/box_index", np.array([0, 2], np.int64))],
+                         [f"{name}/index"], axis=1),
+        helper.make_node("GatherND", [f"{name}/boxes", f"{name}/index"], [f"{name}/kept_boxes"]),
+        helper.make_node("GatherND", [f"{name}/scores", f"{name}/index"], [f"{name}/kept_scores"]),
+        helper.make_node("Unsqueeze", [f"{name}/kept_scores", f"{name}/class_axis"], [f"{name}/confidence"]),
+        helper.make_node("Gather", [f"{name}/selected", const(f"{name}/image_column", np.array([0], np.int64))],
+                         [f"{name}/image_index"], axis=1),
+        helper.make_node("Cast", [f"{name}/image_index"], [f"{name}/image_id"], to=TensorProto.FLOAT),
+        helper.make_node("Gather", [f"{name}/selected", const(f"{name}/class_column", np.array([1], np.int64))],
+                         [f"{name}/class_index"], axis=1),
+        helper.make_node("Cast", [f"{name}/class_index"], [f"{name}/class_float"], to=TensorProto.FLOAT),
+        # NMS ran on the face class alone, which is label 1 in cv2.dnn's output
+        helper.make_node("Add", [f"{name}/class_float", const(f"{name}/one", np.array(1, np.float32))],
+                         [f"{name}/label"]),
+        helper.make_node("Concat", [f"{name}/image_id", f"{name}/label", f"{name}/confidence", f"{name}/kept_boxes"],
+                         [f"{name}/rows"], axis=1),
+        helper.make_node("Unsqueeze", [f"{name}/rows", const(f"{name}/output_axes", np.array([0, 1], np.int64))],
+                         [name]),
+    ]
+
+def _save(graph, output: str):
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", OPSET)], producer_name="export_age_onnx")
+    # Pin the IR version so older onnxruntime releases can load the file
+    model.ir_version = IR_VERSION
+    onnx.checker.check_model(model)
+    onnx.save(model, output)
+    print(f"wrote {output}")
+
+def quantize_models():
+    """Write INT8 dynamically quantized copies of every available ONNX export."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    for model in (faceOnnxModel, ageOnnxModel, genderOnnxModel):
+        if not os.path.exists(model):
+            print(f"skipping {model}: not exported")
+            continue
+        output = onnx_model_path(model, quantized=True)
+        quantize_dynamic(model, output, weight_type=QuantType.QInt8)
+        print(f"wrote {output}")
+
+def export_models(face: bool = True, age: bool = True, gender: bool = True):
+    """Export every requested network whose source model is present in models/."""
+    if face:
+        if os.path.exists(faceModel):
+            export_face_detector(faceProto, faceModel, faceOnnxModel)
+        else:
+            print(f"skipping face detector: {faceModel} not found")
+    for wanted, label, proto, model, output in ((age, "age", ageProto, ageModel, ageOnnxModel),
+                                                (gender, "gender", genderProto, genderModel, genderOnnxModel)):
+        if not wanted:
+            continue
+        if not os.path.exists(model):
+            print(f"skipping {label} network: {model} not found")
+            continue
+        export_caffe_classifier(proto, cv2.dnn.readNet(model, proto), output)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=("face", "age", "gender"), action="append",
+                        help="export only these networks (repeatable)")
+    parser.add_argument("--quantize", action="store_true", help="also write INT8 quantized copies")
+    args = parser.parse_args()
+
+    only = set(args.only or ("face", "age", "gender"))
+    export_models("face" in only, "age" in only, "gender" in only)
+    if args.quantize:
+        quantize_models()
+
+if __name__ == "__main__":
+    main()
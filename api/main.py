@@ -1,118 +1,99 @@
-from fastapi import FastAPI, UploadFile, File
-from Agedetect import *
-from HandDetector import *
-from LoanAnalyzer import *
-from Medicaldocanalyzer import *
+from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from JobQueue import jobs_router, registered_job_types, shutdown_job_queue
+from LLMCalls import llm_metrics
+from Uploads import MAX_REQUEST_BYTES
+from fastapi.responses import JSONResponse, PlainTextResponse
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional
+import importlib
+import os
 
-app = FastAPI()
+# Each service is a module exposing a `router`, a `warm_up()`, a `WARM_UP_BY_DEFAULT` flag
+# and optionally a `shutdown()`.
+# Only the selected modules are imported, so an OCR replica never loads the age or accent models.
+SERVICE_MODULES = {
+    "age": "Agedetect",
+    "accent": "AccentAnalyzer",
+    "ocr": "HandDetector",
+    "loan": "LoanAnalyzer",
+    "medical": "Medicaldocanalyzer",
+}
 
-@app.post("/detect-age/")
-async def detect_age_from_image(file: UploadFile = File(...)):
-    # Read and convert the uploaded image
-    contents = await file.read()
-    image = Image.open(io.BytesIO(contents))
-    image_array = np.array(image)
-    
-    # Detect age
-    age = detect_age(image_array)
-    
-    if age is None:
-        return {"error": "No face detected in the image"}
-    
-    return {"age": age}
+# Comma-separated services to serve, e.g. "ocr" or "loan,medical"; "all" serves every service
+API_SERVICES = os.getenv("API_SERVICES", "all")
+# Services with slow model loads (accent) warm up before serving traffic and the rest load on
+# first use. API_WARMUP overrides that with the services to warm, e.g. "age,accent", "all" or "none".
+API_WARMUP = os.getenv("API_WARMUP")
 
-@app.post("/detect-text/", response_model=DetectionResponse)
-async def process_file(file: UploadFile = File(...)):
-    """Process uploaded file (PDF or image) and return detected text with translation."""
-    try:
-        content = await file.read()
-        file_extension = Path(file.filename).suffix.lower()
-        
-        german_text = ""
-        detection_time = 0
-        all_text_annotations = []
+def parse_services(value: str, setting: str = "API_SERVICES") -> List[str]:
+    """Turn an API_SERVICES-style value into service names, rejecting unknown ones."""
+    names = [name.strip().lower() for name in value.split(",") if name.strip()]
+    if not names or "all" in names:
+        return list(SERVICE_MODULES)
+    unknown = [name for name in names if name not in SERVICE_MODULES]
+    if unknown:
+        raise ValueError(
+            f"Unknown {setting} {', '.join(unknown)}; choose from {', '.join(SERVICE_MODULES)} or all"
+        )
+    return list(dict.fromkeys(names))
 
-        if file_extension == '.pdf':
-            # Handle PDF
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_pdf:
-                temp_pdf.write(content)
-                temp_pdf.flush()
-                
-                images = convert_pdf_to_images(temp_pdf.name)
-                for image in images:
-                    text, time_taken, annotations = await detect_text(image)
-                    if text:
-                        german_text += text + "\n"
-                        if annotations:
-                            all_text_annotations.extend(annotations)
-                    detection_time += time_taken
-                
-                os.unlink(temp_pdf.name)
-        else:
-            # Handle image
-            german_text, detection_time, all_text_annotations = await detect_text(content)
+def services_to_warm(modules: Dict[str, ModuleType], value: Optional[str] = API_WARMUP) -> List[str]:
+    """Pick the served services to warm up, by API_WARMUP or else each service's default."""
+    if value is None:
+        return [name for name, module in modules.items() if module.WARM_UP_BY_DEFAULT]
+    value = value.strip().lower()
+    if value in ("", "0", "false", "no", "none"):
+        return []
+    if value in ("1", "true", "yes"):
+        value = "all"
+    return [name for name in parse_services(value, "API_WARMUP") if name in modules]
 
-        if not german_text:
-            raise HTTPException(status_code=400, detail="No text detected in the file")
+def create_app(services: Optional[Iterable[str]] = None) -> FastAPI:
+    """Build an app serving the given services, or those named by API_SERVICES.
 
-        # Calculate confidence and translate text
-        confidence_level = compute_overall_confidence(all_text_annotations)
-        translated_text = await translate_text(german_text)
+    Run a single service with e.g. `API_SERVICES=ocr uvicorn main:app`.
+    """
+    names = parse_services(",".join(services)) if services is not None else parse_services(API_SERVICES)
+    modules = {name: importlib.import_module(SERVICE_MODULES[name]) for name in names}
+    warm = services_to_warm(modules)
 
-        return DetectionResponse(
-            original_text=german_text,
-            translated_text=translated_text,
-            detection_time=round(detection_time, 1),
-            confidence_level=round(confidence_level * 100, 2)
-        )
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        for name in warm:
+            modules[name].warm_up()
+        yield
+        await shutdown_job_queue()
+        for module in modules.values():
+            if hasattr(module, "shutdown"):
+                module.shutdown()
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-@app.post("/api/loan-summary", response_model=LoanSummaryResponse)
-async def analyze_loan_documents(files: List[UploadFile] = File(...)):
-    """Endpoint to process loan application documents and return a structured summary."""
-    try:
-        # Extract text from uploaded PDFs
-        extracted_text = extract_text_from_pdfs(files)
-        
-        # Generate loan summary based on extracted text
-        loan_summary = generate_loan_summary(extracted_text)
-        
-        # Return the summary and document count in the response
-        return LoanSummaryResponse(
-            summary=loan_summary,
-            document_count=len(files)
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing loan documents: {str(e)}")
-@app.post("/api/analyze-medical-documents/", response_model=AnalysisResponse)
-async def analyze_medical_documents(files: List[UploadFile] = File(...)):
-    """
-    Endpoint to analyze medical documents and generate analysis.
-    
-    Parameters:
-    - files: List of PDF files containing medical documents
-    
-    Returns:
-    - JSON object containing the summary, template analysis, and number of processed documents
-    """
-    if not files:
-        raise HTTPException(status_code=400, detail="No files provided")
-        
-    for file in files:
-        if not file.filename.lower().endswith('.pdf'):
-            raise HTTPException(status_code=400, detail="Only PDF files are supported")
-    
-    # Extract text from PDFs
-    extracted_text = extract_text_from_pdfs(files)
-    
-    # Generate summary and template analysis
-    summary = process_summary(extracted_text)
-    template_analysis = process_template(extracted_text)
-    
-    return AnalysisResponse(
-        summary=summary,
-        template_analysis=template_analysis,
-        document_count=len(files)
-    )
+    app = FastAPI(lifespan=lifespan)
+
+    @app.middleware("http")
+    async def limit_request_size(request, call_next):
+        """Reject oversized request bodies before they are parsed and spooled."""
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_REQUEST_BYTES:
+            return JSONResponse(status_code=413, content={"detail": "Request body too large"})
+        return await call_next(request)
+
+    for module in modules.values():
+        app.include_router(module.router)
+    # Job types register on import, so this is only true if a selected service runs background jobs
+    if registered_job_types():
+        app.include_router(jobs_router)
+
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint."""
+        return {"status": "healthy", "services": names}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        """LLM call counts, token usage and latency in Prometheus text format."""
+        return PlainTextResponse(llm_metrics.render(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+app = create_app()
@@ -0,0 +1,80 @@
+"""Check that the ONNX exports from export_age_onnx.py match cv2.dnn on the same blobs.
+
+Each network is exported into a temporary directory; tests skip when its source model is
+not in models/ or onnx/onnxruntime are not installed. Run from api/ with `python -m pytest tests`.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, API_DIR)
+os.chdir(API_DIR)
+
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("onnx")
+ort = pytest.importorskip("onnxruntime")
+
+import Agedetect  # noqa: E402
+import export_age_onnx  # noqa: E402
+
+def _require(*paths):
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        pytest.skip(f"model not found: {', '.join(missing)}")
+
+def _session(path):
+    return ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+
+def _assert_same_detections(actual, expected, atol=1e-4):
+    """Compare [1, 1, N, 7] detections as sets of rows, since near-equal scores may swap order."""
+    actual, expected = actual[0, 0], expected[0, 0]
+    assert actual.shape == expected.shape
+    distance = np.abs(actual[:, None, :] - expected[None, :, :]).max(axis=2)
+    assert (distance.min(axis=0) <= atol).all()
+    assert (distance.min(axis=1) <= atol).all()
+
+def test_face_detector_matches_opencv(tmp_path):
+    _require(Agedetect.faceModel, Agedetect.faceProto)
+    output = str(tmp_path / "face.onnx")
+    export_age_onnx.export_face_detector(Agedetect.faceProto, Agedetect.faceModel, output)
+    net = cv2.dnn.readNet(Agedetect.faceModel, Agedetect.faceProto)
+    session = _session(output)
+
+    rng = np.random.default_rng(0)
+    images = [(rng.random((240, 320, 3)) * 255).astype(np.uint8) for _ in range(2)]
+    for image in images:
+        blob = cv2.dnn.blobFromImage(image, 1.0, (300, 300), [104, 117, 123], True, False)
+        net.setInput(blob)
+        _assert_same_detections(session.run(None, {"data": blob})[0], net.forward())
+
+    # Unlike cv2.dnn, the export runs the detector over a whole batch in one forward
+    blob = cv2.dnn.blobFromImages(images, 1.0, (300, 300), [104, 117, 123], True, False)
+    batched = session.run(None, {"data": blob})[0][0, 0]
+    assert set(batched[:, 0]) == {0.0, 1.0}
+
+@pytest.mark.parametrize("model, proto", [
+    (Agedetect.ageModel, Agedetect.ageProto),
+    (Agedetect.genderModel, Agedetect.genderProto),
+])
+def test_classifier_matches_opencv(tmp_path, model, proto):
+    _require(model, proto)
+    output = str(tmp_path / "classifier.onnx")
+    net = cv2.dnn.readNet(model, proto)
+    export_age_onnx.export_caffe_classifier(proto, net, output)
+
+    rng = np.random.default_rng(0)
+    crops = [(rng.random((227, 227, 3)) * 255).astype(np.uint8) for _ in range(3)]
+    blob = cv2.dnn.blobFromImages(crops, 1.0, (227, 227), Agedetect.MODEL_MEAN_VALUES, swapRB=False)
+    net.setInput(blob)
+    expected = net.forward()
+    actual = _session(output).run(None, {"data": blob})[0]
+    np.testing.assert_allclose(actual, expected, atol=1e-4)
+    assert (actual.argmax(axis=1) == expected.argmax(axis=1)).all()
+
+def test_missing_export_raises(tmp_path, monkeypatch):
+    monkeypatch.setattr(Agedetect, "faceOnnxModel", str(tmp_path / "missing.onnx"))
+    with pytest.raises(FileNotFoundError, match="export_age_onnx.py"):
+        Agedetect.AgeNetworks(backend="onnxruntime")
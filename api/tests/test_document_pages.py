@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DocumentPages import DocumentPage, clean_pages, dedupe_pages  # noqa: E402
+
+def _page(number, lines, document=0):
+    return DocumentPage(filename="statement.pdf", number=number, lines=lines, document=document)
+
+def test_pages_differing_only_in_figures_are_kept():
+    pages = [
+        _page(1, ["Account summary", "Balance: $12,400.00", "Monthly income: $5,200"]),
+        _page(2, ["Account summary", "Balance: $9,870.15", "Monthly income: $6,100"]),
+    ]
+    assert [page.number for page in dedupe_pages(pages)] == [1, 2]
+
+def test_repeated_upload_is_dropped():
+    lines = ["Loan agreement", "Principal: $250,000", "Page 1 of 1"]
+    pages = [_page(1, lines, document=0), _page(1, list(lines), document=1)]
+    assert [page.document for page in dedupe_pages(pages)] == [0]
+
+def test_footers_with_page_numbers_are_stripped():
+    payees = ["Grocer", "Utility", "Rent", "Payroll", "Insurer", "Pharmacy", "Garage", "Airline", "Hotel"]
+    pages = [
+        _page(n, ["Acme Bank", *(f"{payee}: ${n}0.00" for payee in payees[3 * (n - 1):3 * n]), f"Page {n} of 3"])
+        for n in (1, 2, 3)
+    ]
+    cleaned = clean_pages(pages)
+    assert [page.lines for page in cleaned] == [
+        ["Acme Bank", "Grocer: $10.00", "Utility: $10.00", "Rent: $10.00", "Page 1 of 3"],
+        ["Payroll: $20.00", "Insurer: $20.00", "Pharmacy: $20.00"],
+        ["Garage: $30.00", "Airline: $30.00", "Hotel: $30.00"],
+    ]
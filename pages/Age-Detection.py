@@ -2,6 +2,9 @@ import streamlit as st
 import cv2
 import numpy as np
 from PIL import Image
+import tempfile
+import time
+from pathlib import Path
 
 def ui():
     st.markdown(
@@ -75,6 +78,14 @@ MODEL_MEAN_VALUES = (78.4263377603, 87.7689143744, 114.895847746)
 ageList = ['(0-2)', '(4-6)', '(8-12)', '(15-20)', '(25-32)', '(38-43)', '(48-53)', '(60-100)']
 genderList = ['Male', 'Female']
 
+# Video tracking settings
+DETECT_EVERY_N_FRAMES = 5      # run the face detector on every Nth frame, track in between
+TRACK_MAX_SAMPLES = 5          # classify each track at most this many times and average the results
+TRACK_MATCH_IOU = 0.3          # minimum overlap to match a detection to an existing track
+TRACK_MIN_SCORE = 0.5          # minimum template-match score to keep following a face
+TRACK_TEMPLATE_SIZE = 32       # faces are downscaled to about this size before template matching
+DETECTION_MAX_SIDE = 1024      # photos are decoded at most this large for detection and display
+
 # Load networks
 faceNet = cv2.dnn.readNet(faceModel, faceProto)
 ageNet = cv2.dnn.readNet(ageModel, ageProto)
@@ -100,35 +111,43 @@ def highlightFace(net, frame, conf_threshold=0.7):
             cv2.rectangle(frameOpencvDnn, (x1, y1), (x2, y2), (0, 255, 0), int(round(frameHeight/150)), 8)
     return frameOpencvDnn, faceBoxes
 
-def detect_age_gender(image):
-    # Ensure image is in RGB format
-    if image.shape[2] == 4:
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    elif len(image.shape) == 2:
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+def detect_age_gender(source):
+    # Decode a downscaled copy for detection and display; JPEGs use draft mode so the
+    # full-resolution pixels are never decoded here
+    with Image.open(source) as image:
+        fullWidth, fullHeight = image.size
+        image.thumbnail((DETECTION_MAX_SIDE, DETECTION_MAX_SIDE))
+        small = np.array(image.convert("RGB"))
     
     padding = 20
-    resultImg, faceBoxes = highlightFace(faceNet, image)
+    resultImg, faceBoxes = highlightFace(faceNet, small)
     
     if not faceBoxes:
         return resultImg, []
     
-    results = []
-    for faceBox in faceBoxes:
-        face = image[max(0, faceBox[1]-padding):
-                     min(faceBox[3]+padding, image.shape[0]-1),
-                     max(0, faceBox[0]-padding):
-                     min(faceBox[2]+padding, image.shape[1]-1)]
+    # Map boxes back and crop only the face regions at full resolution
+    scaleX, scaleY = fullWidth / small.shape[1], fullHeight / small.shape[0]
+    source.seek(0)
+    with Image.open(source) as image:
+        faces = [np.asarray(image.crop((max(0, int(x1*scaleX)-padding),
+                                        max(0, int(y1*scaleY)-padding),
+                                        min(int(x2*scaleX)+padding, fullWidth-1),
+                                        min(int(y2*scaleY)+padding, fullHeight-1))).convert("RGB"))
+                 for x1, y1, x2, y2 in faceBoxes]
 
-        blob = cv2.dnn.blobFromImage(face, 1.0, (227, 227), MODEL_MEAN_VALUES, swapRB=False)
-        
-        genderNet.setInput(blob)
-        genderPreds = genderNet.forward()
-        gender = genderList[genderPreds[0].argmax()]
-        
-        ageNet.setInput(blob)
-        agePreds = ageNet.forward()
-        age = ageList[agePreds[0].argmax()]
+    # Classify all faces with one forward pass per network
+    blob = cv2.dnn.blobFromImages(faces, 1.0, (227, 227), MODEL_MEAN_VALUES, swapRB=False)
+    
+    genderNet.setInput(blob)
+    genderPreds = genderNet.forward()
+    
+    ageNet.setInput(blob)
+    agePreds = ageNet.forward()
+    
+    results = []
+    for faceBox, agePred, genderPred in zip(faceBoxes, agePreds, genderPreds):
+        gender = genderList[genderPred.argmax()]
+        age = ageList[agePred.argmax()]
         
         label = f'{age}'
         cv2.putText(resultImg, label, (faceBox[0], faceBox[1]-10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2, cv2.LINE_AA)
@@ -136,36 +155,210 @@ def detect_age_gender(image):
     
     return resultImg, results
 
+class FaceTrack:
+    """A face followed across frames with its averaged age and gender predictions."""
+
+    def __init__(self, track_id, box):
+        self.track_id = track_id
+        self.box = box
+        self.template = None
+        self.agePreds = np.zeros(len(ageList))
+        self.genderPreds = np.zeros(len(genderList))
+        self.samples = 0
+
+    def add_prediction(self, agePred, genderPred):
+        # Running mean of the class probabilities smooths flicker between samples
+        self.samples += 1
+        self.agePreds += (agePred - self.agePreds) / self.samples
+        self.genderPreds += (genderPred - self.genderPreds) / self.samples
+
+    @property
+    def label(self):
+        if not self.samples:
+            return "..."
+        return f'{genderList[self.genderPreds.argmax()]}, {ageList[self.agePreds.argmax()]}'
+
+def box_iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+class FaceTracker:
+    """Detect faces every few frames and follow them with template matching in between."""
+
+    def __init__(self, detect_every=DETECT_EVERY_N_FRAMES):
+        self.detect_every = detect_every
+        self.frame_index = 0
+        self.next_id = 0
+        self.tracks = []
+
+    def update(self, frame):
+        """Advance the tracker by one BGR frame and return the active tracks."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.frame_index % self.detect_every == 0:
+            self._detect(frame)
+        else:
+            self.tracks = [track for track in self.tracks if self._follow(track, gray)]
+        for track in self.tracks:
+            track.template = self._crop(gray, track.box)
+        self.frame_index += 1
+        return self.tracks
+
+    def _detect(self, frame):
+        frameHeight, frameWidth = frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(frame, 1.0, (300, 300), [104, 117, 123], True, False)
+        faceNet.setInput(blob)
+        detections = faceNet.forward()[0, 0]
+        detections = detections[detections[:, 2] > 0.7]
+        boxes = [
+            [max(0, int(x1 * frameWidth)), max(0, int(y1 * frameHeight)),
+             min(frameWidth, int(x2 * frameWidth)), min(frameHeight, int(y2 * frameHeight))]
+            for x1, y1, x2, y2 in detections[:, 3:7]
+        ]
+        boxes = [box for box in boxes if box[2] > box[0] and box[3] > box[1]]
+
+        tracks = []
+        unmatched = list(self.tracks)
+        for box in boxes:
+            best = max(unmatched, key=lambda track: box_iou(track.box, box), default=None)
+            if best is not None and box_iou(best.box, box) >= TRACK_MATCH_IOU:
+                unmatched.remove(best)
+                best.box = box
+                tracks.append(best)
+            else:
+                tracks.append(FaceTrack(self.next_id, box))
+                self.next_id += 1
+        self.tracks = tracks
+
+        # Only tracks that still need samples are classified, all in one batch per network
+        pending = [track for track in self.tracks if track.samples < TRACK_MAX_SAMPLES]
+        if pending:
+            agePreds, genderPreds = classify_faces(frame, [track.box for track in pending])
+            for track, agePred, genderPred in zip(pending, agePreds, genderPreds):
+                track.add_prediction(agePred, genderPred)
+
+    def _follow(self, track, gray):
+        if track.template is None or not track.template.size:
+            return False
+        x1, y1, x2, y2 = track.box
+        width, height = x2 - x1, y2 - y1
+        scale = min(1.0, TRACK_TEMPLATE_SIZE / max(width, height, 1))
+
+        # Search a window around the previous position, at reduced resolution
+        sx1, sy1 = max(0, x1 - width // 2), max(0, y1 - height // 2)
+        sx2, sy2 = min(gray.shape[1], x2 + width // 2), min(gray.shape[0], y2 + height // 2)
+        region = cv2.resize(gray[sy1:sy2, sx1:sx2], None, fx=scale, fy=scale)
+        template = cv2.resize(track.template, None, fx=scale, fy=scale)
+        if (template.shape[0] > region.shape[0] or template.shape[1] > region.shape[1]
+                or not template.size):
+            return False
+
+        scores = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, location = cv2.minMaxLoc(scores)
+        if score < TRACK_MIN_SCORE:
+            return False
+        nx1, ny1 = sx1 + int(location[0] / scale), sy1 + int(location[1] / scale)
+        track.box = [nx1, ny1, nx1 + width, ny1 + height]
+        return True
+
+    @staticmethod
+    def _crop(gray, box):
+        x1, y1, x2, y2 = box
+        return gray[max(0, y1):max(0, y2), max(0, x1):max(0, x2)]
+
+def classify_faces(frame, faceBoxes, padding=20):
+    """Return age and gender probabilities for all faces with one forward pass per network."""
+    faces = [frame[max(0, faceBox[1]-padding):
+                   min(faceBox[3]+padding, frame.shape[0]-1),
+                   max(0, faceBox[0]-padding):
+                   min(faceBox[2]+padding, frame.shape[1]-1)] for faceBox in faceBoxes]
+    blob = cv2.dnn.blobFromImages(faces, 1.0, (227, 227), MODEL_MEAN_VALUES, swapRB=False)
+
+    ageNet.setInput(blob)
+    agePreds = ageNet.forward()
+
+    genderNet.setInput(blob)
+    genderPreds = genderNet.forward()
+    return agePreds, genderPreds
+
+def process_video(source):
+    """Run tracked age and gender detection over a video file or webcam stream."""
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        st.error("Could not open the video source.")
+        return
+
+    frame_placeholder = st.empty()
+    stats_placeholder = st.empty()
+    tracker = FaceTracker()
+    start_time = time.perf_counter()
+    frame_count = 0
+
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+
+        tracks = tracker.update(frame)
+        thickness = int(round(frame.shape[0]/150))
+        for track in tracks:
+            x1, y1, x2, y2 = track.box
+            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), thickness, 8)
+            cv2.putText(frame, track.label, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2, cv2.LINE_AA)
+
+        frame_count += 1
+        fps = frame_count / (time.perf_counter() - start_time)
+        frame_placeholder.image(frame, channels="BGR", use_column_width=True)
+        stats_placeholder.write(f"{fps:.1f} fps, {len(tracks)} face(s) tracked")
+
+    capture.release()
+
 def main():
 
     col1,col2 = st.columns(2)
     
-    option = st.radio("Choose input method:", ("Upload Image", "Capture Image"))
+    option = st.radio("Choose input method:", ("Upload Image", "Capture Image", "Upload Video", "Webcam Stream"))
 
     if option == "Upload Image":
         
         process_uploaded_image()
     elif option == "Capture Image":
         process_captured_image()
+    elif option == "Upload Video":
+        process_uploaded_video()
+    elif option == "Webcam Stream":
+        process_webcam_stream()
 
     
 
 def process_uploaded_image():
     uploaded_file = st.file_uploader("Choose an image...", type=["jpg", "jpeg", "png"])
     if uploaded_file is not None:
-        image = Image.open(uploaded_file)
-        img_array = np.array(image)
-        process_image(img_array)
+        process_image(uploaded_file)
 
 def process_captured_image():
     captured_image = st.camera_input("Capture an image")
     if captured_image is not None:
-        image = Image.open(captured_image)
-        img_array = np.array(image)
-        process_image(img_array)
+        process_image(captured_image)
+
+def process_uploaded_video():
+    uploaded_file = st.file_uploader("Choose a video...", type=["mp4", "avi", "mov", "mkv"])
+    if uploaded_file is not None:
+        # OpenCV needs a file path to decode video
+        with tempfile.NamedTemporaryFile(suffix=Path(uploaded_file.name).suffix) as tmp_file:
+            tmp_file.write(uploaded_file.getvalue())
+            tmp_file.flush()
+            process_video(tmp_file.name)
+
+def process_webcam_stream():
+    # Unticking the box reruns the script, which stops the capture loop
+    if st.checkbox("Start webcam"):
+        process_video(0)
 
-def process_image(img_array):
-    result_img, results = detect_age_gender(img_array)
+def process_image(source):
+    result_img, results = detect_age_gender(source)
     st.image(result_img, channels="BGR", use_column_width=True,width=10)
     
     if results: